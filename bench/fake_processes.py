@@ -0,0 +1,89 @@
+"""Искусственный источник процессов для бенчмарков вкладки 'Процессы'.
+
+FakeProcessSource.collect() возвращает список словарей в том же
+формате, что ProcessCollector и ProcfsScanner, и на каждом вызове
+изменяет популяцию: часть процессов завершается, их место занимают
+новые с новыми PID, часть процессов получает CPU и выполняет
+ввод-вывод. Случайность задаётся seed, так что прогоны повторяемы.
+"""
+import random
+
+
+NAMES = ["python", "bash", "postgres", "nginx", "java", "kworker/0:1", "systemd", "sshd",
+         "chrome", "node", "redis-server", "containerd-shim", "Xorg", "dockerd", "gunicorn"]
+USERS = ["root", "www-data", "postgres", "alice", "bob", "nobody"]
+
+
+class FakeProcessSource:
+    """Популяция из count процессов с деревом родителей.
+
+    churn -- доля процессов, которые завершаются и заменяются новыми
+    на каждом тике; active -- доля процессов, получающих CPU на тике.
+    """
+
+    def __init__(self, count, churn=0.01, active=0.05, seed=0):
+        self.random = random.Random(seed)
+        self.churn = churn
+        self.active = active
+        self.next_pid = 1
+        self.ticks = 0
+        self.processes = {}  # pid -> словарь процесса
+        for _ in range(count):
+            self.spawn()
+
+    def __len__(self):
+        return len(self.processes)
+
+    def spawn(self):
+        rnd = self.random
+        pid = self.next_pid
+        self.next_pid += 1
+        # Родитель -- один из уже существующих процессов: получается дерево
+        # с несколькими уровнями, а не плоский список под init
+        ppid = rnd.choice((1, 2, self.next_pid - rnd.randint(2, 50))) if pid > 2 else 0
+        if ppid not in self.processes:
+            ppid = 1 if pid > 1 else 0
+        rss = rnd.randint(1, 4096) * 4096
+        self.processes[pid] = {
+            'pid': pid,
+            'ppid': ppid,
+            'name': rnd.choice(NAMES),
+            'cpu_percent': 0.0,
+            'memory_percent': rss / (64 << 30) * 100,
+            'username': rnd.choice(USERS),
+            'started': 1_700_000_000.0 + pid,
+            'rss': rss,
+            'read_bytes': rnd.randint(0, 1 << 30),
+            'write_bytes': rnd.randint(0, 1 << 28),
+        }
+
+    def step(self):
+        """Один тик: завершение, появление и активность процессов."""
+        rnd = self.random
+        processes = self.processes
+        for pid in rnd.sample(list(processes), int(len(processes) * self.churn)):
+            if pid <= 2:
+                continue
+            del processes[pid]
+            self.spawn()
+        # Осиротевшие процессы переходят к init, как в настоящей системе
+        for proc in processes.values():
+            if proc['ppid'] not in processes and proc['pid'] > 1:
+                proc['ppid'] = 1
+
+        for proc in processes.values():
+            proc['cpu_percent'] = 0.0
+        for pid in rnd.sample(list(processes), int(len(processes) * self.active)):
+            proc = processes[pid]
+            proc['cpu_percent'] = rnd.random() * 100
+            proc['rss'] = max(proc['rss'] + rnd.randint(-64, 64) * 4096, 4096)
+            proc['memory_percent'] = proc['rss'] / (64 << 30) * 100
+            proc['read_bytes'] += rnd.randint(0, 1 << 20)
+            proc['write_bytes'] += rnd.randint(0, 1 << 18)
+        self.ticks += 1
+
+    def collect(self):
+        """Следующий тик в формате сборщиков процессов."""
+        self.step()
+        # Сборщики возвращают новые словари на каждом обходе
+        return [dict(proc) for proc in self.processes.values()]
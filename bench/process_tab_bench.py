@@ -0,0 +1,239 @@
+#!/usr/bin/env python3
+"""Задержка обновления вкладки 'Процессы' на искусственных процессах.
+
+Вкладка создаётся без экрана (QT_QPA_PLATFORM=offscreen) и получает
+списки процессов от FakeProcessSource вместо настоящего сборщика. Тик
+состоит из записи в историю процессов (как в ProcessWorker), вызова
+ProcessTab.update_processes() и обработки событий Qt с перерисовкой.
+Каждый случай (число процессов, режим вкладки) выполняется в отдельном
+процессе, чтобы пиковый RSS не накапливался между случаями; случай,
+не уложившийся в --max-seconds, завершается досрочно с тем числом
+тиков, что успел сделать.
+Результаты сохраняются в JSON с номером коммита; --compare сравнивает
+прогон с сохранённым ранее. Пример:
+
+    python bench/process_tab_bench.py --sizes 1000 10000 100000 --churn 0.02
+    python bench/process_tab_bench.py --compare bench/results/<файл>.json
+"""
+import argparse
+import json
+import os
+import platform
+import resource
+import subprocess
+import sys
+import time
+import tracemalloc
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+import numpy as np  # noqa: E402
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(BENCH_DIR, os.pardir))
+from fake_processes import FakeProcessSource  # noqa: E402
+
+
+MODES = ('table', 'top50', 'tree')
+STAGES = ('history', 'update', 'paint', 'total')
+PERCENTILES = (50, 95, 99)
+
+
+def git_revision():
+    try:
+        return subprocess.run(["git", "describe", "--always", "--dirty"], cwd=BENCH_DIR,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def create_tab(mode):
+    from PySide6 import QtWidgets
+    from core.sampler import Sampler
+    from process.process_tab import ProcessTab
+
+    app = QtWidgets.QApplication.instance() or QtWidgets.QApplication([])
+    # Сборщик не запускается: списки процессов подаются вручную
+    sampler = Sampler()
+    tab = ProcessTab(sampler)
+    if mode == 'tree':
+        tab.tree_mode.setChecked(True)
+    elif mode.startswith('top'):
+        tab.top_n.setCurrentIndex(tab.top_n.findData(int(mode[3:])))
+    tab.resize(1000, 700)
+    tab.show()
+    app.processEvents()
+    return app, sampler, tab
+
+
+def run_tick(app, history, tab, processes, timings):
+    started = time.perf_counter()
+    history.append(time.time(), processes)
+    recorded = time.perf_counter()
+    tab.update_processes(processes)
+    updated = time.perf_counter()
+    app.processEvents()
+    painted = time.perf_counter()
+    timings['history'].append((recorded - started) * 1000)
+    timings['update'].append((updated - recorded) * 1000)
+    timings['paint'].append((painted - updated) * 1000)
+    timings['total'].append((painted - started) * 1000)
+
+
+def run_case(size, mode, ticks, warmup, churn, active, alloc_ticks, seed, max_seconds):
+    """Один случай; возвращает словарь с результатами."""
+    source = FakeProcessSource(size, churn=churn, active=active, seed=seed)
+    app, sampler, tab = create_tab(mode)
+    history = sampler.process_worker.history
+    timings = {stage: [] for stage in STAGES}
+
+    started = time.perf_counter()
+    deadline = started + max_seconds
+    for _ in range(warmup):
+        run_tick(app, history, tab, source.collect(), {stage: [] for stage in STAGES})
+        if time.perf_counter() > deadline:
+            break
+    first_ms = (time.perf_counter() - started) * 1000
+    for _ in range(ticks):
+        run_tick(app, history, tab, source.collect(), timings)
+        if time.perf_counter() > deadline:
+            break
+
+    # tracemalloc замедляет Python в разы, поэтому выделения памяти
+    # меряются на отдельных тиках, не входящих в задержку
+    peaks, retained = [], []
+    tracemalloc.start()
+    for _ in range(alloc_ticks if time.perf_counter() < deadline else 1):
+        processes = source.collect()
+        before = tracemalloc.get_traced_memory()[0]
+        tracemalloc.reset_peak()
+        run_tick(app, history, tab, processes, {stage: [] for stage in STAGES})
+        current, peak = tracemalloc.get_traced_memory()
+        peaks.append(peak - before)
+        retained.append(current - before)
+        del processes
+    tracemalloc.stop()
+
+    result = {
+        'size': size,
+        'mode': mode,
+        'ticks': len(timings['total']),
+        'warmup_ms': first_ms,
+        'alloc_peak_bytes': max(peaks) if peaks else None,
+        'alloc_retained_bytes': int(np.median(retained)) if retained else None,
+        # ru_maxrss на Linux в килобайтах
+        'peak_rss_bytes': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024,
+    }
+    for stage in STAGES:
+        values = np.array(timings[stage])
+        result[stage] = {f"p{p}": float(np.percentile(values, p)) for p in PERCENTILES}
+        result[stage]['max'] = float(values.max())
+    sampler.process_worker.stop()
+    return result
+
+
+def run_case_process(args, size, mode):
+    """Запускает случай в отдельном интерпретаторе и читает его JSON."""
+    command = [sys.executable, os.path.abspath(__file__), "--case", str(size), mode,
+               "--ticks", str(args.ticks), "--warmup", str(args.warmup), "--churn", str(args.churn),
+               "--active", str(args.active), "--alloc-ticks", str(args.alloc_ticks), "--seed", str(args.seed),
+               "--max-seconds", str(args.max_seconds)]
+    try:
+        # Один тик может длиться дольше всего бюджета случая
+        done = subprocess.run(command, capture_output=True, text=True, timeout=args.max_seconds * 5)
+    except subprocess.TimeoutExpired:
+        print(f"  {size} {mode}: не завершился за {args.max_seconds * 5:.0f} с", file=sys.stderr)
+        return None
+    if done.returncode != 0:
+        print(f"  {size} {mode}: ошибка\n{done.stderr}", file=sys.stderr)
+        return None
+    return json.loads(done.stdout.strip().splitlines()[-1])
+
+
+def case_key(case):
+    return case['size'], case['mode']
+
+
+def print_results(cases, settings_ticks, baseline=None):
+    previous = {case_key(case): case for case in (baseline or {}).get('cases', [])}
+    print(f"{'процессов':>10} {'режим':>7} {'p50, мс':>9} {'p95, мс':>9} {'p99, мс':>9} {'макс, мс':>9} "
+          f"{'выделено, МБ':>13} {'RSS, МБ':>8}")
+    for case in cases:
+        total = case['total']
+        short = "*" if case['ticks'] < settings_ticks else " "
+        line = (f"{case['size']:>10} {case['mode']:>6}{short} {total['p50']:>9.1f} {total['p95']:>9.1f} "
+                f"{total['p99']:>9.1f} {total['max']:>9.1f} {case['alloc_peak_bytes'] / 2 ** 20:>13.1f} "
+                f"{case['peak_rss_bytes'] / 2 ** 20:>8.0f}")
+        old = previous.get(case_key(case))
+        if old is not None:
+            change = [(total[p] / old['total'][p] - 1) * 100 for p in ('p50', 'p95')]
+            line += f"   p50 {change[0]:+.0f}%, p95 {change[1]:+.0f}%"
+        print(line)
+    for case in cases:
+        stages = ", ".join(f"{stage} {case[stage]['p50']:.1f}" for stage in STAGES[:-1])
+        print(f"  {case['size']} {case['mode']}: p50 по этапам (мс): {stages}; первые тики {case['warmup_ms']:.0f} мс")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--modes", nargs="+", choices=MODES, default=list(MODES))
+    parser.add_argument("--ticks", type=int, default=30)
+    parser.add_argument("--warmup", type=int, default=3)
+    parser.add_argument("--churn", type=float, default=0.01, help="доля процессов, сменяющихся за тик")
+    parser.add_argument("--active", type=float, default=0.05, help="доля процессов, получающих CPU за тик")
+    parser.add_argument("--alloc-ticks", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--max-seconds", type=float, default=120, help="бюджет времени на один случай")
+    parser.add_argument("--output", default=os.path.join(BENCH_DIR, "results"),
+                        help="каталог для JSON с результатами")
+    parser.add_argument("--compare", help="JSON прошлого прогона для сравнения")
+    parser.add_argument("--case", nargs=2, metavar=("SIZE", "MODE"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.case:
+        result = run_case(int(args.case[0]), args.case[1], args.ticks, args.warmup, args.churn,
+                          args.active, args.alloc_ticks, args.seed, args.max_seconds)
+        print(json.dumps(result))
+        return
+
+    baseline = None
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+
+    cases = []
+    for size in args.sizes:
+        for mode in args.modes:
+            result = run_case_process(args, size, mode)
+            if result is not None:
+                cases.append(result)
+                print(f"  {size} {mode}: p50 {result['total']['p50']:.1f} мс", file=sys.stderr)
+
+    from PySide6 import __version__ as pyside_version
+    revision = git_revision()
+    report = {
+        'revision': revision,
+        'date': time.strftime("%Y-%m-%dT%H:%M:%S"),
+        'python': platform.python_version(),
+        'pyside': pyside_version,
+        'machine': platform.machine(),
+        'cpus': os.cpu_count(),
+        'settings': {key: value for key, value in vars(args).items() if key not in ('case', 'compare', 'output')},
+        'cases': cases,
+    }
+    os.makedirs(args.output, exist_ok=True)
+    path = os.path.join(args.output, f"{time.strftime('%Y%m%d-%H%M%S')}-{revision}.json")
+    with open(path, "w") as f:
+        json.dump(report, f, indent=1)
+
+    if baseline is not None:
+        print(f"Сравнение с {baseline.get('revision')} от {baseline.get('date')}")
+    print_results(cases, args.ticks, baseline)
+    if any(case['ticks'] < args.ticks for case in cases):
+        print("* случай прерван по --max-seconds, перцентили по меньшему числу тиков")
+    print(f"Результаты: {path}")
+
+
+if __name__ == "__main__":
+    main()
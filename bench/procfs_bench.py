@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""Сравнение ProcfsScanner с psutil.process_iter на искусственном дереве /proc.
+
+Дерево с заданным числом процессов создаётся во временном каталоге
+(по возможности в /dev/shm), psutil направляется туда через
+psutil.PROCFS_PATH. Пример:
+
+    python bench/procfs_bench.py --sizes 1000 10000 50000
+"""
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+import psutil
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+from process.process_collector import ProcessCollector  # noqa: E402
+from process.procfs_scanner import ProcfsScanner  # noqa: E402
+
+
+MEMINFO = """MemTotal:       16384000 kB
+MemFree:         8192000 kB
+MemAvailable:   12288000 kB
+Buffers:          102400 kB
+Cached:          2048000 kB
+SwapCached:            0 kB
+Active:          4096000 kB
+Inactive:        2048000 kB
+SwapTotal:             0 kB
+SwapFree:              0 kB
+Shmem:            102400 kB
+SReclaimable:     204800 kB
+"""
+
+STATUS = """Name:\t{name}
+State:\tS (sleeping)
+Pid:\t{pid}
+PPid:\t1
+Uid:\t{uid}\t0\t0\t0
+Gid:\t{uid}\t{uid}\t{uid}\t{uid}
+Threads:\t1
+"""
+
+
+def stat_line(pid, name, ticks, start):
+    # 52 поля как в настоящем /proc/[pid]/stat
+    fields = ["S", "1", str(pid), str(pid), "0", "-1", "4194304", "100", "0", "0", "0",
+              str(ticks), str(ticks // 2), "0", "0", "20", "0", "1", "0", str(start),
+              "10485760", "256"] + ["0"] * 30
+    return f"{pid} ({name}) " + " ".join(fields) + "\n"
+
+
+def make_proc_tree(root, count, tick=0):
+    """Создаёт (или обновляет при tick > 0) дерево /proc из count процессов."""
+    uid = os.getuid()
+    if tick == 0:
+        with open(os.path.join(root, "meminfo"), "w") as f:
+            f.write(MEMINFO)
+        with open(os.path.join(root, "stat"), "w") as f:
+            f.write("cpu  100 0 100 1000 0 0 0 0 0 0\nbtime %d\n" % int(time.time() - 3600))
+        os.makedirs(os.path.join(root, "self"), exist_ok=True)
+        with open(os.path.join(root, "self", "stat"), "w") as f:
+            f.write(stat_line(1, "self", 0, 0))
+    for pid in range(1, count + 1):
+        path = os.path.join(root, str(pid))
+        name = f"worker-{pid % 1000}"
+        if tick == 0:
+            os.mkdir(path)
+            # status читают все три способа (реальный uid: эффективный здесь -- root),
+            # statm -- psutil (memory_info)
+            with open(os.path.join(path, "status"), "w") as f:
+                f.write(STATUS.format(name=name, pid=pid, uid=uid))
+            with open(os.path.join(path, "statm"), "w") as f:
+                f.write("2560 256 128 1 0 512 0\n")
+            with open(os.path.join(path, "io"), "w") as f:
+                f.write(f"rchar: 0\nwchar: 0\nsyscr: 0\nsyscw: 0\nread_bytes: {pid * 4096}\nwrite_bytes: 0\n"
+                        "cancelled_write_bytes: 0\n")
+        with open(os.path.join(path, "stat"), "w") as f:
+            f.write(stat_line(pid, name, pid % 97 * (tick + 1), pid))
+
+
+def psutil_iter():
+    """Исходный обход вкладки 'Процессы': новые Process на каждом вызове."""
+    return [proc.info for proc in psutil.process_iter(['pid', 'name', 'username', 'memory_percent', 'cpu_percent'])]
+
+
+def measure(func, repeat):
+    func()  # Прогрев: кэши сборщиков и первая точка для разницы CPU
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = func()
+        timings.append(time.perf_counter() - started)
+    return min(timings), len(result)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 50000])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    base = "/dev/shm" if os.path.isdir("/dev/shm") else None
+    saved_procfs = psutil.PROCFS_PATH
+    print(f"{'процессов':>10} {'process_iter, мс':>18} {'ProcessCollector, мс':>22} {'procfs, мс':>12}")
+    for size in args.sizes:
+        root = tempfile.mkdtemp(prefix="fake-proc-", dir=base)
+        try:
+            make_proc_tree(root, size)
+            psutil.PROCFS_PATH = root
+            results = [
+                measure(psutil_iter, args.repeat),
+                measure(ProcessCollector().collect, args.repeat),
+                measure(ProcfsScanner(root).collect, args.repeat),
+            ]
+        finally:
+            psutil.PROCFS_PATH = saved_procfs
+            shutil.rmtree(root)
+        for _, found in results:
+            if found != size:
+                print(f"  внимание: найдено {found} процессов из {size}")
+        print(f"{size:>10} {results[0][0] * 1000:>18.1f} {results[1][0] * 1000:>22.1f} {results[2][0] * 1000:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
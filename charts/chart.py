@@ -0,0 +1,42 @@
+CHART_BACKENDS = ('mpl', 'native')
+
+
+def create_chart(backend, title, xlabel, ylabel, series, **kwargs):
+    """Создаёт виджет графика выбранного бэкенда.
+
+    'mpl' -- matplotlib (FigureCanvasQTAgg), 'native' -- QPainter.
+    Модуль бэкенда импортируется лениво, поэтому при 'native'
+    matplotlib не загружается вовсе.
+    """
+    if backend == 'native':
+        from charts.native_chart import NativeChart
+        return NativeChart(title, xlabel, ylabel, series, **kwargs)
+    if backend == 'mpl':
+        from charts.mpl_chart import MplChart
+        return MplChart(title, xlabel, ylabel, series, **kwargs)
+    raise ValueError(f"Неизвестный бэкенд графиков: {backend}")
+
+
+# Шаги делений оси времени (с), из которых выбирается ближайший подходящий
+TICK_STEPS = (10, 15, 30, 60, 120, 300, 600, 900, 1800, 3600, 7200, 10800, 21600, 43200, 86400, 172800)
+
+
+def format_ago(seconds):
+    """Подпись деления: сколько времени назад ('1 мин', '50 сек', '6 ч')."""
+    seconds = int(seconds)
+    if seconds % 86400 == 0:
+        return f"{seconds // 86400} д"
+    if seconds % 3600 == 0:
+        return f"{seconds // 3600} ч"
+    if seconds % 60 == 0:
+        return f"{seconds // 60} мин"
+    return f"{seconds} сек"
+
+
+def span_ticks(span):
+    """Деления оси времени для окна span секунд: от самого старого к новым."""
+    step = next((s for s in TICK_STEPS if s >= span / 6), TICK_STEPS[-1])
+    ages = list(range(step, int(span) + 1, step))[::-1]
+    if not ages or ages[0] != int(span):
+        ages.insert(0, int(span))
+    return [-age for age in ages], [format_ago(age) for age in ages]
@@ -0,0 +1,188 @@
+import numpy as np
+from PySide6.QtCore import QPointF, QRect, QRectF, Qt
+from PySide6.QtGui import QColor, QImage, QPainter, QPen
+from PySide6.QtWidgets import QSizePolicy, QToolTip, QWidget
+from charts.chart import span_ticks
+
+
+NO_DATA = 255  # Индекс цвета для столбцов, в которые ещё ничего не записано
+LEVELS = 250  # Индексы 0..250 соответствуют 0..100%
+
+
+def heat_color_table():
+    """Палитра 0..100%: тёмно-синий -> зелёный -> жёлтый -> красный."""
+    stops = [(0.0, (16, 24, 64)), (0.3, (20, 120, 80)), (0.6, (230, 210, 40)), (0.85, (240, 110, 20)),
+             (1.0, (200, 0, 0))]
+    table = []
+    for i in range(256):
+        if i > LEVELS:
+            table.append(QColor(235, 235, 235).rgb())
+            continue
+        position = i / LEVELS
+        for (left, low), (right, high) in zip(stops, stops[1:]):
+            if position <= right:
+                t = (position - left) / (right - left)
+                table.append(QColor(*(round(a + (b - a) * t) for a, b in zip(low, high))).rgb())
+                break
+    return table
+
+
+class Heatmap(QWidget):
+    """Тепловая карта: строки -- ядра (или другие ряды), столбцы -- время.
+
+    Данные лежат кольцом в массиве uint8 (ряды x capacity), поверх
+    которого построен QImage с палитрой. Тик записывает один столбец
+    (add_column), а отрисовка -- это один или два drawImage с
+    масштабированием, поэтому её стоимость не зависит от числа рядов.
+
+    Окно span не больше capacity * interval: подписи оси не обещают
+    больше истории, чем есть в кольце. Если столбцов в окне больше, чем
+    пикселей по ширине, они сводятся по максимуму, чтобы короткий пик
+    загрузки не пропал при сжатии картинки.
+    """
+
+    MARGINS = (60, 30, 15, 45)  # слева, сверху, справа, снизу
+
+    def __init__(self, title, row_label, interval=1.0, capacity=3600, span=60):
+        super().__init__()
+        self.title = title
+        self.row_label = row_label
+        self.interval = interval
+        self.capacity = capacity
+        self.set_span(span)
+        self.colors = heat_color_table()
+        self.head = 0  # Столбец, в который пойдёт следующая запись
+        self.row_details = []  # Подписи рядов для подсказки (например, положение ядра в топологии)
+        self.resize_rows(0)
+        self.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
+        self.setMouseTracking(True)
+
+    def resize_rows(self, rows):
+        """Пересоздаёт кольцо под другое число рядов (история при этом теряется)."""
+        self.rows = rows
+        self.data = np.full((max(rows, 1), self.capacity), NO_DATA, dtype=np.uint8)
+        # QImage ссылается на память массива, поэтому массив хранится в self.data
+        self.image = QImage(self.data.data, self.capacity, max(rows, 1), self.capacity, QImage.Format_Indexed8)
+        self.image.setColorTable(self.colors)
+        self.head = 0
+        # Каждому ряду -- хотя бы пиксель по высоте, иначе одиночное
+        # загруженное ядро могло бы пропасть при сжатии картинки
+        self.setMinimumHeight(min(rows, 512) + self.MARGINS[1] + self.MARGINS[3])
+
+    def set_span(self, span):
+        self.span = min(span, self.capacity * self.interval)
+        self.xticks, self.xticklabels = span_ticks(self.span)
+        self.update()
+
+    def set_title(self, title):
+        self.title = title
+        self.update()
+
+    def set_row_details(self, details):
+        self.row_details = list(details)
+
+    def add_column(self, values):
+        """Записывает очередной столбец: значения рядов в процентах."""
+        values = np.asarray(values, dtype=np.float64)
+        if len(values) != self.rows:
+            self.resize_rows(len(values))
+        self.data[:, self.head] = (np.nan_to_num(values).clip(0, 100) * (LEVELS / 100)).round()
+        self.head = (self.head + 1) % self.capacity
+
+    def visible_columns(self):
+        return max(min(int(round(self.span / self.interval)), self.capacity), 1)
+
+    def plot_rect(self):
+        left, top, right, bottom = self.MARGINS
+        return QRectF(self.rect()).adjusted(left, top, -right, -bottom)
+
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        rect = self.plot_rect()
+        painter.fillRect(rect, QColor(235, 235, 235))
+
+        visible = self.visible_columns()
+        start = (self.head - visible) % self.capacity
+        if visible > rect.width() >= 1:
+            painter.drawImage(rect, self.downsampled(start, visible, int(rect.width())))
+        else:
+            # Последние visible столбцов кольца; на стыке кольца картинка
+            # рисуется двумя кусками
+            width = rect.width() / visible
+            first = min(visible, self.capacity - start)
+            painter.drawImage(QRectF(rect.left(), rect.top(), first * width, rect.height()), self.image,
+                              QRectF(start, 0, first, self.image.height()))
+            if first < visible:
+                painter.drawImage(QRectF(rect.left() + first * width, rect.top(), (visible - first) * width,
+                                         rect.height()), self.image, QRectF(0, 0, visible - first, self.image.height()))
+
+        painter.setPen(QPen(Qt.black))
+        painter.drawRect(rect)
+        self.draw_axes(painter, rect)
+        painter.end()
+
+    def downsampled(self, start, visible, columns):
+        """Картинка из visible столбцов кольца, начиная со start, сжатых до columns по максимуму."""
+        if start + visible > self.capacity:
+            data = np.concatenate((self.data[:, start:], self.data[:, :start + visible - self.capacity]), axis=1)
+        else:
+            data = self.data[:, start:start + visible]
+        bins = np.linspace(0, visible, columns, endpoint=False).astype(np.intp)
+        # Столбец без данных не должен перекрывать соседние значения
+        peaks = np.maximum.reduceat(np.where(data == NO_DATA, 0, data), bins, axis=1)
+        empty = np.minimum.reduceat(data, bins, axis=1) == NO_DATA
+        self.binned = np.ascontiguousarray(np.where(empty, NO_DATA, peaks).astype(np.uint8))
+        image = QImage(self.binned.data, columns, self.binned.shape[0], columns, QImage.Format_Indexed8)
+        image.setColorTable(self.colors)
+        return image
+
+    def draw_axes(self, painter, rect):
+        metrics = painter.fontMetrics()
+        painter.drawText(QRectF(0, 0, self.width(), self.MARGINS[1]), Qt.AlignCenter, self.title)
+
+        # Подписи рядов: не чаще, чем позволяет высота шрифта
+        if self.rows:
+            step = max(1, int(np.ceil(self.rows * metrics.height() / max(rect.height(), 1))))
+            row_height = rect.height() / self.rows
+            for row in range(0, self.rows, step):
+                text = str(row)
+                y = rect.top() + (row + 0.5) * row_height + metrics.ascent() / 2 - 1
+                painter.drawText(QPointF(rect.left() - metrics.horizontalAdvance(text) - 5, y), text)
+        painter.save()
+        painter.translate(12, rect.center().y())
+        painter.rotate(-90)
+        painter.drawText(QPointF(-metrics.horizontalAdvance(self.row_label) / 2, 0), self.row_label)
+        painter.restore()
+
+        scale = rect.width() / self.span
+        for position, label in zip(self.xticks, self.xticklabels):
+            x = rect.right() + position * scale
+            painter.drawLine(QPointF(x, rect.bottom()), QPointF(x, rect.bottom() + 4))
+            painter.drawText(QPointF(x - metrics.horizontalAdvance(label) / 2, rect.bottom() + metrics.height() + 4), label)
+
+        # Шкала цветов справа от заголовка
+        legend = QRect(int(rect.right()) - 140, 8, 100, 10)
+        for x in range(legend.width()):
+            painter.setPen(QColor.fromRgb(self.colors[round(x / (legend.width() - 1) * LEVELS)]))
+            painter.drawLine(legend.left() + x, legend.top(), legend.left() + x, legend.bottom())
+        painter.setPen(Qt.black)
+        painter.drawText(QPointF(legend.left() - metrics.horizontalAdvance("0%") - 4, legend.bottom()), "0%")
+        painter.drawText(QPointF(legend.right() + 4, legend.bottom()), "100%")
+
+    def mouseMoveEvent(self, event):
+        """Подсказка: ряд, время и значение под курсором."""
+        rect = self.plot_rect()
+        position = event.position()
+        if not self.rows or not rect.contains(position):
+            QToolTip.hideText()
+            return
+        visible = self.visible_columns()
+        column_from_end = visible - 1 - int((position.x() - rect.left()) / rect.width() * visible)
+        row = min(int((position.y() - rect.top()) / rect.height() * self.rows), self.rows - 1)
+        value = self.data[row, (self.head - 1 - column_from_end) % self.capacity]
+        name = self.row_details[row] if row < len(self.row_details) else f"{self.row_label} {row}"
+        if value == NO_DATA:
+            text = f"{name}: нет данных"
+        else:
+            text = f"{name}\n{column_from_end * self.interval:.0f} с назад: {value * 100 / LEVELS:.0f}%"
+        QToolTip.showText(event.globalPosition().toPoint(), text, self)
@@ -0,0 +1,136 @@
+import numpy as np
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
+from charts.chart import span_ticks
+
+
+class MplChart(FigureCanvas):
+    """График на matplotlib с инкрементальной отрисовкой.
+
+    Оси, подписи, легенда и сетка создаются один раз. На каждом тике
+    меняются только данные линий и заливок, а перерисовка идёт через
+    blitting поверх сохранённого фона. Полная перерисовка выполняется
+    лишь при изменении размера окна, окна времени или масштаба оси Y.
+
+    series -- список словарей с ключами label, color и необязательными
+    linestyle, fill (цвет заливки) и fill_alpha.
+    ylim -- фиксированные пределы оси Y; None включает автомасштаб
+    с запасом headroom.
+    span -- ширина окна времени в секундах; ось X идёт от -span до 0.
+    """
+
+    def __init__(self, title, xlabel, ylabel, series, ylim=None, headroom=1.1, span=60):
+        self.figure = Figure()
+        super().__init__(self.figure)
+        self.auto_ylim = ylim is None
+        self.headroom = headroom
+        self.background = None
+
+        ax = self.figure.add_subplot(111)
+        ax.set_facecolor('white')
+        ax.set_ylim(*(ylim or (0, 1)))
+        ax.set_title(title)
+        ax.set_xlabel(xlabel)
+        ax.set_ylabel(ylabel)
+        ax.grid(True)
+        self.ax = ax
+        self.apply_span(span)
+
+        self.lines = []
+        self.fills = []
+        # Вершины заливок: нижняя граница, сами данные и снова нижняя граница
+        self.fill_verts = []
+        for spec in series:
+            line, = ax.plot([], [], label=spec['label'], color=spec['color'],
+                            linestyle=spec.get('linestyle', '-'), animated=True)
+            self.lines.append(line)
+            fill = None
+            if spec.get('fill'):
+                fill = ax.fill_between([0, 0], [0, 0], color=spec['fill'],
+                                       alpha=spec.get('fill_alpha', 0.5), animated=True)
+            self.fills.append(fill)
+            self.fill_verts.append(np.zeros((0, 2)))
+        ax.legend()
+
+        self.mpl_connect('draw_event', self.on_draw)
+
+    def set_title(self, title):
+        self.ax.set_title(title)
+        self.draw_idle()
+
+    def set_span(self, span):
+        self.apply_span(span)
+        self.draw_idle()
+
+    def apply_span(self, span):
+        self.span = span
+        ticks, labels = span_ticks(span)
+        self.ax.set_xlim(-span, 0)
+        self.ax.set_xticks(ticks)
+        self.ax.set_xticklabels(labels)
+
+    def max_points(self):
+        """Сколько точек имеет смысл рисовать: по одной на пиксель оси."""
+        return max(int(self.ax.bbox.width), 2)
+
+    def on_draw(self, event):
+        """После полной отрисовки запоминаем фон и дорисовываем данные."""
+        self.background = self.copy_from_bbox(self.ax.bbox)
+        self.draw_artists()
+
+    def draw_artists(self):
+        for fill in self.fills:
+            if fill is not None:
+                self.ax.draw_artist(fill)
+        for line in self.lines:
+            self.ax.draw_artist(line)
+
+    def update_series(self, values):
+        """Обновляет данные всех серий: по паре (x, y) на серию."""
+        top = 0.0
+        for i, (x, data) in enumerate(values):
+            x = np.asarray(x, dtype=float)
+            data = np.asarray(data, dtype=float)
+            keep = ~np.isnan(x)
+            x, data = x[keep], data[keep]
+            self.lines[i].set_data(x, data)
+            if self.fills[i] is not None:
+                self.update_fill(i, x, data)
+            if len(data) and not np.isnan(data).all():
+                top = max(top, float(np.nanmax(data)))
+
+        if self.auto_ylim and self.rescale(top):
+            # Масштаб изменился: фон с осями нужно перерисовать целиком
+            self.draw_idle()
+            return
+
+        if self.background is None:
+            self.draw_idle()
+            return
+
+        self.restore_region(self.background)
+        self.draw_artists()
+        self.blit(self.ax.bbox)
+
+    def update_fill(self, i, x, data):
+        """Меняет вершины существующей заливки, не создавая её заново."""
+        verts = self.fill_verts[i]
+        if len(verts) != len(x) + 2:
+            verts = self.fill_verts[i] = np.zeros((len(x) + 2, 2))
+        if not len(x):
+            return
+        verts[1:-1, 0] = x
+        verts[1:-1, 1] = data
+        np.nan_to_num(verts[:, 1], copy=False)  # Пропуски (NaN) заливаются как нули
+        verts[0] = (x[0], 0)
+        verts[-1] = (x[-1], 0)
+        self.fills[i].set_verts([verts])
+
+    def rescale(self, top):
+        """Меняет предел оси Y, только если данные вышли за него или сильно упали."""
+        current = self.ax.get_ylim()[1]
+        wanted = max(top, 1.0) * self.headroom
+        if wanted > current or wanted < current * 0.5:
+            self.ax.set_ylim(0, wanted)
+            return True
+        return False
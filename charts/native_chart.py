@@ -0,0 +1,188 @@
+import numpy as np
+from PySide6.QtCore import QPointF, QRectF, Qt
+from PySide6.QtGui import QColor, QPainter, QPen, QPolygonF
+from PySide6.QtWidgets import QSizePolicy, QWidget
+from charts.chart import span_ticks
+
+
+class NativeChart(QWidget):
+    """Лёгкий график на QPainter, рисующий прямо из буферов отсчётов.
+
+    Повторяет интерфейс MplChart (update_series, set_title), но не
+    растеризует через Agg: на тике лишь запоминаются ссылки на данные и
+    планируется перерисовка виджета. В режиме compact рисуются только
+    линии и заливки без осей и подписей (спарклайн).
+    """
+
+    MARGINS = (60, 30, 15, 45)  # слева, сверху, справа, снизу
+
+    def __init__(self, title, xlabel, ylabel, series, ylim=None, headroom=1.1, span=60, compact=False):
+        super().__init__()
+        self.title = title
+        self.xlabel = xlabel
+        self.ylabel = ylabel
+        self.series = [dict(spec) for spec in series]
+        self.compact = compact
+        self.auto_ylim = ylim is None
+        self.headroom = headroom
+        self.ylim = ylim or (0, 1)
+        self.values = [((), ()) for _ in self.series]
+        self.span = span
+        self.xticks, self.xticklabels = span_ticks(span)
+
+        for spec in self.series:
+            spec['qcolor'] = QColor(spec['color'])
+            if spec.get('fill'):
+                fill = QColor(spec['fill'])
+                fill.setAlphaF(spec.get('fill_alpha', 0.5))
+                spec['qfill'] = fill
+
+        self.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
+        self.setMinimumHeight(40 if compact else 200)
+
+    def set_title(self, title):
+        self.title = title
+        self.update()
+
+    def set_span(self, span):
+        self.span = span
+        self.xticks, self.xticklabels = span_ticks(span)
+        self.update()
+
+    def max_points(self):
+        """Сколько точек имеет смысл рисовать: по одной на пиксель."""
+        return max(int(self.plot_rect().width()), 2)
+
+    def update_series(self, values):
+        """Запоминает данные серий (по паре (x, y) на серию) и планирует перерисовку."""
+        self.values = []
+        for x, data in values:
+            x = np.asarray(x, dtype=float)
+            keep = ~np.isnan(x)
+            # Пропуски (NaN) в истории рисуются как нули
+            self.values.append((x[keep], np.nan_to_num(np.asarray(data, dtype=float)[keep])))
+        if self.auto_ylim:
+            top = max((data.max() for _, data in self.values if len(data)), default=0.0)
+            self.rescale(float(top))
+        self.update()
+
+    def rescale(self, top):
+        """Меняет предел оси Y, только если данные вышли за него или сильно упали."""
+        current = self.ylim[1]
+        wanted = max(top, 1.0) * self.headroom
+        if wanted > current or wanted < current * 0.5:
+            self.ylim = (0, wanted)
+
+    def plot_rect(self):
+        if self.compact:
+            return QRectF(self.rect()).adjusted(1, 1, -1, -1)
+        left, top, right, bottom = self.MARGINS
+        return QRectF(self.rect()).adjusted(left, top, -right, -bottom)
+
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        painter.setRenderHint(QPainter.Antialiasing)
+        rect = self.plot_rect()
+        painter.fillRect(rect, Qt.white)
+
+        if not self.compact:
+            self.draw_axes(painter, rect)
+
+        painter.setClipRect(rect)
+        for spec, (x, data) in zip(self.series, self.values):
+            self.draw_series(painter, rect, spec, x, data)
+        painter.setClipping(False)
+
+        if not self.compact:
+            painter.setPen(QPen(Qt.black))
+            painter.drawRect(rect)
+            self.draw_legend(painter, rect)
+        painter.end()
+
+    def map_points(self, rect, x, data):
+        """Переводит отсчёты в координаты виджета; момент 0 у правого края."""
+        low, high = self.ylim
+        xs = rect.right() + x * (rect.width() / self.span)
+        ys = rect.bottom() - (data - low) * (rect.height() / ((high - low) or 1.0))
+        return [QPointF(px, py) for px, py in zip(xs.tolist(), ys.tolist())]
+
+    def draw_series(self, painter, rect, spec, x, data):
+        if len(data) < 2:
+            return
+        points = self.map_points(rect, x, data)
+        if 'qfill' in spec:
+            area = QPolygonF(points)
+            area.append(QPointF(points[-1].x(), rect.bottom()))
+            area.append(QPointF(points[0].x(), rect.bottom()))
+            painter.setPen(Qt.NoPen)
+            painter.setBrush(spec['qfill'])
+            painter.drawPolygon(area)
+            painter.setBrush(Qt.NoBrush)
+        pen = QPen(spec['qcolor'], 1.5)
+        if spec.get('linestyle') == '--':
+            pen.setStyle(Qt.DashLine)
+        painter.setPen(pen)
+        painter.drawPolyline(QPolygonF(points))
+
+    def draw_axes(self, painter, rect):
+        metrics = painter.fontMetrics()
+        low, high = self.ylim
+        grid_pen = QPen(QColor('#b0b0b0'), 0.8)
+
+        # Горизонтальная сетка и подписи оси Y
+        divisions = 5
+        for i in range(divisions + 1):
+            value = low + (high - low) * i / divisions
+            y = rect.bottom() - rect.height() * i / divisions
+            painter.setPen(grid_pen)
+            painter.drawLine(QPointF(rect.left(), y), QPointF(rect.right(), y))
+            painter.setPen(Qt.black)
+            text = f"{value:.4g}"
+            painter.drawText(QPointF(rect.left() - metrics.horizontalAdvance(text) - 5, y + metrics.ascent() / 2), text)
+
+        # Вертикальная сетка и подписи оси X
+        scale = rect.width() / self.span
+        for position, label in zip(self.xticks, self.xticklabels):
+            x = rect.right() + position * scale
+            painter.setPen(grid_pen)
+            painter.drawLine(QPointF(x, rect.top()), QPointF(x, rect.bottom()))
+            painter.setPen(Qt.black)
+            painter.drawText(QPointF(x - metrics.horizontalAdvance(label) / 2, rect.bottom() + metrics.height() + 4), label)
+
+        painter.drawText(QRectF(rect.left(), 0, rect.width(), rect.top()), Qt.AlignCenter, self.title)
+        painter.drawText(QRectF(rect.left(), rect.bottom() + metrics.height() + 6, rect.width(), metrics.height() * 1.5),
+                         Qt.AlignCenter, self.xlabel)
+
+        painter.save()
+        painter.translate(metrics.height() / 2, rect.center().y())
+        painter.rotate(-90)
+        painter.drawText(QRectF(-rect.height() / 2, -metrics.height() / 2, rect.height(), metrics.height() * 1.5),
+                         Qt.AlignCenter, self.ylabel)
+        painter.restore()
+
+    def draw_legend(self, painter, rect):
+        metrics = painter.fontMetrics()
+        width = max((metrics.horizontalAdvance(spec['label']) for spec in self.series), default=0) + 40
+        height = metrics.height() * len(self.series) + 8
+        box = QRectF(rect.right() - width - 8, rect.top() + 8, width, height)
+        painter.setPen(QPen(QColor('#cccccc')))
+        painter.setBrush(QColor(255, 255, 255, 220))
+        painter.drawRect(box)
+        painter.setBrush(Qt.NoBrush)
+        for i, spec in enumerate(self.series):
+            y = box.top() + 4 + metrics.height() * (i + 0.5)
+            pen = QPen(spec['qcolor'], 2)
+            if spec.get('linestyle') == '--':
+                pen.setStyle(Qt.DashLine)
+            painter.setPen(pen)
+            painter.drawLine(QPointF(box.left() + 6, y), QPointF(box.left() + 28, y))
+            painter.setPen(Qt.black)
+            painter.drawText(QPointF(box.left() + 34, y + metrics.ascent() / 2 - 1), spec['label'])
+
+
+class Sparkline(NativeChart):
+    """Компактный спарклайн без осей и подписей."""
+
+    def __init__(self, color, fill=None, ylim=None, span=60):
+        series = [{'label': '', 'color': color, 'fill': fill}]
+        super().__init__('', '', '', series, ylim=ylim, span=span, compact=True)
@@ -0,0 +1,30 @@
+from PySide6.QtCore import Signal
+from PySide6.QtWidgets import QComboBox, QHBoxLayout, QLabel, QWidget
+
+
+SPANS = (
+    ("1 мин", 60),
+    ("10 мин", 600),
+    ("1 ч", 3600),
+    ("6 ч", 6 * 3600),
+    ("24 ч", 86400),
+    ("7 д", 7 * 86400),
+)
+
+
+class SpanSelector(QWidget):
+    """Выбор окна времени, общего для всех графиков производительности."""
+
+    span_changed = Signal(int)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        layout = QHBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+        layout.addWidget(QLabel("Период:"))
+        self.combo = QComboBox()
+        for title, span in SPANS:
+            self.combo.addItem(title, span)
+        self.combo.currentIndexChanged.connect(lambda index: self.span_changed.emit(self.combo.itemData(index)))
+        layout.addWidget(self.combo)
+        layout.addStretch()
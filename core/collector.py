@@ -0,0 +1,241 @@
+import numpy as np
+from core.provider import LiveProvider
+from cpu.proc_stat import busy_percent, time_breakdown
+from memory.meminfo import memory_breakdown
+from memory.pressure import stall_percent
+
+
+BUSY_PERCENT = 50  # Ядро с такой загрузкой считается нагруженным
+BELOW_BASE_RATIO = 0.95  # Частота ниже 95% базовой считается пониженной
+
+
+def frequency_array(values, scale=1.0):
+    """Список значений с None -> массив float с NaN на месте None."""
+    return np.array([np.nan if value is None else value * scale for value in values], dtype=np.float64)
+
+
+class SystemCollector:
+    """Снимает за один тик согласованный по времени срез системных метрик.
+
+    Показания берутся у провайдера (по умолчанию -- LiveProvider).
+    Общая загрузка CPU, загрузка каждого ядра, разбивка времени CPU и
+    счётчики планировщика считаются по одному чтению /proc/stat за тик
+    (и одному чтению /proc/loadavg). Частоты ядер сопоставляются с их
+    загрузкой: сборщик копит по каждому ядру время под нагрузкой и время
+    под нагрузкой ниже базовой частоты.
+    """
+
+    def __init__(self, provider=None):
+        self.provider = provider or LiveProvider()
+        self.prev_time = None
+        self.prev_disk_io = {}
+        self.prev_net_io = {}
+        self.prev_pressure = {}
+        self.prev_vmstat = {}
+        self.prev_cpu_stat = self.provider.cpu_stat()  # Первое чтение только запоминает счётчики
+        self.prev_throttle = None
+        self.busy_seconds = np.zeros(0)
+        self.below_base_seconds = np.zeros(0)
+
+    def collect(self):
+        """Возвращает срез метрик с отметкой времени.
+
+        Время берётся у провайдера: при воспроизведении это время записи.
+        """
+        now = self.provider.clock()
+        disk_io = self.provider.disk_io()
+        net_io = self.provider.net_io()
+        cpu_stat = self.provider.cpu_stat()
+        pressure = self.provider.pressure()
+        vmstat = self.provider.vmstat()
+        # Нулевой интервал (запись кончилась) не годится для деления
+        elapsed = now - self.prev_time if self.prev_time and now > self.prev_time else None
+        cpu_cores = self.core_percent(cpu_stat)
+
+        snapshot = {
+            'time': now,
+            'cpu_percent': float(busy_percent(self.prev_cpu_stat['total'], cpu_stat['total'])),
+            'cpu_cores': cpu_cores,
+            'cpu_freq': self.frequency_stats(self.provider.cpu_freq(), cpu_cores, elapsed),
+            'cpu_times': time_breakdown(self.prev_cpu_stat['total'], cpu_stat['total']),
+            'scheduler': self.scheduler_counters(cpu_stat, elapsed),
+            'memory': self.memory_stats(self.provider.meminfo(), vmstat, elapsed),
+            'pressure': self.pressure_stats(pressure, elapsed),
+            'disk_io': self.disk_rates(disk_io, elapsed),
+            'net_io': self.net_rates(net_io, elapsed),
+        }
+
+        self.prev_time = now
+        self.prev_disk_io = disk_io
+        self.prev_net_io = net_io
+        self.prev_cpu_stat = cpu_stat
+        self.prev_pressure = pressure
+        self.prev_vmstat = vmstat
+        return snapshot
+
+    def scheduler_counters(self, cpu_stat, elapsed):
+        """Средняя нагрузка, очередь выполнения и частота переключений контекста и прерываний."""
+        load1, load5, load15 = self.provider.loadavg()
+        counters = {'load1': load1, 'load5': load5, 'load15': load15}
+        # Очередь выполнения есть только в /proc/stat, не в запасном варианте через psutil
+        if 'procs_running' in cpu_stat:
+            counters['running'] = cpu_stat['procs_running']
+            counters['blocked'] = cpu_stat['procs_blocked']
+        for name in ('ctxt', 'intr'):
+            previous, current = self.prev_cpu_stat.get(name), cpu_stat.get(name)
+            if previous is None or current is None or not elapsed:
+                counters[name] = 0.0
+            else:
+                counters[name] = max(current - previous, 0) / elapsed
+        return counters
+
+    def memory_stats(self, meminfo, vmstat, elapsed):
+        """Память за тик по одному чтению /proc/meminfo и /proc/vmstat.
+
+        total, available, percent (как у psutil), swap_total, 'breakdown'
+        (memory.meminfo.memory_breakdown) и 'rates' -- подкачка swap_in и
+        swap_out в страницах/с, major_faults в отказах/с.
+        """
+        total = meminfo.get('total', 0)
+        available = meminfo.get('available', meminfo.get('free', 0))
+        rates = {}
+        for name, value in vmstat.items():
+            previous = self.prev_vmstat.get(name)
+            rates[name] = max(value - previous, 0) / elapsed if previous is not None and elapsed else 0.0
+        return {
+            'total': total,
+            'available': available,
+            'percent': (total - available) * 100.0 / total if total else 0.0,
+            'swap_total': meminfo.get('swap_total', 0),
+            'breakdown': memory_breakdown(meminfo),
+            'rates': rates,
+        }
+
+    def pressure_stats(self, pressure, elapsed):
+        """PSI за тик: {ресурс: {вид: {'avg10', 'avg60', 'avg300', 'rate'}}}.
+
+        rate -- доля времени задержки за тик (%) по приросту total: средние
+        ядра сглажены за 10 с и короткий всплеск в них размывается.
+        """
+        stats = {}
+        for resource, kinds in pressure.items():
+            stats[resource] = {}
+            for kind, values in kinds.items():
+                previous = self.prev_pressure.get(resource, {}).get(kind, {}).get('total')
+                stats[resource][kind] = {
+                    'avg10': values['avg10'], 'avg60': values['avg60'], 'avg300': values['avg300'],
+                    'rate': stall_percent(previous, values['total'], elapsed),
+                }
+        return stats
+
+    def frequency_stats(self, cpu_freq, cpu_cores, elapsed):
+        """Частоты ядер и троттлинг за тик.
+
+        'cores' и 'base' -- текущая и базовая частоты по ядрам, МГц (NaN,
+        если cpufreq недоступен); 'below_base' -- нагруженные ядра на
+        пониженной частоте (простаивающие ядра снижают частоту штатно, это
+        не считается); 'throttled' -- ядра, у которых за тик вырос счётчик
+        thermal_throttle ядра или пакета; 'throttle_counts' -- эти счётчики;
+        'busy_seconds' и 'below_base_seconds' -- накопленное с запуска время.
+        """
+        current = frequency_array(cpu_freq['cur'], 1 / 1000)
+        base = frequency_array(cpu_freq['base'], 1 / 1000)
+        throttle = (frequency_array(cpu_freq['core_throttle'])
+                    + np.nan_to_num(frequency_array(cpu_freq['package_throttle'])))
+        if len(cpu_cores) == len(current):
+            busy = cpu_cores >= BUSY_PERCENT
+        else:
+            busy = np.zeros(len(current), dtype=bool)
+        # Сравнение с NaN даёт False: без cpufreq ядро не бывает ниже базовой
+        below = busy & (current < base * BELOW_BASE_RATIO)
+        if len(self.busy_seconds) != len(current):
+            self.busy_seconds = np.zeros(len(current))
+            self.below_base_seconds = np.zeros(len(current))
+        if elapsed:
+            self.busy_seconds += busy * elapsed
+            self.below_base_seconds += below * elapsed
+        if self.prev_throttle is not None and len(self.prev_throttle) == len(throttle):
+            throttled = throttle > self.prev_throttle
+        else:
+            throttled = np.zeros(len(throttle), dtype=bool)
+        self.prev_throttle = throttle
+        return {
+            'cores': current,
+            'base': base,
+            'below_base': below,
+            'throttled': throttled,
+            'throttle_counts': throttle,
+            'busy_seconds': self.busy_seconds.copy(),
+            'below_base_seconds': self.below_base_seconds.copy(),
+        }
+
+    def core_percent(self, cpu_stat):
+        """Загрузка каждого ядра (массив NumPy), %."""
+        previous = self.prev_cpu_stat['cores']
+        if len(previous) != len(cpu_stat['cores']):
+            # Ядро включили или выключили: разница пока не определена
+            return np.zeros(len(cpu_stat['cores']))
+        return busy_percent(previous, cpu_stat['cores'])
+
+    def disk_rates(self, disk_io, elapsed):
+        """Скорости чтения и записи по каждому диску (КБ/с)."""
+        rates = {}
+        for name, (read_bytes, write_bytes) in disk_io.items():
+            prev = self.prev_disk_io.get(name)
+            if prev is None or not elapsed:
+                rates[name] = (0.0, 0.0)
+                continue
+            read_speed = (read_bytes - prev[0]) / elapsed / 1024
+            write_speed = (write_bytes - prev[1]) / elapsed / 1024
+            rates[name] = (max(read_speed, 0.0), max(write_speed, 0.0))
+        return rates
+
+    def net_rates(self, net_io, elapsed):
+        """Скорости отправки и получения по каждому интерфейсу (КБ/с)."""
+        rates = {}
+        for name, (bytes_sent, bytes_recv) in net_io.items():
+            prev = self.prev_net_io.get(name)
+            if prev is None or not elapsed:
+                rates[name] = (0.0, 0.0)
+                continue
+            send_speed = (bytes_sent - prev[0]) / elapsed / 1024
+            recv_speed = (bytes_recv - prev[1]) / elapsed / 1024
+            rates[name] = (max(send_speed, 0.0), max(recv_speed, 0.0))
+        return rates
+
+
+def snapshot_metrics(snapshot):
+    """Плоский словарь {имя метрики: значение} для хранилища истории."""
+    metrics = {
+        'cpu.percent': snapshot['cpu_percent'],
+        'memory.percent': snapshot['memory']['percent'],
+    }
+    for name, value in snapshot['memory']['breakdown'].items():
+        metrics[f'memory.{name}'] = value
+    for name, value in snapshot['memory']['rates'].items():
+        metrics[f'memory.{name}'] = value
+    for resource, kinds in snapshot['pressure'].items():
+        for kind, values in kinds.items():
+            metrics[f'pressure.{resource}.{kind}'] = values['rate']
+            metrics[f'pressure.{resource}.{kind}_avg10'] = values['avg10']
+    for name, value in snapshot['cpu_times'].items():
+        metrics[f'cpu.{name}'] = value
+    for name, value in snapshot['scheduler'].items():
+        metrics[f'cpu.{name}'] = value
+    freq = snapshot['cpu_freq']
+    if np.isfinite(freq['cores']).any():
+        metrics['cpu.freq'] = float(np.nanmean(freq['cores']))
+        metrics['cpu.freq_min'] = float(np.nanmin(freq['cores']))
+        if np.isfinite(freq['base']).any():
+            metrics['cpu.freq_base'] = float(np.nanmean(freq['base']))
+        # Среднее за окно -- доля времени всех ядер, проведённого под нагрузкой ниже базовой частоты
+        metrics['cpu.below_base'] = float(freq['below_base'].mean() * 100)
+    if np.isfinite(freq['throttle_counts']).any():
+        metrics['cpu.throttled'] = int(freq['throttled'].sum())
+    for name, (read_speed, write_speed) in snapshot['disk_io'].items():
+        metrics[f'disk.{name}.read'] = read_speed
+        metrics[f'disk.{name}.write'] = write_speed
+    for name, (send_speed, recv_speed) in snapshot['net_io'].items():
+        metrics[f'net.{name}.send'] = send_speed
+        metrics[f'net.{name}.recv'] = recv_speed
+    return metrics
@@ -0,0 +1,60 @@
+import json
+import signal
+import time
+from core.collector import SystemCollector, snapshot_metrics
+
+
+class HeadlessCollector:
+    """Сбор метрик без Qt и matplotlib для серверов без дисплея.
+
+    Использует тот же SystemCollector, что и графический режим, и пишет
+    каждый тик в файл истории и/или в output строкой JSON.
+    """
+
+    def __init__(self, interval=1.0, history_file=None, output=None, provider=None):
+        self.interval = interval
+        self.history_file = history_file
+        self.output = output
+        self.collector = SystemCollector(provider)
+
+    def tick(self):
+        snapshot = self.collector.collect()
+        metrics = snapshot_metrics(snapshot)
+        if self.history_file is not None:
+            self.history_file.append(snapshot['time'], metrics)
+        if self.output is not None:
+            record = {'time': round(snapshot['time'], 3)}
+            record.update((name, round(value, 3)) for name, value in metrics.items())
+            self.output.write(json.dumps(record) + '\n')
+            self.output.flush()
+
+    def run(self, count=None):
+        """Собирает метрики count раз (или до SIGTERM/SIGINT); возвращает код выхода."""
+        signal.signal(signal.SIGTERM, lambda signum, frame: self.stop())
+        self.running = True
+        deadline = time.monotonic()
+        ticks = 0
+        try:
+            while self.running and (count is None or ticks < count):
+                self.tick()
+                ticks += 1
+                # Тики привязаны к сетке, чтобы время сбора не копило сдвиг
+                deadline += self.interval
+                delay = deadline - time.monotonic()
+                if delay > 0:
+                    time.sleep(delay)
+                else:
+                    deadline = time.monotonic()
+        except KeyboardInterrupt:
+            pass
+        except BrokenPipeError:
+            # Например, вывод передан в head
+            pass
+        finally:
+            if self.history_file is not None:
+                self.history_file.flush()
+            self.collector.provider.close()
+        return 0
+
+    def stop(self):
+        self.running = False
@@ -0,0 +1,145 @@
+import numpy as np
+from core.ring_buffer import RingBuffer
+from core.rollup import ROLLUP_TIERS, RollupTier, mean_downsample, minmax_downsample
+
+
+DURATION_UNITS = {'s': 1, 'm': 60, 'h': 3600, 'd': 86400}
+
+
+def parse_duration(text):
+    """Переводит строку вида '90', '30m', '6h', '7d' в секунды."""
+    text = str(text).strip().lower()
+    if text and text[-1] in DURATION_UNITS:
+        return float(text[:-1]) * DURATION_UNITS[text[-1]]
+    return float(text)
+
+
+class HistoryStore:
+    """Общее хранилище временных рядов метрик с единой осью времени.
+
+    Все ряды выровнены по тикам сборщика: на тике, где метрики нет,
+    записывается NaN. Ряд, появившийся позже остальных, заполнен NaN
+    за предыдущее время. Запись идёт из потока сборщика, вкладки читают
+    ряды через view() без копирования.
+
+    Помимо сырых отсчётов за window секунд хранилище ведёт каскад ярусов
+    агрегации (ROLLUP_TIERS), а query() выбирает подходящий ярус и
+    прореживает данные до ширины графика.
+    """
+
+    def __init__(self, window=3600, interval=1.0, tiers=ROLLUP_TIERS):
+        self.interval = interval
+        self.capacity = max(int(window / interval), 1)
+        self.times = RingBuffer(self.capacity)
+        self.series = {}
+        self.rollups = [RollupTier(step, max(retention, window)) for step, retention in tiers]
+
+    def append(self, timestamp, values):
+        """Добавляет один тик: timestamp и словарь {имя метрики: значение}."""
+        for name in values:
+            if name not in self.series:
+                self.series[name] = self.times.aligned()
+        for name, buffer in self.series.items():
+            buffer.append(values.get(name, np.nan))
+        self.times.append(timestamp)
+
+        # Каскад агрегации: закрытый интервал яруса уходит в следующий ярус
+        rows = {name: (value, value, value, 1, value)
+                for name, value in values.items() if value == value}
+        for tier in self.rollups:
+            closed = tier.add(timestamp, rows)
+            if closed is None:
+                break
+            timestamp, rows = closed
+
+    def load(self, times, columns):
+        """Заполняет пустое хранилище историей, например из файла на диске.
+
+        times -- отметки времени по возрастанию, columns -- {имя: массив
+        значений}. Сырые ряды и ярусы агрегации заполняются векторно,
+        без поштучного append.
+        """
+        times = np.asarray(times, dtype=np.float64)
+        tail = slice(max(len(times) - self.capacity, 0), None)
+        for name, values in columns.items():
+            if name not in self.series:
+                self.series[name] = self.times.aligned()
+        for name, buffer in self.series.items():
+            values = columns.get(name)
+            buffer.extend(values[tail] if values is not None else np.full(len(times[tail]), np.nan))
+        self.times.extend(times[tail])
+
+        rows = {}
+        for name, values in columns.items():
+            values = np.asarray(values, dtype=np.float64)
+            rows[name] = (values, values, values, (~np.isnan(values)).astype(np.int64), values)
+        for tier in self.rollups:
+            times, rows = tier.load(times, rows)
+
+    def view(self, name, n=None):
+        """Последние n значений метрики; для неизвестной метрики -- NaN."""
+        buffer = self.series.get(name)
+        if buffer is None:
+            return np.full(self.capacity if n is None else min(n, self.capacity), np.nan)
+        return buffer.view(n)
+
+    def last(self, name, default=0.0):
+        buffer = self.series.get(name)
+        if buffer is None or not buffer.count:
+            return default
+        value = buffer.view(1)[0]
+        return default if np.isnan(value) else float(value)
+
+    def query(self, name, span, max_points=None):
+        """Данные метрики за последние span секунд для графика.
+
+        Возвращает (x, y), где x -- секунды относительно последнего тика
+        (отрицательные). Берётся самый грубый ярус, которого ещё хватает
+        на max_points точек, и результат прореживается min-max, поэтому
+        стоимость отрисовки "последних 24 ч" та же, что и "последней минуты".
+        """
+        now = self.times.view(1)[0] if self.times.count else 0.0
+        max_points = max_points or int(span / self.interval)
+        step, tier = self.choose_tier(span, max_points)
+
+        n = int(np.ceil(span / step))
+        if tier is None:
+            x = self.times.view(n) - now
+            low = high = self.view(name, n)
+        else:
+            x = tier.times.view(n) - now
+            if span / step <= max_points:
+                return x, tier.view(name, 'avg', n)
+            low = tier.view(name, 'min', n)
+            high = tier.view(name, 'max', n)
+        return minmax_downsample(x, low, high, max_points // 2)
+
+    def choose_tier(self, span, max_points):
+        """Самый грубый ярус (шаг, ярус или None для сырых отсчётов), которого хватает на max_points точек."""
+        candidates = [(self.interval, self.capacity * self.interval, None)]
+        candidates += [(tier.step, tier.capacity * tier.step, tier) for tier in self.rollups]
+        covering = [c for c in candidates if c[1] >= span] or candidates[-1:]
+        detailed = [c for c in covering if span / c[0] >= max_points]
+        step, _, tier = detailed[-1] if detailed else covering[0]
+        return step, tier
+
+    def query_stacked(self, names, span, max_points=None):
+        """Несколько метрик с общей осью x для графика-стопки: (x, [y по каждой метрике]).
+
+        Вместо min-max (у каждого ряда свои x) используются средние по
+        интервалам: для долей, складываемых стопкой, это и есть нужная величина.
+        """
+        now = self.times.view(1)[0] if self.times.count else 0.0
+        max_points = max_points or int(span / self.interval)
+        step, tier = self.choose_tier(span, max_points)
+
+        n = int(np.ceil(span / step))
+        if tier is None:
+            x = self.times.view(n) - now
+            columns = [self.view(name, n) for name in names]
+        else:
+            x = tier.times.view(n) - now
+            columns = [tier.view(name, 'avg', n) for name in names]
+        # Ряд неизвестной метрики (ещё не было тиков) -- NaN нужной длины
+        columns = [column[len(column) - len(x):] for column in columns]
+        return mean_downsample(x, columns, max_points)
@@ -0,0 +1,226 @@
+import fcntl
+import os
+import numpy as np
+
+
+def default_history_path():
+    """Путь к файлу истории по умолчанию (в каталоге данных пользователя)."""
+    data_home = os.environ.get('XDG_DATA_HOME') or os.path.expanduser('~/.local/share')
+    return os.path.join(data_home, 'system_performance_analyzer', 'history.bin')
+
+
+MAGIC = b'SPAHIST1'
+VERSION = 1
+NAME_SIZE = 64
+
+# Заголовок файла: фиксированные 64 байта в начале
+HEADER_DTYPE = np.dtype([
+    ('magic', 'S8'),
+    ('version', '<u4'),
+    ('capacity', '<u4'),
+    ('max_columns', '<u4'),
+    ('columns', '<u4'),
+    ('interval', '<f8'),
+    ('head', '<u8'),
+    ('count', '<u8'),
+    ('reserved', 'V16'),
+])
+
+
+class HistoryFile:
+    """История метрик на диске: кольцо фиксированного размера в mmap.
+
+    Файл состоит из заголовка, таблицы имён метрик и столбцов float64
+    (отметки времени и по одному столбцу на метрику) длиной capacity.
+    Запись тика -- это одна строка в столбцах и два числа в заголовке,
+    без сериализации; при запуске файл отображается в память и читается
+    срезами numpy, а не разбирается построчно.
+
+    Если новой метрике не хватает места в таблице имён (max_columns),
+    она сначала занимает столбец метрики, от которой в кольце не осталось
+    ни одного значения (например, отключённого диска). Если таких нет,
+    таблица расширяется вдвое с переносом истории: число метрик зависит
+    от машины и растёт с версиями, и новые метрики не должны вытеснять
+    уже записанные серии.
+
+    Писать в файл может только один процесс: он держит flock на файле.
+    Второй экземпляр (например, GUI рядом с --headless) открывает файл
+    только для чтения -- подхватывает историю при запуске, но ничего не
+    пишет, иначе оба двигали бы head и count в одном кольце.
+    """
+
+    def __init__(self, path, capacity=6 * 3600, max_columns=128, interval=1.0):
+        self.path = path
+        self.dropped = set()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            fcntl.flock(self.fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            self.read_only = False
+        except BlockingIOError:
+            self.read_only = True
+            print(f"History: {path} уже пишет другой экземпляр, история только читается")
+
+        if not self.is_valid(path):
+            if self.read_only:
+                # Чинить файл, в который пишет другой процесс, нельзя
+                print(f"History: {path} повреждён или другого формата, история не загружается")
+                self.mm = None
+                self.columns = {}
+                return
+            if os.path.getsize(path):
+                print(f"History: {path} повреждён или другого формата, создаётся заново")
+            self.create(path, capacity, max_columns, interval)
+        self.open()
+
+    def open(self):
+        self.mm = np.memmap(self.path, dtype=np.uint8, mode='r' if self.read_only else 'r+')
+        self.header = self.mm[:HEADER_DTYPE.itemsize].view(HEADER_DTYPE)[0:1]
+        self.capacity = int(self.header['capacity'][0])
+        self.max_columns = int(self.header['max_columns'][0])
+
+        names_end = HEADER_DTYPE.itemsize + NAME_SIZE * self.max_columns
+        self.names = self.mm[HEADER_DTYPE.itemsize:names_end].view(f'S{NAME_SIZE}')
+        data = self.mm[names_end:].view(np.float64)
+        self.data = data.reshape(self.max_columns + 1, self.capacity)  # Строка 0 -- время
+        self.columns = {name.decode(): i + 1
+                        for i, name in enumerate(self.names[:int(self.header['columns'][0])])}
+        self.row = np.full(self.max_columns, np.nan)
+
+    @staticmethod
+    def is_valid(path):
+        try:
+            header = np.fromfile(path, dtype=HEADER_DTYPE, count=1)
+        except (OSError, ValueError):
+            return False
+        if not len(header) or header['magic'][0] != MAGIC or header['version'][0] != VERSION:
+            return False
+        capacity = int(header['capacity'][0])
+        max_columns = int(header['max_columns'][0])
+        size = HEADER_DTYPE.itemsize + NAME_SIZE * max_columns + 8 * (max_columns + 1) * capacity
+        return os.path.getsize(path) == size
+
+    @staticmethod
+    def create(path, capacity, max_columns, interval):
+        header = np.zeros(1, dtype=HEADER_DTYPE)
+        header['magic'] = MAGIC
+        header['version'] = VERSION
+        header['capacity'] = capacity
+        header['max_columns'] = max_columns
+        header['interval'] = interval
+        size = HEADER_DTYPE.itemsize + NAME_SIZE * max_columns + 8 * (max_columns + 1) * capacity
+        # Файл тот же (открыт и заблокирован в __init__), а не новый: иначе блокировка осталась бы на старом
+        with open(path, 'r+b') as f:
+            f.truncate(0)
+            f.truncate(size)
+            f.write(header.tobytes())
+
+    def grow(self, max_columns):
+        """Расширяет таблицу до max_columns метрик, сохраняя историю.
+
+        Файл меняется на месте, а не подменяется новым, чтобы не потерять
+        блокировку; если процесс упадёт посередине, размер не сойдётся с
+        заголовком и при следующем запуске файл создастся заново.
+        """
+        print(f"History: {self.path} расширяется до {max_columns} метрик")
+        header = self.header.copy()
+        names = self.names.copy()
+        data = np.array(self.data)
+        old_columns = self.max_columns
+        del self.data, self.names, self.header, self.mm
+        self.create(self.path, self.capacity, max_columns, float(header['interval'][0]))
+        self.open()
+        for field in ('columns', 'head', 'count'):
+            self.header[field] = header[field]
+        self.names[:old_columns] = names
+        self.data[:old_columns + 1] = data
+        self.data[old_columns + 1:] = np.nan
+        self.columns = {name.decode(): i + 1 for i, name in enumerate(names[:int(header['columns'][0])])}
+
+    def free_column(self, keep):
+        """Столбец метрики не из keep, от которой в кольце остались только NaN, или None."""
+        for name, index in self.columns.items():
+            if name not in keep and np.isnan(self.data[index]).all():
+                del self.columns[name]
+                return index
+        return None
+
+    def column(self, name, keep=()):
+        """Номер столбца метрики; новая метрика занимает свободный столбец.
+
+        keep -- метрики текущего тика: их столбцы ещё пусты, но заняты.
+        """
+        index = self.columns.get(name)
+        if index is not None:
+            return index
+        if len(name.encode()) > NAME_SIZE:
+            if name not in self.dropped:
+                self.dropped.add(name)
+                print(f"History: слишком длинное имя метрики {name}, в {self.path} не пишется")
+            return None
+        used = int(self.header['columns'][0])
+        if used >= self.max_columns:
+            index = self.free_column(keep)
+            if index is not None:
+                self.names[index - 1] = name.encode()
+                self.columns[name] = index
+                return index
+            self.grow(self.max_columns * 2)
+        self.names[used] = name.encode()
+        # Новый столбец не должен показывать чужие старые значения
+        self.data[used + 1].fill(np.nan)
+        self.columns[name] = index = used + 1
+        self.header['columns'] = used + 1
+        return index
+
+    def append(self, timestamp, values):
+        """Дописывает один тик {имя метрики: значение}."""
+        if self.read_only:
+            return
+        # Столбцы выделяются до заполнения строки: grow() заменяет self.row
+        indexes = [(self.column(name, values), value) for name, value in values.items()]
+        row = self.row
+        row.fill(np.nan)
+        for index, value in indexes:
+            if index is not None:
+                row[index - 1] = value
+
+        head = int(self.header['head'][0])
+        self.data[0, head] = timestamp
+        self.data[1:, head] = row
+        self.header['head'] = (head + 1) % self.capacity
+        self.header['count'] = min(int(self.header['count'][0]) + 1, self.capacity)
+
+    def read(self):
+        """Вся сохранённая история по возрастанию времени: (times, {имя: значения})."""
+        head = int(self.header['head'][0])
+        count = int(self.header['count'][0])
+        if count < self.capacity:
+            order = np.arange(count)
+        else:
+            order = np.concatenate((np.arange(head, self.capacity), np.arange(head)))
+        times = self.data[0, order]
+        columns = {name: self.data[index, order] for name, index in self.columns.items()}
+        return times, columns
+
+    def load_into(self, store):
+        """Заполняет хранилище истории сохранёнными данными."""
+        if self.mm is None:
+            return
+        times, columns = self.read()
+        if len(times):
+            store.load(times, columns)
+
+    def flush(self):
+        if not self.read_only:
+            self.mm.flush()
+
+    def close(self):
+        """Сбрасывает изменения и снимает блокировку."""
+        if self.mm is not None:
+            self.flush()
+            del self.data, self.names, self.header
+            self.mm = None
+        os.close(self.fd)
@@ -0,0 +1,345 @@
+import bisect
+import gzip
+import json
+import os
+import socket
+import subprocess
+import threading
+import time
+from pathlib import Path
+
+import psutil
+from cpu.cpufreq import CpuFreqReader
+from cpu.proc_stat import CPU_TIME_FIELDS, parse_loadavg, parse_proc_stat, read_proc_stat
+from cpu.topology import default_topology_cache_path, load_topology
+from memory.meminfo import parse_meminfo, parse_vmstat, psutil_meminfo
+from memory.pressure import PRESSURE_RESOURCES, parse_pressure
+
+
+# 2: cpu_stat вместо cpu_percent; 3: loadavg; 4: топология из sysfs в cpu_info; 5: cpu_freq; 6: pressure;
+# 7: meminfo и vmstat вместо memory
+RECORD_VERSION = 7
+# Сведения, которые читаются один раз при запуске: при воспроизведении
+# отдаётся первая записанная версия
+STATIC_KINDS = ('cpu_info', 'disks', 'net_interfaces')
+# Показания, которых может не быть в записи, и их значения при воспроизведении:
+# --headless не обходит процессы
+OPTIONAL_KINDS = {'processes': []}
+# Часы воспроизведения идут по отметкам этих показаний: их снимает сборщик на каждом тике
+CLOCK_KIND = 'cpu_stat'
+
+
+class LiveProvider:
+    """Источник показаний текущей машины: psutil, /proc, /sys и lsblk.
+
+    Все вкладки и сборщики получают системные данные только через
+    провайдер, поэтому вместо него можно подставить запись
+    (RecordingProvider) или воспроизведение (ReplayProvider). Значения
+    возвращаются простыми структурами, которые без потерь сохраняются в
+    JSON: счётчики дисков и сети -- кортежами, остальное -- словарями и
+    списками.
+    """
+
+    def __init__(self, process_scanner='auto', proc_root='/proc', sys_root='/sys', topology_cache=None):
+        self.process_scanner = process_scanner
+        self.proc_root = proc_root
+        self.sys_root = sys_root
+        self.topology_cache = topology_cache or default_topology_cache_path()
+        self.process_collector = None
+        self.freq_reader = None
+
+    def clock(self):
+        """Время показаний (секунды эпохи): по нему сборщик считает скорости."""
+        return time.time()
+
+    def cpu_info(self):
+        """Модель, виртуализация и топология процессора (см. cpu.topology.read_topology).
+
+        Топология читается из sysfs один раз за загрузку системы, дальше --
+        из кэша на диске.
+        """
+        return load_topology(self.topology_cache, self.sys_root, self.proc_root)
+
+    def cpu_stat(self):
+        """Времена CPU (общие и по ядрам) и счётчики планировщика одним чтением /proc/stat.
+
+        Формат -- как у parse_proc_stat(). Без /proc (не Linux) времена
+        берутся из psutil.cpu_times() в сотых долях секунды.
+        """
+        path = os.path.join(self.proc_root, 'stat')
+        if os.path.exists(path):
+            return parse_proc_stat(read_proc_stat(path))
+
+        def ticks(times):
+            return [int(getattr(times, field, 0) * 100) for field in CPU_TIME_FIELDS]
+        stats = psutil.cpu_stats()
+        return {'total': ticks(psutil.cpu_times()), 'cores': [ticks(times) for times in psutil.cpu_times(percpu=True)],
+                'ctxt': stats.ctx_switches, 'intr': stats.interrupts}
+
+    def cpu_freq(self):
+        """Частоты и счётчики троттлинга по CPU (см. cpu.cpufreq.CpuFreqReader.read)."""
+        if self.freq_reader is None:
+            self.freq_reader = CpuFreqReader(self.sys_root)
+        return self.freq_reader.read()
+
+    def loadavg(self):
+        """Средняя нагрузка за 1, 5 и 15 минут."""
+        path = os.path.join(self.proc_root, 'loadavg')
+        if os.path.exists(path):
+            return parse_loadavg(read_proc_stat(path))
+        return list(os.getloadavg())
+
+    def meminfo(self):
+        """Нужные поля /proc/meminfo в байтах одним чтением (см. memory.meminfo.MEMINFO_FIELDS)."""
+        path = os.path.join(self.proc_root, 'meminfo')
+        if os.path.exists(path):
+            return parse_meminfo(read_proc_stat(path))
+        return psutil_meminfo()
+
+    def vmstat(self):
+        """Счётчики swap_in, swap_out (страницы) и major_faults из /proc/vmstat; пусто без /proc."""
+        path = os.path.join(self.proc_root, 'vmstat')
+        if os.path.exists(path):
+            return parse_vmstat(read_proc_stat(path))
+        return {}
+
+    def pressure(self):
+        """PSI по ресурсам: {'cpu'|'memory'|'io': parse_pressure()}; пусто без /proc/pressure."""
+        pressure = {}
+        for resource in PRESSURE_RESOURCES:
+            path = os.path.join(self.proc_root, 'pressure', resource)
+            try:
+                pressure[resource] = parse_pressure(read_proc_stat(path))
+            except OSError:
+                # Ядро без CONFIG_PSI или загруженное с psi=0
+                pass
+        return pressure
+
+    def disks(self):
+        """Физические диски из lsblk: список словарей name, size, type (SSD/HDD)."""
+        disks = []
+        output = subprocess.check_output(['lsblk', '-d'], universal_newlines=True)
+        for line in output.splitlines()[1:]:
+            parts = line.split()
+            if len(parts) < 6 or parts[5] != 'disk' or 'zram' in parts[0]:
+                continue
+            rotational_path = Path(self.sys_root, 'block', parts[0], 'queue', 'rotational')
+            disk_type = "Unknown"
+            if rotational_path.exists():
+                disk_type = "SSD" if rotational_path.read_text().strip() == "0" else "HDD"
+            disks.append({'name': parts[0], 'size': parts[3], 'type': disk_type})
+        return disks
+
+    def disk_io(self):
+        """Счётчики дисков: {имя: (read_bytes, write_bytes)}."""
+        counters = psutil.disk_io_counters(perdisk=True) or {}
+        return {name: (io.read_bytes, io.write_bytes) for name, io in counters.items()}
+
+    def net_io(self):
+        """Счётчики сетевых интерфейсов: {имя: (bytes_sent, bytes_recv)}."""
+        counters = psutil.net_io_counters(pernic=True) or {}
+        return {name: (io.bytes_sent, io.bytes_recv) for name, io in counters.items()}
+
+    def net_interfaces(self):
+        """Интерфейсы: {имя: {'isup', 'ipv4', 'ipv6'}}; адреса -- None, если их нет."""
+        addresses = psutil.net_if_addrs()
+        interfaces = {}
+        for name, stats in psutil.net_if_stats().items():
+            addrs = addresses.get(name, [])
+            interfaces[name] = {
+                'isup': stats.isup,
+                'ipv4': next((addr.address for addr in addrs if addr.family == socket.AF_INET), None),
+                'ipv6': next((addr.address for addr in addrs if addr.family == socket.AF_INET6), None),
+            }
+        return interfaces
+
+    def processes(self):
+        """Список процессов в формате сборщиков процессов."""
+        if self.process_collector is None:
+            # Сборщик создаётся в потоке, который его опрашивает
+            from process.process_collector import create_process_collector
+            self.process_collector = create_process_collector(self.process_scanner)
+        return self.process_collector.collect()
+
+    def close(self):
+        if self.freq_reader is not None:
+            self.freq_reader.close()
+
+
+def to_record(kind, value):
+    """Значение провайдера в виде, пригодном для JSON."""
+    if kind == 'processes':
+        # Процессы хранятся столбцами: ключи словаря не повторяются в каждой строке
+        keys = list(value[0]) if value else []
+        return {'keys': keys, 'rows': [[proc[key] for key in keys] for proc in value]}
+    return value
+
+
+def from_record(kind, data):
+    """Обратное к to_record()."""
+    if kind == 'processes':
+        keys = data['keys']
+        return [dict(zip(keys, row)) for row in data['rows']]
+    if kind in ('disk_io', 'net_io'):
+        return {name: tuple(counters) for name, counters in data.items()}
+    return data
+
+
+class RecordingProvider:
+    """Пропускает вызовы к другому провайдеру и записывает ответы в файл.
+
+    Файл -- gzip со строками JSON: заголовок, затем по строке на вызов
+    [секунды от начала записи, метод, значение]. Провайдер опрашивается
+    из нескольких потоков (сборщик метрик, обход процессов, GUI), запись
+    идёт под блокировкой.
+    """
+
+    def __init__(self, provider, path):
+        self.provider = provider
+        self.file = gzip.open(path, 'wt', encoding='utf-8', compresslevel=6)
+        self.lock = threading.Lock()
+        self.started = time.monotonic()
+        header = {'version': RECORD_VERSION, 'host': socket.gethostname(), 'time': time.time(),
+                  'logical_cpus': psutil.cpu_count(logical=True)}
+        self.file.write(json.dumps(header) + '\n')
+        # Сведения о машине пишутся сразу: иначе запись, сделанная без
+        # GUI (--headless), не подошла бы для воспроизведения с вкладками
+        for kind in STATIC_KINDS:
+            try:
+                getattr(self, kind)()
+            except Exception as e:
+                print(f"Record: не удалось записать {kind}: {e}")
+
+    def clock(self):
+        # Не записывается: время каждого показания и так есть в записи
+        return self.provider.clock()
+
+    def __getattr__(self, kind):
+        method = getattr(self.provider, kind)
+
+        def record(*args):
+            value = method(*args)
+            line = json.dumps([round(time.monotonic() - self.started, 3), kind, to_record(kind, value)],
+                              separators=(',', ':'))
+            with self.lock:
+                if not self.file.closed:
+                    self.file.write(line + '\n')
+            return value
+        return record
+
+    def close(self):
+        with self.lock:
+            self.file.close()
+        self.provider.close()
+
+
+class ReplayProvider:
+    """Воспроизводит показания, записанные RecordingProvider.
+
+    Часы воспроизведения идут в speed раз быстрее настоящих: вызов
+    возвращает последнее значение, записанное не позже текущего момента
+    записи. При speed=0 каждый вызов метода просто отдаёт следующее его
+    значение -- так воспроизведение не зависит от скорости машины и
+    подходит для бенчмарков. Дойдя до конца записи, воспроизведение
+    начинается сначала (при loop=False повторяется последнее значение).
+
+    clock() -- время записи, а не часы машины: при speed != 1 скорости
+    иначе делились бы на реальное время между тиками. Он же фиксирует
+    момент записи для всех показаний тика и не убывает при повторе
+    записи по кругу.
+    """
+
+    def __init__(self, path, speed=1.0, loop=True):
+        self.speed = speed
+        self.loop = loop
+        self.records = {}  # метод -> ([секунды], [значения в виде JSON])
+        with gzip.open(path, 'rt', encoding='utf-8') as f:
+            self.header = json.loads(f.readline())
+            if self.header.get('version') != RECORD_VERSION:
+                raise ValueError(f"{path}: неподдерживаемая версия записи {self.header.get('version')}")
+            for line in f:
+                offset, kind, value = json.loads(line)
+                times, values = self.records.setdefault(kind, ([], []))
+                times.append(offset)
+                values.append(value)
+        self.duration = max((times[-1] for times, _ in self.records.values()), default=0.0)
+        self.positions = {}  # метод -> номер следующего значения при speed=0
+        self.laps = 0  # Сколько раз запись начиналась сначала при speed=0
+        self.started = None
+        self.position = None  # Момент записи текущего тика, если его задал clock()
+        self.lock = threading.Lock()
+
+    def __getattr__(self, kind):
+        if kind not in self.records:
+            if kind in OPTIONAL_KINDS:
+                return lambda *args: OPTIONAL_KINDS[kind]
+            raise AttributeError(f"в записи нет показаний '{kind}'")
+        return lambda *args: from_record(kind, self.value(kind))
+
+    def recorded(self, kind):
+        """Есть ли в записи показания kind."""
+        return kind in self.records
+
+    def play_position(self):
+        """Сколько секунд записи проиграно (без учёта повторов); вызывается под блокировкой."""
+        if self.started is None:
+            self.started = time.monotonic()
+        return (time.monotonic() - self.started) * self.speed
+
+    def clock(self):
+        """Время записанного тика, соответствующего текущему моменту воспроизведения.
+
+        Это отметка ближайшего прошедшего показания CLOCK_KIND плюс
+        длительность записи за каждый повтор сначала.
+        """
+        times = self.records.get(CLOCK_KIND, ([], []))[0]
+        with self.lock:
+            if self.speed == 0:
+                # Следующее показание CLOCK_KIND, которое отдаст этот же тик
+                index = self.positions.get(CLOCK_KIND, 0)
+                lap = self.laps
+                if index >= len(times) and self.loop:
+                    index, lap = 0, lap + 1
+                offset = times[min(index, len(times) - 1)] if times else 0.0
+                return self.header['time'] + lap * self.duration + offset
+            self.position = self.play_position()
+            position = self.position
+        lap = 0
+        if self.loop and self.duration:
+            lap, position = divmod(position, self.duration)
+        if times:
+            position = times[max(bisect.bisect_right(times, position) - 1, 0)]
+        return self.header['time'] + lap * self.duration + position
+
+    def value(self, kind):
+        times, values = self.records[kind]
+        if kind in STATIC_KINDS:
+            return values[0]
+        with self.lock:
+            if self.speed == 0:
+                index = self.positions.get(kind, 0)
+                if index >= len(values):
+                    index = 0 if self.loop else len(values) - 1
+                    if self.loop and kind == CLOCK_KIND:
+                        self.laps += 1
+                self.positions[kind] = index + 1
+                return values[index]
+            position = self.position if self.position is not None else self.play_position()
+        if self.loop and self.duration:
+            position %= self.duration
+        index = max(bisect.bisect_right(times, position) - 1, 0)
+        return values[index]
+
+    def close(self):
+        pass
+
+
+def create_provider(process_scanner='auto', record=None, replay=None, replay_speed=1.0, sys_root='/sys'):
+    """Провайдер по параметрам командной строки."""
+    if replay is not None:
+        provider = ReplayProvider(replay, speed=replay_speed)
+    else:
+        provider = LiveProvider(process_scanner, sys_root=sys_root)
+    if record is not None:
+        provider = RecordingProvider(provider, record)
+    return provider
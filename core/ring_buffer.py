@@ -0,0 +1,47 @@
+import numpy as np
+
+
+class RingBuffer:
+    """Предвыделенный кольцевой буфер float64.
+
+    Каждое значение пишется дважды (в позицию i и i + capacity), поэтому
+    последние capacity отсчётов всегда лежат в памяти непрерывно и
+    читаются срезом без копирования.
+    """
+
+    def __init__(self, capacity, fill=np.nan):
+        self.capacity = capacity
+        self.data = np.full(2 * capacity, fill, dtype=np.float64)
+        self.head = 0  # Позиция следующей записи
+        self.count = 0
+
+    def append(self, value):
+        self.data[self.head] = value
+        self.data[self.head + self.capacity] = value
+        self.head = (self.head + 1) % self.capacity
+        if self.count < self.capacity:
+            self.count += 1
+
+    def extend(self, values):
+        """Добавляет блок значений одной векторной записью."""
+        values = np.asarray(values, dtype=np.float64)[-self.capacity:]
+        index = (self.head + np.arange(len(values))) % self.capacity
+        self.data[index] = values
+        self.data[index + self.capacity] = values
+        self.head = (self.head + len(values)) % self.capacity
+        self.count = min(self.count + len(values), self.capacity)
+
+    def view(self, n=None):
+        """Последние n отсчётов от старых к новым (view, только чтение)."""
+        n = self.capacity if n is None else min(n, self.capacity)
+        end = self.head + self.capacity
+        view = self.data[end - n:end]
+        view.flags.writeable = False
+        return view
+
+    def aligned(self):
+        """Новый буфер той же ёмкости, выровненный по текущей позиции этого."""
+        buffer = RingBuffer(self.capacity)
+        buffer.head = self.head
+        buffer.count = self.count
+        return buffer
@@ -0,0 +1,192 @@
+import warnings
+
+import numpy as np
+from core.ring_buffer import RingBuffer
+
+
+# Ярусы агрегации над сырыми отсчётами: (шаг, глубина хранения) в секундах
+ROLLUP_TIERS = ((10, 6 * 3600), (60, 2 * 86400), (3600, 60 * 86400))
+ROLLUP_FIELDS = ('min', 'max', 'avg', 'last')
+
+
+class RollupTier:
+    """Ярус агрегации: на каждый интервал step хранит min/max/avg/last.
+
+    На вход принимает строки {имя: (min, max, sum, count, last)} -- сырые
+    отсчёты или закрытые интервалы предыдущего яруса, поэтому ярусы
+    собираются в каскад 1 с -> 10 с -> 1 мин -> 1 ч без потери min/max.
+    """
+
+    def __init__(self, step, retention):
+        self.step = step
+        self.capacity = max(int(retention // step), 1)
+        self.times = RingBuffer(self.capacity)  # Начало каждого интервала
+        self.series = {}  # имя -> {поле: RingBuffer}
+        self.bucket = None  # Номер текущего (незакрытого) интервала
+        self.pending = {}  # имя -> [min, max, sum, count, last]
+
+    def add(self, timestamp, rows):
+        """Добавляет строки; возвращает закрытый интервал (start, rows) или None."""
+        bucket = int(timestamp // self.step)
+        closed = None
+        if self.bucket is not None and bucket != self.bucket:
+            closed = self.flush()
+        self.bucket = bucket
+
+        pending = self.pending
+        for name, (low, high, total, count, last) in rows.items():
+            acc = pending.get(name)
+            if acc is None:
+                pending[name] = [low, high, total, count, last]
+            else:
+                if low < acc[0]:
+                    acc[0] = low
+                if high > acc[1]:
+                    acc[1] = high
+                acc[2] += total
+                acc[3] += count
+                acc[4] = last
+        return closed
+
+    def load(self, times, rows):
+        """Пакетно заполняет пустой ярус историей (см. HistoryStore.load).
+
+        rows -- {имя: (mins, maxs, sums, counts, lasts)} массивами,
+        выровненными по times. Последний интервал остаётся незакрытым,
+        чтобы живые тики продолжили его. Возвращает закрытые интервалы
+        (starts, rows) в том же виде для следующего яруса.
+        """
+        if not len(times):
+            return times, {}
+        buckets = (times // self.step).astype(np.int64)
+        starts = np.concatenate(([0], np.flatnonzero(np.diff(buckets)) + 1))
+        aggregated = {name: aggregate_buckets(columns, starts) for name, columns in rows.items()}
+
+        closed = len(starts) - 1
+        closed_starts = buckets[starts[:closed]].astype(np.float64) * self.step
+        for name in aggregated:
+            if name not in self.series:
+                self.series[name] = {field: self.times.aligned() for field in ROLLUP_FIELDS}
+        missing = (np.full(closed + 1, np.nan),) * 3 + (np.zeros(closed + 1), np.full(closed + 1, np.nan))
+        for name, buffers in self.series.items():
+            low, high, total, count, last = aggregated.get(name, missing)
+            with np.errstate(invalid='ignore', divide='ignore'):
+                avg = np.where(count > 0, total / count, np.nan)
+            buffers['min'].extend(low[:closed])
+            buffers['max'].extend(high[:closed])
+            buffers['avg'].extend(avg[:closed])
+            buffers['last'].extend(last[:closed])
+        self.times.extend(closed_starts)
+
+        self.bucket = int(buckets[-1])
+        self.pending = {name: [low[-1], high[-1], total[-1], count[-1], last[-1]]
+                        for name, (low, high, total, count, last) in aggregated.items() if count[-1] > 0}
+        return closed_starts, {name: tuple(column[:closed] for column in columns)
+                               for name, columns in aggregated.items()}
+
+    def flush(self):
+        start = self.bucket * self.step
+        for name in self.pending:
+            if name not in self.series:
+                self.series[name] = {field: self.times.aligned() for field in ROLLUP_FIELDS}
+
+        for name, buffers in self.series.items():
+            acc = self.pending.get(name)
+            if acc is None:
+                for buffer in buffers.values():
+                    buffer.append(np.nan)
+                continue
+            low, high, total, count, last = acc
+            buffers['min'].append(low)
+            buffers['max'].append(high)
+            buffers['avg'].append(total / count)
+            buffers['last'].append(last)
+        self.times.append(start)
+
+        closed = (start, {name: tuple(acc) for name, acc in self.pending.items()})
+        self.pending = {}
+        return closed
+
+    def view(self, name, field, n=None):
+        buffers = self.series.get(name)
+        if buffers is None:
+            return np.full(self.capacity if n is None else min(n, self.capacity), np.nan)
+        return buffers[field].view(n)
+
+
+def aggregate_buckets(columns, starts):
+    """Сворачивает (mins, maxs, sums, counts, lasts) по интервалам, начинающимся в starts."""
+    low, high, total, count, last = columns
+    valid = count > 0
+    position = np.where(valid, np.arange(len(count)), -1)
+    last_index = np.maximum.reduceat(position, starts)
+    with np.errstate(invalid='ignore'):
+        low = np.minimum.reduceat(np.where(valid, low, np.inf), starts)
+        high = np.maximum.reduceat(np.where(valid, high, -np.inf), starts)
+    count = np.add.reduceat(count, starts)
+    total = np.add.reduceat(np.where(valid, total, 0.0), starts)
+    last = np.where(last_index >= 0, last[last_index], np.nan)
+    empty = count == 0
+    low[empty] = np.nan
+    high[empty] = np.nan
+    return low, high, total, count, last
+
+
+def minmax_downsample(x, low, high, buckets):
+    """Прореживание min-max: на каждый из buckets интервалов -- две точки.
+
+    low и high -- нижняя и верхняя огибающие (для сырых отсчётов это один и
+    тот же массив). В каждом интервале берутся минимум и максимум в том
+    порядке, в котором они встречаются, поэтому пики не теряются, а число
+    точек не зависит от длины истории.
+    """
+    n = len(x)
+    if buckets <= 0 or n <= 2 * buckets:
+        return x, (low + high) / 2 if low is not high else low
+
+    size = -(-n // buckets)
+    buckets = -(-n // size)
+    pad = buckets * size - n  # Неполный интервал дополняем пропусками со старого края
+    shape = (buckets, size)
+    xs = np.concatenate((np.full(pad, x[0]), x)).reshape(shape)
+    lows = np.concatenate((np.full(pad, np.inf), np.where(np.isnan(low), np.inf, low))).reshape(shape)
+    highs = np.concatenate((np.full(pad, -np.inf), np.where(np.isnan(high), -np.inf, high))).reshape(shape)
+
+    rows = np.arange(buckets)
+    min_index = lows.argmin(axis=1)
+    max_index = highs.argmax(axis=1)
+    min_values = lows[rows, min_index]
+    max_values = highs[rows, max_index]
+    min_first = min_index <= max_index
+
+    out_x = np.empty(2 * buckets)
+    out_y = np.empty(2 * buckets)
+    out_x[0::2] = np.where(min_first, xs[rows, min_index], xs[rows, max_index])
+    out_x[1::2] = np.where(min_first, xs[rows, max_index], xs[rows, min_index])
+    out_y[0::2] = np.where(min_first, min_values, max_values)
+    out_y[1::2] = np.where(min_first, max_values, min_values)
+    out_y[np.isinf(out_y)] = np.nan  # Интервал без данных остаётся разрывом
+    return out_x, out_y
+
+
+def mean_downsample(x, columns, buckets):
+    """Прореживание средним: на каждый из buckets интервалов -- одна точка.
+
+    columns -- список рядов с общей осью x. В отличие от min-max все ряды
+    получают одни и те же x, поэтому их можно складывать стопкой.
+    """
+    n = len(x)
+    if buckets <= 0 or n <= buckets:
+        return x, columns
+    size = -(-n // buckets)
+    buckets = -(-n // size)
+    pad = buckets * size - n
+    shape = (buckets, size)
+    xs = np.concatenate((np.full(pad, np.nan), x)).reshape(shape)
+    with warnings.catch_warnings():
+        # Интервал из одних пропусков даёт NaN, а не предупреждение
+        warnings.simplefilter('ignore', RuntimeWarning)
+        out_x = np.nanmax(xs, axis=1)
+        out = [np.nanmean(np.concatenate((np.full(pad, np.nan), column)).reshape(shape), axis=1)
+               for column in columns]
+    return out_x, out
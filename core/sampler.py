@@ -0,0 +1,78 @@
+from PySide6.QtCore import QObject, QThread, QTimer, Signal, Slot
+from core.collector import SystemCollector, snapshot_metrics
+from core.history import HistoryStore
+from core.provider import LiveProvider
+from process.process_worker import ProcessWorker
+
+
+class Sampler(QObject):
+    """Общий фоновый сборщик метрик.
+
+    Работает в отдельном потоке, на каждом тике снимает один срез и
+    раздаёт его вкладкам через сигналы. Перед отправкой сигнала срез
+    записывается в общее хранилище истории store и, если задан, в файл
+    истории history_file. Обход процессов идёт в отдельном потоке
+    ProcessWorker и не задерживает сбор метрик. Все показания берутся
+    у провайдера provider (живая машина, запись или воспроизведение).
+    """
+
+    sampled = Signal(object)
+    processes_sampled = Signal(object, float, int)
+
+    def __init__(self, store=None, interval=1000, history_file=None, process_scanner='auto', provider=None):
+        super().__init__()
+        self.interval = interval
+        self.provider = provider or LiveProvider(process_scanner)
+        self.store = store or HistoryStore(interval=interval / 1000)
+        self.history_file = history_file
+        self.collector = None
+        self.timer = None
+        self.process_scan_enabled = True
+
+        self.thread = QThread()
+        self.thread.setObjectName("SamplerThread")
+        self.moveToThread(self.thread)
+        self.thread.started.connect(self.run)
+
+        self.process_worker = ProcessWorker(self.provider, interval / 1000)
+        self.process_worker.processes_sampled.connect(self.processes_sampled)
+
+    def start(self):
+        self.process_worker.start()
+        self.thread.start()
+
+    def stop(self):
+        # Вызывается из GUI-потока (Qt.DirectConnection), не из рабочего
+        self.thread.quit()
+        self.thread.wait()
+        self.process_worker.stop()
+        if self.history_file is not None:
+            self.history_file.flush()
+        self.provider.close()
+
+    @Slot()
+    def run(self):
+        # Сборщики и таймер создаются уже в рабочем потоке
+        self.collector = SystemCollector(self.provider)
+        self.timer = QTimer(self)
+        self.timer.timeout.connect(self.tick)
+        self.thread.finished.connect(self.timer.stop)
+        self.timer.start(self.interval)
+        self.tick()
+
+    def set_process_scan_enabled(self, enabled):
+        """Включает обход процессов; при включении сразу запрашивает свежий список."""
+        self.process_scan_enabled = enabled
+        if enabled and self.thread.isRunning():
+            self.process_worker.request()
+
+    @Slot()
+    def tick(self):
+        snapshot = self.collector.collect()
+        metrics = snapshot_metrics(snapshot)
+        self.store.append(snapshot['time'], metrics)
+        if self.history_file is not None:
+            self.history_file.append(snapshot['time'], metrics)
+        self.sampled.emit(snapshot)
+        if self.process_scan_enabled:
+            self.process_worker.request()
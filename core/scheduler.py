@@ -0,0 +1,34 @@
+from PySide6.QtCore import QEvent, QObject
+
+
+class TabScheduler(QObject):
+    """Включает отрисовку только для видимых вкладок.
+
+    Скрытые вкладки продолжают дёшево записывать историю, но не обновляют
+    виджеты и графики. Когда окно свёрнуто, неактивны все вкладки.
+    """
+
+    def __init__(self, dialog):
+        super().__init__(dialog)
+        self.dialog = dialog
+        self.tabs = []
+        dialog.installEventFilter(self)
+
+    def add_tab(self, tab):
+        self.tabs.append(tab)
+
+    def watch(self, tab_widget):
+        """Пересчитывает активность вкладок при переключении в tab_widget."""
+        tab_widget.currentChanged.connect(self.refresh)
+
+    def refresh(self):
+        minimized = self.dialog.isMinimized() or not self.dialog.isVisible()
+        for tab in self.tabs:
+            active = not minimized and tab.isVisible()
+            if active != tab.active:
+                tab.set_active(active)
+
+    def eventFilter(self, obj, event):
+        if obj is self.dialog and event.type() in (QEvent.WindowStateChange, QEvent.Show, QEvent.Hide):
+            self.refresh()
+        return False
@@ -1,22 +1,57 @@
-from PySide6.QtCore import QTimer
-from PySide6.QtWidgets import QLabel, QVBoxLayout, QWidget
-from matplotlib.figure import Figure
-from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
-import psutil
-import subprocess
+import numpy as np
+from PySide6.QtWidgets import QHBoxLayout, QLabel, QVBoxLayout, QWidget
+from charts.chart import create_chart
+from charts.heatmap import Heatmap
+from cpu.proc_stat import BREAKDOWN_FIELDS
+from cpu.topology import cache_summary, cpu_descriptions, format_cpu_list
+
+
+# Подписи и цвета слагаемых времени CPU в порядке BREAKDOWN_FIELDS (снизу вверх)
+BREAKDOWN_SERIES = {
+    'user': ("user", 'green'),
+    'nice': ("nice", 'yellowgreen'),
+    'system': ("system", 'firebrick'),
+    'iowait': ("iowait", 'royalblue'),
+    'irq': ("irq", 'darkorange'),
+    'softirq': ("softirq", 'gold'),
+    'steal': ("steal", 'black'),
+    'guest': ("guest", 'mediumpurple'),
+}
+FREQUENCY_SERIES = [
+    ('cpu.freq', {'label': "Средняя", 'color': 'green'}),
+    ('cpu.freq_min', {'label': "Минимальная по ядрам", 'color': 'firebrick'}),
+    ('cpu.freq_base', {'label': "Базовая", 'color': 'gray', 'linestyle': '--'}),
+]
+SCHEDULER_SERIES = [
+    ('cpu.load1', {'label': "Load average 1 мин", 'color': 'darkred'}),
+    ('cpu.load5', {'label': "Load average 5 мин", 'color': 'orangered', 'linestyle': '--'}),
+    ('cpu.load15', {'label': "Load average 15 мин", 'color': 'orange', 'linestyle': '--'}),
+    ('cpu.running', {'label': "Выполняются", 'color': 'green'}),
+    ('cpu.blocked', {'label': "Ждут ввода-вывода", 'color': 'royalblue'}),
+]
+
+
+HEATMAP_MAX_SPAN = 24 * 3600  # Больше -- это десятки мегабайт на машинах с сотнями ядер
 
 
 class CPUResourceTab(QWidget):
-    def __init__(self):
+    def __init__(self, sampler, chart_backend='mpl'):
         super().__init__()
         self.layout = QVBoxLayout(self)
-        self.cpu_usage = [0] * 60  # 60 последних секунд
+        self.store = sampler.store  # История загрузки хранится в общем хранилище
+        self.provider = sampler.provider
+        self.span = 60  # Окно времени графика, с
+        self.active = False  # Рисуем только когда вкладка видна
+        self.topology = None  # Читается при первом показе вкладки
+        self.descriptions = []  # Подписи ядер по топологии
+        self.frequency = None  # Частоты и троттлинг последнего тика
 
         # CPU Info Labels
         self.model_label = QLabel("Модель: ")
         self.cores_label = QLabel("Ядра: ")
         self.virtualization_label = QLabel("Виртуализация: ")
         self.sockets_label = QLabel("Сокеты: ")
+        self.numa_label = QLabel("NUMA: ")
         self.l1d_label = QLabel("L1d Cache: ")
         self.l1i_label = QLabel("L1i Cache: ")
         self.l2_label = QLabel("L2 Cache: ")
@@ -26,82 +61,146 @@ class CPUResourceTab(QWidget):
         self.layout.addWidget(self.cores_label)
         self.layout.addWidget(self.virtualization_label)
         self.layout.addWidget(self.sockets_label)
+        self.layout.addWidget(self.numa_label)
         self.layout.addWidget(self.l1d_label)
         self.layout.addWidget(self.l1i_label)
         self.layout.addWidget(self.l2_label)
         self.layout.addWidget(self.l3_label)
 
-        # График
-        self.figure = Figure()
-        self.canvas = FigureCanvas(self.figure)
-        self.layout.addWidget(self.canvas)
-
-        self.timer = QTimer()
-        self.timer.timeout.connect(self.update_cpu_usage)
-        self.timer.start(1000)
-
-        self.update_cpu_info()
+        # Время CPU стопкой: верхняя граница -- общая загрузка вместе с iowait.
+        # Серии идут сверху вниз: непрозрачная заливка каждой следующей
+        # закрывает нижнюю часть предыдущей
+        self.chart = create_chart(
+            chart_backend, 'Использование CPU', 'Время (с)', 'Использование (%)',
+            [{'label': BREAKDOWN_SERIES[field][0], 'color': BREAKDOWN_SERIES[field][1],
+              'fill': BREAKDOWN_SERIES[field][1], 'fill_alpha': 1.0} for field in reversed(BREAKDOWN_FIELDS)],
+            ylim=(0, 100))
+        self.scheduler_chart = create_chart(
+            chart_backend, 'Нагрузка и очередь выполнения', 'Время (с)', 'Задачи',
+            [spec for _, spec in SCHEDULER_SERIES])
+        # Частота рядом с загрузкой: ядро на пониженной частоте выглядит
+        # загруженным на 100%, хотя делает меньше работы
+        self.frequency_chart = create_chart(
+            chart_backend, 'Частота CPU', 'Время (с)', 'Частота (МГц)',
+            [spec for _, spec in FREQUENCY_SERIES])
+        charts = QHBoxLayout()
+        charts.addWidget(self.chart)
+        charts.addWidget(self.frequency_chart)
+        charts.addWidget(self.scheduler_chart)
+        self.layout.addLayout(charts)
+        self.counters_label = QLabel()
+        self.layout.addWidget(self.counters_label)
+        self.frequency_label = QLabel()
+        self.frequency_label.setWordWrap(True)
+        self.layout.addWidget(self.frequency_label)
+
+        # Загрузка по ядрам: одна картинка вместо линии на каждое ядро
+        # Кольцо карты -- на всю глубину истории, но не больше HEATMAP_MAX_SPAN
+        interval = sampler.interval / 1000
+        self.heatmap = Heatmap('Загрузка по ядрам', 'Ядро', interval=interval, span=self.span,
+                               capacity=min(self.store.capacity, int(HEATMAP_MAX_SPAN / interval)))
+        self.layout.addWidget(self.heatmap)
+
+        sampler.sampled.connect(self.update_cpu_usage)
 
     def update_cpu_info(self):
-        cpu_count = psutil.cpu_count(logical=False)
-        model_name = "Не удалось получить модель"
-        sockets = "Неизвестно"
-        virtualization = "Не поддерживается"
-        l1d_cache = l1i_cache = l2_cache = l3_cache = "Нет данных"
-
         try:
-            output = subprocess.check_output(['lscpu'], universal_newlines=True, env={'LC_ALL': 'C'})
-            for line in output.splitlines():
-                if "Model name:" in line:
-                    model_name = line.split(":")[1].strip()
-                elif "Socket(s):" in line:
-                    sockets = line.split(":")[1].strip()
-                elif "Virtualization type:" in line:
-                    virtualization = line.split(":")[1].strip()
-                elif "L1d cache:" in line:
-                    l1d_cache = line.split(":")[1].strip()
-                elif "L1i cache:" in line:
-                    l1i_cache = line.split(":")[1].strip()
-                elif "L2 cache:" in line:
-                    l2_cache = line.split(":")[1].strip()
-                elif "L3 cache:" in line:
-                    l3_cache = line.split(":")[1].strip()
+            self.topology = self.provider.cpu_info()
         except Exception as e:
-            model_name = f"Ошибка: {e}"
-
-        self.model_label.setText(f"Модель: {model_name}")
-        self.cores_label.setText(f"Количество ядер: {cpu_count}")
-        self.virtualization_label.setText(f"Тип виртуализации: {virtualization}")
-        self.sockets_label.setText(f"Сокеты: {sockets}")
-        self.l1d_label.setText(f"Кэш L1d: {l1d_cache}")
-        self.l1i_label.setText(f"Кэш L1i: {l1i_cache}")
-        self.l2_label.setText(f"Кэш L2: {l2_cache}")
-        self.l3_label.setText(f"Кэш L3: {l3_cache}")
-
-    def update_cpu_usage(self):
-        usage = psutil.cpu_percent(interval=None)
-
-        # Удаляем старое значение, добавляем новое
-        self.cpu_usage.pop(0)
-        self.cpu_usage.append(usage)
-
-        self.update_graph()
+            self.topology = {}
+            self.model_label.setText(f"Модель: Ошибка: {e}")
+            return
+        cpus = self.topology['cpus']
+        sockets = {cpu['package'] for cpu in cpus}
+        cores = {(cpu['package'], cpu['die'], cpu['core']) for cpu in cpus}
+        nodes = self.topology['nodes']
+
+        self.model_label.setText(f"Модель: {self.topology['model']}")
+        self.cores_label.setText(f"Количество ядер: {len(cores)} (потоков: {len(cpus)})")
+        self.virtualization_label.setText(f"Тип виртуализации: {self.topology['virtualization']}")
+        self.sockets_label.setText(f"Сокеты: {len(sockets)}")
+        self.numa_label.setText(f"NUMA: узлов {len(nodes)} -- " + "; ".join(
+            f"узел {node}: CPU {format_cpu_list(node_cpus)}" for node, node_cpus in sorted(nodes.items())))
+        summary = cache_summary(self.topology)
+        for key, label, title in (('l1d', self.l1d_label, "L1d"), ('l1i', self.l1i_label, "L1i"),
+                                  ('l2', self.l2_label, "L2"), ('l3', self.l3_label, "L3")):
+            if key in summary:
+                size, instances = summary[key]
+                text = f"{size / 2 ** 20:g} MiB" if size >= 1 << 20 else f"{size >> 10} KiB"
+                label.setText(f"Кэш {title}: {text} (экземпляров: {instances})")
+            else:
+                label.setText(f"Кэш {title}: Нет данных")
+        self.descriptions = cpu_descriptions(self.topology)
+
+    def update_cpu_usage(self, snapshot):
+        # Общая загрузка уже записана сборщиком в хранилище истории, столбец
+        # тепловой карты пишется всегда, чтобы при открытии вкладки была история
+        self.heatmap.add_column(snapshot['cpu_cores'])
+        self.frequency = snapshot['cpu_freq']
+        if self.active:
+            self.update_graph()
+
+    def set_active(self, active):
+        """Включает или выключает отрисовку вкладки (история пишется всегда)."""
+        self.active = active
+        if active:
+            if self.topology is None:
+                self.update_cpu_info()
+            self.update_graph()
 
     def update_graph(self):
-        self.figure.clear()
-        ax = self.figure.add_subplot(111)
-        ax.set_facecolor('white')
-
-        ax.fill_between(range(len(self.cpu_usage)), self.cpu_usage, color='lightgreen', alpha=0.5)
-        ax.plot(self.cpu_usage, label='Использование CPU (%)', color='green')
-
-        ax.set_ylim(0, 100)
-        ax.set_xlim(0, len(self.cpu_usage) - 1)
-        ax.set_title('Использование CPU')
-        ax.set_xlabel('Время (с)')
-        ax.set_ylabel('Использование (%)')
-        ax.set_xticks(range(0, len(self.cpu_usage), 10))
-        ax.set_xticklabels(["1 мин", "50 сек", "40 сек", "30 сек", "20 сек", "10 сек"])
-        ax.legend()
-        ax.grid(True)
-        self.canvas.draw()
\ No newline at end of file
+        x, parts = self.store.query_stacked([f'cpu.{field}' for field in BREAKDOWN_FIELDS], self.span,
+                                            self.chart.max_points())
+        stacked = np.cumsum(np.nan_to_num(np.array(parts)), axis=0) if len(x) else [() for _ in parts]
+        self.chart.update_series([(x, stacked[i]) for i in reversed(range(len(parts)))])
+        self.scheduler_chart.update_series([self.store.query(name, self.span, self.scheduler_chart.max_points())
+                                            for name, _ in SCHEDULER_SERIES])
+        self.frequency_chart.update_series([self.store.query(name, self.span, self.frequency_chart.max_points())
+                                            for name, _ in FREQUENCY_SERIES])
+        self.update_frequency_info()
+        self.counters_label.setText(
+            f"Переключения контекста: {self.store.last('cpu.ctxt'):.0f}/с  |  "
+            f"прерывания: {self.store.last('cpu.intr'):.0f}/с  |  "
+            f"steal: {self.store.last('cpu.steal'):.1f}%  |  iowait: {self.store.last('cpu.iowait'):.1f}%")
+        self.heatmap.update()
+
+    def update_frequency_info(self):
+        """Сводка по частоте и троттлингу и подсказки тепловой карты по ядрам."""
+        frequency = self.frequency
+        if frequency is None or not np.isfinite(frequency['cores']).any():
+            self.frequency_label.setText("Частота: нет данных cpufreq")
+            self.heatmap.set_row_details(self.descriptions)
+            return
+        _, (below_base,) = self.store.query_stacked(['cpu.below_base'], self.span)
+        below_base = np.nanmean(below_base) if np.isfinite(below_base).any() else 0.0
+        text = (f"Частота: {np.nanmean(frequency['cores']):.0f} МГц (мин. {np.nanmin(frequency['cores']):.0f}, "
+                f"базовая {np.nanmean(frequency['base']):.0f})  |  "
+                f"под нагрузкой ниже базовой: {below_base:.1f}% времени ядер за период, "
+                f"ядер сейчас: {int(frequency['below_base'].sum())}")
+        if np.isfinite(frequency['throttle_counts']).any():
+            text += (f"  |  троттлинг: {int(frequency['throttled'].sum())} ядер за тик, "
+                     f"событий с загрузки: {np.nanmax(frequency['throttle_counts']):.0f} (макс. по ядрам)")
+        self.frequency_label.setText(text)
+
+        details = []
+        for row, current in enumerate(frequency['cores']):
+            text = self.descriptions[row] if row < len(self.descriptions) else f"Ядро {row}"
+            busy = frequency['busy_seconds'][row]
+            text += f"\nЧастота {current:.0f} МГц (базовая {frequency['base'][row]:.0f})"
+            if busy:
+                text += (f", под нагрузкой ниже базовой {frequency['below_base_seconds'][row]:.0f} с "
+                         f"из {busy:.0f} с")
+            if np.isfinite(frequency['throttle_counts'][row]):
+                text += f"\nСобытий троттлинга: {frequency['throttle_counts'][row]:.0f}"
+            details.append(text)
+        self.heatmap.set_row_details(details)
+
+    def set_span(self, span):
+        """Меняет окно времени графика (в секундах)."""
+        self.span = span
+        self.chart.set_span(span)
+        self.scheduler_chart.set_span(span)
+        self.frequency_chart.set_span(span)
+        self.heatmap.set_span(span)
+        if self.active:
+            self.update_graph()
@@ -0,0 +1,83 @@
+import os
+
+from cpu.topology import parse_cpu_list, read_text
+
+
+READ_SIZE = 32
+
+
+def open_attribute(path):
+    """Дескриптор файла sysfs или None, если файла нет."""
+    try:
+        return os.open(path, os.O_RDONLY)
+    except OSError:
+        return None
+
+
+def read_attribute(fd):
+    """Целое из уже открытого файла sysfs.
+
+    Атрибут sysfs перечитывается pread с нулевого смещения, так что
+    файлы открываются один раз, а тик стоит одного системного вызова на
+    файл.
+    """
+    if fd is None:
+        return None
+    try:
+        return int(os.pread(fd, READ_SIZE, 0))
+    except (OSError, ValueError):
+        return None
+
+
+def read_int(path):
+    value = read_text(path)
+    try:
+        return int(value) if value is not None else None
+    except ValueError:
+        return None
+
+
+class CpuFreqReader:
+    """Частота и счётчики троттлинга логических CPU из sysfs.
+
+    Текущая частота берётся из cpufreq/scaling_cur_freq, счётчики -- из
+    thermal_throttle/{core,package}_throttle_count. Базовая частота --
+    cpufreq/base_frequency (intel_pstate), а без неё cpuinfo_max_freq
+    (acpi-cpufreq отдаёт там номинальную частоту). Все частоты в кГц;
+    для отсутствующих файлов (виртуальные машины, другие драйверы)
+    значения -- None. CPU перечисляются в порядке строк cpuN /proc/stat.
+    """
+
+    def __init__(self, sys_root='/sys'):
+        cpu_root = os.path.join(sys_root, 'devices', 'system', 'cpu')
+        online = read_text(os.path.join(cpu_root, 'online'))
+        if online is not None:
+            self.cpus = parse_cpu_list(online)
+        else:
+            self.cpus = sorted(int(name[3:]) for name in os.listdir(cpu_root)
+                               if name.startswith('cpu') and name[3:].isdigit())
+        paths = [os.path.join(cpu_root, f'cpu{cpu}') for cpu in self.cpus]
+        self.freq_fds = [open_attribute(os.path.join(path, 'cpufreq', 'scaling_cur_freq')) for path in paths]
+        self.core_throttle_fds = [open_attribute(os.path.join(path, 'thermal_throttle', 'core_throttle_count'))
+                                  for path in paths]
+        self.package_throttle_fds = [open_attribute(os.path.join(path, 'thermal_throttle', 'package_throttle_count'))
+                                     for path in paths]
+        self.max = [read_int(os.path.join(path, 'cpufreq', 'cpuinfo_max_freq')) for path in paths]
+        self.base = [read_int(os.path.join(path, 'cpufreq', 'base_frequency')) or maximum
+                     for path, maximum in zip(paths, self.max)]
+
+    def read(self):
+        """{'cur', 'base', 'max', 'core_throttle', 'package_throttle'}: списки по CPU."""
+        return {
+            'cur': [read_attribute(fd) for fd in self.freq_fds],
+            'base': self.base,
+            'max': self.max,
+            'core_throttle': [read_attribute(fd) for fd in self.core_throttle_fds],
+            'package_throttle': [read_attribute(fd) for fd in self.package_throttle_fds],
+        }
+
+    def close(self):
+        for fd in self.freq_fds + self.core_throttle_fds + self.package_throttle_fds:
+            if fd is not None:
+                os.close(fd)
+        self.freq_fds = self.core_throttle_fds = self.package_throttle_fds = []
@@ -0,0 +1,88 @@
+import os
+
+import numpy as np
+
+
+# Поля строк cpu в /proc/stat по порядку (в тиках USER_HZ)
+CPU_TIME_FIELDS = ('user', 'nice', 'system', 'idle', 'iowait', 'irq', 'softirq', 'steal', 'guest', 'guest_nice')
+# guest и guest_nice уже входят в user и nice, в общее время они не добавляются
+TOTAL_FIELDS = 8
+IDLE_FIELDS = (3, 4)  # idle и iowait
+# Слагаемые занятого времени без двойного счёта: guest вычитается из user, guest_nice -- из nice
+BREAKDOWN_FIELDS = ('user', 'nice', 'system', 'iowait', 'irq', 'softirq', 'steal', 'guest')
+READ_SIZE = 65536
+
+
+def read_proc_stat(path='/proc/stat'):
+    """Читает /proc/stat целиком одним open и серией read."""
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        chunks = []
+        while True:
+            chunk = os.read(fd, READ_SIZE)
+            if not chunk:
+                break
+            chunks.append(chunk)
+    finally:
+        os.close(fd)
+    return b''.join(chunks)
+
+
+def parse_proc_stat(data):
+    """Разбирает содержимое /proc/stat.
+
+    Возвращает словарь: 'total' -- времена строки cpu, 'cores' --
+    времена строк cpuN по порядку (списки по CPU_TIME_FIELDS, недостающие
+    у старых ядер поля -- нули) и счётчики ctxt, intr (только общее
+    число), procs_running, procs_blocked, processes, btime.
+    """
+    stat = {'total': None, 'cores': []}
+    for line in data.split(b'\n'):
+        if line.startswith(b'cpu'):
+            fields = line.split()
+            times = [int(value) for value in fields[1:len(CPU_TIME_FIELDS) + 1]]
+            times += [0] * (len(CPU_TIME_FIELDS) - len(times))
+            if fields[0] == b'cpu':
+                stat['total'] = times
+            else:
+                stat['cores'].append(times)
+        elif line.startswith((b'ctxt ', b'procs_', b'processes ', b'btime ')):
+            name, value = line.split(None, 1)
+            stat[name.decode()] = int(value)
+        elif line.startswith(b'intr '):
+            # Дальше идут счётчики по каждому прерыванию: они не нужны
+            stat['intr'] = int(line.split(None, 2)[1])
+    return stat
+
+
+def busy_percent(previous, current):
+    """Загрузка по разнице времён (массивы ... x CPU_TIME_FIELDS), %.
+
+    Занятым считается всё время, кроме idle и iowait; при нулевом
+    интервале (или откате счётчиков) загрузка равна нулю.
+    """
+    delta = (np.asarray(current, dtype=np.int64) - np.asarray(previous, dtype=np.int64)).clip(0)
+    total = delta[..., :TOTAL_FIELDS].sum(axis=-1)
+    idle = delta[..., IDLE_FIELDS[0]] + delta[..., IDLE_FIELDS[1]]
+    with np.errstate(invalid='ignore', divide='ignore'):
+        percent = np.where(total > 0, (total - idle) * 100.0 / total, 0.0)
+    return percent
+
+
+def time_breakdown(previous, current):
+    """Доли BREAKDOWN_FIELDS в общем времени CPU за интервал, %.
+
+    Вместе с idle они дают 100%: их можно складывать стопкой.
+    """
+    delta = (np.asarray(current, dtype=np.int64) - np.asarray(previous, dtype=np.int64)).clip(0)
+    user, nice, system, idle, iowait, irq, softirq, steal, guest, guest_nice = delta.tolist()
+    total = sum(delta[:TOTAL_FIELDS].tolist())
+    if total <= 0:
+        return dict.fromkeys(BREAKDOWN_FIELDS, 0.0)
+    parts = (max(user - guest, 0), max(nice - guest_nice, 0), system, iowait, irq, softirq, steal, guest + guest_nice)
+    return {field: part * 100.0 / total for field, part in zip(BREAKDOWN_FIELDS, parts)}
+
+
+def parse_loadavg(data):
+    """Средняя нагрузка за 1, 5 и 15 минут из содержимого /proc/loadavg."""
+    return [float(value) for value in data.split(None, 3)[:3]]
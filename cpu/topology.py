@@ -0,0 +1,210 @@
+import json
+import os
+
+
+CACHE_VERSION = 1
+CACHE_LEVELS = (('l1d', 1, 'Data'), ('l1i', 1, 'Instruction'), ('l2', 2, 'Unified'), ('l3', 3, 'Unified'))
+
+
+def default_topology_cache_path():
+    """Путь к кэшу топологии по умолчанию (в каталоге кэша пользователя)."""
+    cache_home = os.environ.get('XDG_CACHE_HOME') or os.path.expanduser('~/.cache')
+    return os.path.join(cache_home, 'system_performance_analyzer', 'cpu_topology.json')
+
+
+def parse_cpu_list(text):
+    """Список CPU в формате sysfs ('0-3,8,10-11') -> [0, 1, 2, 3, 8, 10, 11]."""
+    cpus = []
+    for part in text.strip().split(','):
+        if not part:
+            continue
+        first, _, last = part.partition('-')
+        cpus.extend(range(int(first), int(last or first) + 1))
+    return cpus
+
+
+def parse_size(text):
+    """Размер кэша из sysfs ('48K', '2048K', '32M') в байтах."""
+    text = text.strip()
+    units = {'K': 1 << 10, 'M': 1 << 20, 'G': 1 << 30}
+    if text and text[-1] in units:
+        return int(text[:-1]) * units[text[-1]]
+    return int(text)
+
+
+def read_text(path, default=None):
+    try:
+        with open(path) as f:
+            return f.read().strip()
+    except OSError:
+        return default
+
+
+def read_cpu_model(proc_root='/proc'):
+    """Модель и признак гипервизора из первого блока /proc/cpuinfo."""
+    model, flags = None, ()
+    try:
+        with open(os.path.join(proc_root, 'cpuinfo')) as f:
+            for line in f:
+                if not line.strip():
+                    break  # Остальные блоки повторяют первый для других CPU
+                name, _, value = line.partition(':')
+                name = name.strip()
+                if name in ('model name', 'Model', 'cpu model') and model is None:
+                    model = value.strip()
+                elif name == 'flags':
+                    flags = value.split()
+    except OSError:
+        pass
+    return model, 'hypervisor' in flags
+
+
+def read_topology(sys_root='/sys', proc_root='/proc'):
+    """Топология процессора из /sys/devices/system/cpu и /sys/devices/system/node.
+
+    Возвращает словарь, пригодный для JSON:
+    'cpus' -- логические CPU в сети по возрастанию номера, для каждого
+    package, die, core, node и siblings (SMT-соседи);
+    'nodes' -- {номер узла NUMA (строкой): [CPU]};
+    'caches' -- кэши без повторов: level, type, size (байты) и cpus,
+    разделяющие этот экземпляр кэша;
+    а также 'model' и 'virtualization'.
+    """
+    cpu_root = os.path.join(sys_root, 'devices', 'system', 'cpu')
+    node_root = os.path.join(sys_root, 'devices', 'system', 'node')
+    online = read_text(os.path.join(cpu_root, 'online'))
+    if online is not None:
+        cpu_ids = parse_cpu_list(online)
+    else:
+        cpu_ids = sorted(int(name[3:]) for name in os.listdir(cpu_root)
+                         if name.startswith('cpu') and name[3:].isdigit())
+
+    node_of = {}
+    nodes = {}
+    if os.path.isdir(node_root):
+        for name in sorted(os.listdir(node_root)):
+            if name.startswith('node') and name[4:].isdigit():
+                cpus = parse_cpu_list(read_text(os.path.join(node_root, name, 'cpulist'), ''))
+                # Ключи -- строки, чтобы словарь не менялся при сохранении в JSON
+                nodes[name[4:]] = cpus
+                node_of.update(dict.fromkeys(cpus, int(name[4:])))
+
+    cpus = []
+    caches = {}
+    for cpu in cpu_ids:
+        base = os.path.join(cpu_root, f'cpu{cpu}')
+
+        def topology_value(name, default=0):
+            return int(read_text(os.path.join(base, 'topology', name), default))
+        cpus.append({
+            'cpu': cpu,
+            'package': topology_value('physical_package_id'),
+            'die': topology_value('die_id'),
+            'core': topology_value('core_id', cpu),
+            'node': node_of.get(cpu, 0),
+            'siblings': parse_cpu_list(read_text(os.path.join(base, 'topology', 'thread_siblings_list'), str(cpu))),
+        })
+        cache_root = os.path.join(base, 'cache')
+        if not os.path.isdir(cache_root):
+            continue
+        for index in sorted(os.listdir(cache_root)):
+            if not index.startswith('index'):
+                continue
+            path = os.path.join(cache_root, index)
+            size = read_text(os.path.join(path, 'size'))
+            if size is None:
+                continue
+            level = int(read_text(os.path.join(path, 'level'), 0))
+            cache_type = read_text(os.path.join(path, 'type'), 'Unified')
+            shared = parse_cpu_list(read_text(os.path.join(path, 'shared_cpu_list'), str(cpu)))
+            # Экземпляр кэша определяется набором CPU, которые его делят
+            caches.setdefault((level, cache_type, tuple(shared)),
+                              {'level': level, 'type': cache_type, 'size': parse_size(size), 'cpus': shared})
+
+    model, hypervisor = read_cpu_model(proc_root)
+    if hypervisor:
+        virtualization = "full"
+    elif read_text(os.path.join(sys_root, 'hypervisor', 'type')):
+        virtualization = "para"
+    else:
+        virtualization = "Не поддерживается"
+    return {
+        'model': model or "Не удалось получить модель",
+        'virtualization': virtualization,
+        'cpus': cpus,
+        'nodes': nodes or {'0': cpu_ids},
+        'caches': sorted(caches.values(), key=lambda cache: (cache['level'], cache['type'], cache['cpus'])),
+    }
+
+
+def load_topology(cache_path=None, sys_root='/sys', proc_root='/proc'):
+    """Топология из кэша на диске или из sysfs.
+
+    Кэш действителен, пока не сменились boot_id и sys_root: до
+    перезагрузки набор процессоров и кэшей не меняется (горячее
+    подключение CPU здесь не учитывается). Без boot_id кэш не
+    используется.
+    """
+    boot_id = read_text(os.path.join(proc_root, 'sys', 'kernel', 'random', 'boot_id'))
+    if cache_path is not None and boot_id is not None:
+        try:
+            with open(cache_path) as f:
+                cached = json.load(f)
+            if (cached.get('version') == CACHE_VERSION and cached.get('boot_id') == boot_id
+                    and cached.get('sys_root') == sys_root):
+                return cached['topology']
+        except (OSError, ValueError, KeyError):
+            pass
+
+    topology = read_topology(sys_root, proc_root)
+    if cache_path is not None and boot_id is not None:
+        try:
+            os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+            temporary = f"{cache_path}.{os.getpid()}"
+            with open(temporary, 'w') as f:
+                json.dump({'version': CACHE_VERSION, 'boot_id': boot_id, 'sys_root': sys_root, 'topology': topology}, f)
+            os.replace(temporary, cache_path)
+        except OSError as e:
+            print(f"Не удалось сохранить топологию CPU в {cache_path}: {e}")
+    return topology
+
+
+def cache_summary(topology):
+    """Кэши по уровням в духе lscpu: {'l1d': (суммарный размер, экземпляров), ...}."""
+    summary = {}
+    for key, level, cache_type in CACHE_LEVELS:
+        instances = [cache for cache in topology['caches'] if cache['level'] == level and cache['type'] == cache_type]
+        if instances:
+            summary[key] = (sum(cache['size'] for cache in instances), len(instances))
+    return summary
+
+
+def cpu_descriptions(topology):
+    """Подписи логических CPU в порядке строк cpuN из /proc/stat.
+
+    В /proc/stat есть только CPU в сети, по возрастанию номера -- в том
+    же порядке, что topology['cpus'].
+    """
+    l3 = {}
+    for number, cache in enumerate(cache for cache in topology['caches'] if cache['level'] == 3):
+        l3.update(dict.fromkeys(cache['cpus'], number))
+    descriptions = []
+    for cpu in topology['cpus']:
+        text = f"CPU {cpu['cpu']}: сокет {cpu['package']}, ядро {cpu['core']}, NUMA {cpu['node']}"
+        if cpu['cpu'] in l3:
+            text += f", L3 #{l3[cpu['cpu']]}"
+        if len(cpu['siblings']) > 1:
+            text += f", SMT с {', '.join(str(sibling) for sibling in cpu['siblings'] if sibling != cpu['cpu'])}"
+        descriptions.append(text)
+    return descriptions
+
+
+def format_cpu_list(cpus):
+    """Обратное к parse_cpu_list(): [0, 1, 2, 3, 8] -> '0-3,8'."""
+    parts = []
+    for cpu in sorted(cpus):
+        if parts and parts[-1][1] == cpu - 1:
+            parts[-1][1] = cpu
+        else:
+            parts.append([cpu, cpu])
+    return ','.join(str(first) if first == last else f"{first}-{last}" for first, last in parts)
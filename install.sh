@@ -30,7 +30,7 @@ copy_application() {
     sudo cp main.py "$INSTALL_DIR/"
     sudo chmod +x "$INSTALL_DIR/main.py"
 
-    for dir in cpu memory process network disk; do
+    for dir in core charts ui cpu memory process network disk; do
         if [[ -d "$dir" ]]; then
             sudo cp -r "$dir" "$INSTALL_DIR/"
         else
@@ -101,7 +101,7 @@ create_terminal_command() {
     sudo tee /usr/local/bin/system_performance_analyzer > /dev/null <<EOF
 #!/bin/bash
 source "$INSTALL_DIR/venv/bin/activate"
-python "$INSTALL_DIR/main.py"
+python "$INSTALL_DIR/main.py" "\$@"
 EOF
 
     sudo chmod +x /usr/local/bin/system_performance_analyzer
@@ -55,7 +55,7 @@ copy_application() {
         exit 1
     fi
 
-    for dir in cpu memory process network disk; do
+    for dir in core charts ui cpu memory process network disk; do
         if [ -d "$dir" ]; then
             sudo cp -r "$dir" /opt/system_performance_analyzer/
         else
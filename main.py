@@ -1,84 +1,88 @@
 #!/usr/bin/env python3
+import argparse
 import sys
-import psutil
-from PySide6 import QtCore, QtWidgets
-from PySide6.QtWidgets import (
-    QLabel, QVBoxLayout, QTableWidget, QTableWidgetItem, QMenu, QWidget, QDialog, QTabWidget
-)
-from os import popen
-from PySide6.QtCore import QTimer, Qt
-from cpu.cpu_tab import CPUResourceTab
-from memory.memory_tab import MemoryResourceTab
-from process.process_tab import ProcessTab
-from network.network_tab import NetworkResourceTab
-from disk.disk_tab import DiskResourceTab
-from matplotlib.figure import Figure
-from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
+from core.history import parse_duration
+from core.history_file import HistoryFile, default_history_path
+from charts.chart import CHART_BACKENDS
+from core.provider import create_provider
+from process.process_collector import PROCESS_SCANNERS
 
 
-class Ui_Dialog(object):
-    def setupUi(self, Dialog):
-        Dialog.setObjectName("Dialog")
-        Dialog.resize(700, 600)
-        Dialog.setSizeGripEnabled(True)
-        Dialog.setModal(False)
+def parse_args():
+    parser = argparse.ArgumentParser(description="Системный анализатор производительности")
+    parser.add_argument("--chart", choices=CHART_BACKENDS, default="mpl",
+                        help="бэкенд графиков: matplotlib (mpl) или QPainter (native)")
+    parser.add_argument("--process-scanner", choices=PROCESS_SCANNERS, default="auto",
+                        help="обход процессов: прямое чтение /proc (procfs) или psutil")
+    parser.add_argument("--history-window", type=parse_duration, default="1h",
+                        help="глубина истории метрик: 30m, 6h, 7d и т.п.")
+    parser.add_argument("--history-file",
+                        help="файл истории метрик, переживающий перезапуск (по умолчанию "
+                             f"{default_history_path()}; при --replay -- только если задан явно)")
+    parser.add_argument("--history-file-window", type=parse_duration, default="6h",
+                        help="глубина истории в файле (при создании файла)")
+    parser.add_argument("--no-history-file", action="store_true",
+                        help="не сохранять историю на диск")
+    parser.add_argument("--headless", action="store_true",
+                        help="сбор метрик без графического интерфейса (Qt и matplotlib не загружаются)")
+    parser.add_argument("--interval", type=float, default=1.0,
+                        help="период сбора метрик, с")
+    parser.add_argument("--output", choices=("json", "none"), default="json",
+                        help="вывод метрик в stdout в режиме --headless")
+    parser.add_argument("--count", type=int, default=None,
+                        help="число тиков в режиме --headless (по умолчанию -- бесконечно)")
+    parser.add_argument("--record", metavar="FILE",
+                        help="записывать все показания в файл (gzip, строки JSON) для воспроизведения")
+    parser.add_argument("--replay", metavar="FILE",
+                        help="показывать записанные через --record показания вместо текущей машины")
+    parser.add_argument("--replay-speed", type=float, default=1.0,
+                        help="скорость воспроизведения; 0 -- по одной записи на тик")
+    parser.add_argument("--sys-root", default="/sys",
+                        help="корень sysfs (например, снятая копия /sys для проверки)")
+    args, qt_args = parser.parse_known_args()
+    # Остаток передаётся Qt (-platform, -style и т.п.); длинная опция в нём --
+    # это опечатка в нашей, и молча запускаться с умолчаниями нельзя
+    unknown = [arg for arg in qt_args if arg.startswith('--')]
+    if unknown or (qt_args and args.headless):
+        parser.error(f"неизвестные аргументы: {' '.join(unknown or qt_args)}")
+    args.qt_args = qt_args
+    return args
 
-        self.layout = QVBoxLayout(Dialog)
-        self.tabWidget = QTabWidget()
-        self.tabWidget.setObjectName("tabWidget")
-        self.tabWidget.setSizePolicy(QtWidgets.QSizePolicy.Expanding, QtWidgets.QSizePolicy.Expanding)
 
-        # Основные вкладки
-        self.create_process_tab()
-        self.create_performance_tabs()
+def run_gui(args, history_file, provider):
+    # Qt импортируется только здесь, чтобы режим --headless обходился без него
+    from PySide6 import QtWidgets
+    from PySide6.QtCore import Qt
+    from ui.dialog import Ui_Dialog
 
-        # Добавляем главный QTabWidget в диалог
-        self.layout.addWidget(self.tabWidget)
-
-        self.retranslateUi(Dialog)
-        QtCore.QMetaObject.connectSlotsByName(Dialog)
-
-    def create_process_tab(self):
-        """Создание вкладки 'Процессы'."""
-        self.process_tab = ProcessTab()
-        self.tabWidget.addTab(self.process_tab, "Процессы")
-
-    def create_performance_tabs(self):
-        """Создание вкладок для производительности."""
-        self.performance_tab = QTabWidget()
-        self.performance_tab.addTab(CPUResourceTab(), "Процессор")
-        self.performance_tab.addTab(MemoryResourceTab(), "Память")
-        self.performance_tab.addTab(DiskResourceTab(), "Диск")
-
-        # Добавляем вкладки сети внутри вкладки 'Производительность'
-        self.add_network_tabs()
-
-        self.tabWidget.addTab(self.performance_tab, "Производительность")
+    app = QtWidgets.QApplication(sys.argv[:1] + args.qt_args)
+    Dialog = QtWidgets.QDialog()
+    ui = Ui_Dialog(chart_backend=args.chart, history_window=args.history_window, history_file=history_file,
+                   interval=args.interval, process_scanner=args.process_scanner, provider=provider)
+    ui.setupUi(Dialog)
+    app.aboutToQuit.connect(ui.sampler.stop, Qt.DirectConnection)
+    Dialog.showMaximized()
+    return app.exec()
 
-    def add_network_tabs(self):
-        """Добавление вкладок для сетевых адаптеров."""
-        active_adapters = [
-            name for name, stats in psutil.net_if_stats().items() if name != "lo" and stats.isup
-        ]
 
-        if not active_adapters:
-            print("Net: No active network adapters found")
-            return
+def run_headless(args, history_file, provider):
+    from core.headless import HeadlessCollector
 
-        for adapter_name in active_adapters:
-            network_tab = NetworkResourceTab(parent=self.performance_tab)
-            network_tab.set_interface_name(adapter_name)  # Устанавливаем имя через метод
-            self.performance_tab.addTab(network_tab, f"Сеть ({adapter_name})")
+    collector = HeadlessCollector(interval=args.interval, history_file=history_file,
+                                  output=sys.stdout if args.output == "json" else None, provider=provider)
+    return collector.run(count=args.count)
 
-    def retranslateUi(self, Dialog):
-        """Установка заголовка окна."""
-        _translate = QtCore.QCoreApplication.translate
-        Dialog.setWindowTitle(_translate("Dialog", "Системный анализатор производительности"))
 
 if __name__ == "__main__":
-    app = QtWidgets.QApplication(sys.argv)
-    Dialog = QDialog()
-    ui = Ui_Dialog()
-    ui.setupUi(Dialog)
-    Dialog.showMaximized()
-    sys.exit(app.exec())
+    args = parse_args()
+    history_file = None
+    # Воспроизведение не должно смешивать записанные показания с историей этой машины
+    history_path = args.history_file or (None if args.replay else default_history_path())
+    if history_path is not None and not args.no_history_file:
+        history_file = HistoryFile(history_path, capacity=int(args.history_file_window / args.interval),
+                                   interval=args.interval)
+    provider = create_provider(args.process_scanner, record=args.record, replay=args.replay,
+                               replay_speed=args.replay_speed, sys_root=args.sys_root)
+    if args.headless:
+        sys.exit(run_headless(args, history_file, provider))
+    sys.exit(run_gui(args, history_file, provider))
@@ -0,0 +1,104 @@
+import psutil
+
+
+# Только нужные поля /proc/meminfo: метка в начале строки -> ключ
+MEMINFO_FIELDS = {
+    b'MemTotal:': 'total',
+    b'MemFree:': 'free',
+    b'MemAvailable:': 'available',
+    b'Buffers:': 'buffers',
+    b'Cached:': 'cached',
+    b'SwapCached:': 'swap_cached',
+    b'SwapTotal:': 'swap_total',
+    b'SwapFree:': 'swap_free',
+    b'Dirty:': 'dirty',
+    b'Writeback:': 'writeback',
+    b'AnonPages:': 'anon',
+    b'Shmem:': 'shmem',
+    b'SReclaimable:': 'slab_reclaimable',
+    b'SUnreclaim:': 'slab_unreclaimable',
+    b'HugePages_Total:': 'hugepages_total',
+    b'Hugepagesize:': 'hugepage_size',
+    b'Hugetlb:': 'hugetlb',
+}
+VMSTAT_FIELDS = {
+    b'pswpin ': 'swap_in',
+    b'pswpout ': 'swap_out',
+    b'pgmajfault ': 'major_faults',
+}
+# Слагаемые памяти снизу вверх: сначала то, что ядро не может просто
+# выбросить, затем вытесняемые кэши, сверху -- вытесненное на диск
+BREAKDOWN_PARTS = ('anon', 'shmem', 'slab_unreclaimable', 'kernel', 'hugepages',
+                   'dirty', 'file', 'slab_reclaimable', 'swap')
+RECLAIMABLE_PARTS = ('file', 'slab_reclaimable')
+
+
+def parse_fields(data, fields):
+    """Значения полей вида "Метка  число [kB]" без разбора остальных строк.
+
+    Каждое поле ищется в содержимом файла по метке в начале строки,
+    лишние строки не режутся и не превращаются в числа. Значения в kB
+    переводятся в байты; поля, которых нет в файле, пропускаются.
+    """
+    values = {}
+    for label, key in fields.items():
+        if data.startswith(label):
+            start = len(label)
+        else:
+            start = data.find(b'\n' + label)
+            if start < 0:
+                continue
+            start += len(label) + 1
+        end = data.find(b'\n', start)
+        text = data[start:end if end >= 0 else len(data)]
+        value = int(text.split(None, 1)[0])
+        values[key] = value * 1024 if text.endswith(b'kB') else value
+    return values
+
+
+def parse_meminfo(data):
+    """Нужные поля /proc/meminfo (MEMINFO_FIELDS), байты; HugePages_Total -- число страниц."""
+    return parse_fields(data, MEMINFO_FIELDS)
+
+
+def parse_vmstat(data):
+    """Счётчики подкачки и отказов страниц из /proc/vmstat (VMSTAT_FIELDS)."""
+    return parse_fields(data, VMSTAT_FIELDS)
+
+
+def psutil_meminfo():
+    """Замена parse_meminfo() без /proc: то, что даёт psutil (остальные поля -- нули)."""
+    memory = psutil.virtual_memory()
+    swap = psutil.swap_memory()
+    info = {'total': memory.total, 'free': memory.free, 'available': memory.available,
+            'swap_total': swap.total, 'swap_free': swap.free}
+    for field, key in (('buffers', 'buffers'), ('cached', 'cached'), ('shared', 'shmem')):
+        info[key] = getattr(memory, field, 0)
+    return info
+
+
+def memory_breakdown(info):
+    """Разбивка памяти по BREAKDOWN_PARTS (байты) без двойного счёта.
+
+    Cached включает shmem и грязные страницы, поэтому они вычитаются из
+    файлового кэша; 'kernel' -- остаток занятой памяти (таблицы страниц,
+    стеки ядра, vmalloc и прочее), который не виден в отдельных полях.
+    """
+    get = info.get
+    hugepages = get('hugetlb', get('hugepages_total', 0) * get('hugepage_size', 0))
+    shmem = get('shmem', 0)
+    page_cache = get('buffers', 0) + get('cached', 0) - shmem
+    dirty = min(get('dirty', 0) + get('writeback', 0), max(page_cache, 0))
+    parts = {
+        'anon': get('anon', 0),
+        'shmem': shmem,
+        'slab_unreclaimable': get('slab_unreclaimable', 0),
+        'hugepages': hugepages,
+        'dirty': dirty,
+        'file': max(page_cache - dirty, 0) + get('swap_cached', 0),
+        'slab_reclaimable': get('slab_reclaimable', 0),
+        'swap': max(get('swap_total', 0) - get('swap_free', 0), 0),
+    }
+    used = get('total', 0) - get('free', 0)
+    parts['kernel'] = max(used - sum(value for key, value in parts.items() if key != 'swap'), 0)
+    return {part: parts[part] for part in BREAKDOWN_PARTS}
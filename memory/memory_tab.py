@@ -1,16 +1,39 @@
-from PySide6.QtCore import QTimer
-from PySide6.QtWidgets import QLabel, QVBoxLayout, QWidget
-from matplotlib.figure import Figure
-from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
-import psutil
+import numpy as np
+from PySide6.QtWidgets import QHBoxLayout, QLabel, QVBoxLayout, QWidget
+from charts.chart import create_chart
+from memory.meminfo import BREAKDOWN_PARTS, RECLAIMABLE_PARTS
+from memory.pressure_panel import PressurePanel
+
+
+GIB = 1024 ** 3
+# Подписи и цвета слагаемых памяти в порядке BREAKDOWN_PARTS (снизу вверх)
+BREAKDOWN_SERIES = {
+    'anon': ("Анонимная (процессы)", 'royalblue'),
+    'shmem': ("Разделяемая (shmem, tmpfs)", 'mediumpurple'),
+    'slab_unreclaimable': ("Slab невытесняемый", 'firebrick'),
+    'kernel': ("Прочее ядро", 'gray'),
+    'hugepages': ("Huge pages", 'black'),
+    'dirty': ("Грязные и на записи", 'darkorange'),
+    'file': ("Файловый кэш", 'lightgreen'),
+    'slab_reclaimable': ("Slab вытесняемый", 'yellowgreen'),
+    'swap': ("Подкачка (на диске)", 'pink'),
+}
+PAGING_SERIES = [
+    ('memory.swap_in', {'label': "Подкачка с диска, стр./с", 'color': 'green'}),
+    ('memory.swap_out', {'label': "Вытеснение на диск, стр./с", 'color': 'red'}),
+    ('memory.major_faults', {'label': "Major page faults, 1/с", 'color': 'blue', 'linestyle': '--'}),
+]
 
 
 class MemoryResourceTab(QWidget):
-    def __init__(self):
+    def __init__(self, sampler, chart_backend='mpl'):
         super().__init__()
         self.layout = QVBoxLayout(self)
-        self.memory_usage = [0] * 60  # храним последние 60 точек
-        self.time_labels = [str(i) for i in range(60)]  # метки времени для оси X
+        self.store = sampler.store  # История загрузки хранится в общем хранилище
+        self.span = 60  # Окно времени графика, с
+        self.memory = None  # Последний срез памяти от сборщика
+        self.pressure = None  # Последний срез PSI
+        self.active = False  # Рисуем только когда вкладка видна
 
         self.memory_info_label = QLabel("Информация о памяти:")
         self.layout.addWidget(self.memory_info_label)
@@ -19,51 +42,87 @@ class MemoryResourceTab(QWidget):
         self.used_label = QLabel("Используется: ")
         self.available_label = QLabel("Доступно: ")
         self.cached_label = QLabel("Кешировано: ")
+        self.swap_label = QLabel("Подкачка: ")
 
         self.layout.addWidget(self.total_label)
         self.layout.addWidget(self.used_label)
         self.layout.addWidget(self.available_label)
         self.layout.addWidget(self.cached_label)
+        self.layout.addWidget(self.swap_label)
+
+        # Состав памяти стопкой: внизу то, что нельзя просто выбросить,
+        # выше -- вытесняемые кэши, над линией объёма RAM -- подкачка.
+        # Серии идут сверху вниз, как на вкладке процессора
+        self.chart = create_chart(
+            chart_backend, 'Состав памяти', 'Время (с)', 'Объём (ГБ)',
+            [{'label': "Объём RAM", 'color': 'black', 'linestyle': '--'}]
+            + [{'label': BREAKDOWN_SERIES[part][0], 'color': BREAKDOWN_SERIES[part][1],
+                'fill': BREAKDOWN_SERIES[part][1], 'fill_alpha': 1.0} for part in reversed(BREAKDOWN_PARTS)])
+        self.paging_chart = create_chart(
+            chart_backend, 'Подкачка и отказы страниц', 'Время (с)', 'В секунду',
+            [spec for _, spec in PAGING_SERIES])
+        charts = QHBoxLayout()
+        charts.addWidget(self.chart, 3)
+        charts.addWidget(self.paging_chart, 2)
+        self.layout.addLayout(charts)
 
-        self.figure = Figure()
-        self.canvas = FigureCanvas(self.figure)
-        self.layout.addWidget(self.canvas)
+        # Процент занятой памяти не говорит, что система уже буксует:
+        # это видно по времени задержек из-за нехватки памяти и ввода-вывода
+        self.pressure_panel = PressurePanel(sampler, chart_backend)
+        self.layout.addWidget(self.pressure_panel)
 
-        self.timer = QTimer()
-        self.timer.timeout.connect(self.update_memory_info)
-        self.timer.start(1000)
+        sampler.sampled.connect(self.update_memory_info)
 
-        self.update_memory_info()
+    def update_memory_info(self, snapshot):
+        self.memory = snapshot['memory']
+        self.pressure = snapshot['pressure']
 
-    def update_memory_info(self):
-        memory = psutil.virtual_memory()
+        if self.active:
+            self.update_view()
 
-        # Обновляем данные: удаляем старую точку, добавляем новую
-        self.memory_usage.pop(0)
-        self.memory_usage.append(memory.percent)
+    def set_active(self, active):
+        """Включает или выключает отрисовку вкладки (история пишется всегда)."""
+        self.active = active
+        if active and self.memory is not None:
+            self.update_view()
 
-        self.total_label.setText(f"Всего: {memory.total / (1024 ** 2):.2f} MB")
-        self.used_label.setText(f"Используется: {memory.used / (1024 ** 2):.2f} MB")
-        self.available_label.setText(f"Доступно: {memory.available / (1024 ** 2):.2f} MB")
-        self.cached_label.setText(f"Кешировано: {memory.cached / (1024 ** 2):.2f} MB")
+    def update_view(self):
+        """Обновляет подписи и график по последнему срезу."""
+        memory = self.memory
+        parts = memory['breakdown']
+        reclaimable = sum(parts[part] for part in RECLAIMABLE_PARTS)
+
+        self.total_label.setText(f"Всего: {memory['total'] / (1024 ** 2):.2f} MB")
+        self.used_label.setText(f"Используется (без вытесняемых кэшей): "
+                                f"{(memory['total'] - memory['available']) / (1024 ** 2):.2f} MB "
+                                f"({memory['percent']:.1f}%)")
+        self.available_label.setText(f"Доступно: {memory['available'] / (1024 ** 2):.2f} MB")
+        self.cached_label.setText(f"Кешировано (вытесняемо): {reclaimable / (1024 ** 2):.2f} MB, "
+                                  f"из них грязных и на записи: {parts['dirty'] / (1024 ** 2):.2f} MB")
+        if memory['swap_total']:
+            self.swap_label.setText(f"Подкачка: {parts['swap'] / (1024 ** 2):.2f} из "
+                                    f"{memory['swap_total'] / (1024 ** 2):.2f} MB")
+        else:
+            self.swap_label.setText("Подкачка: не настроена")
+        self.pressure_panel.set_pressure(self.pressure)
 
         self.update_graph()
 
     def update_graph(self):
-        self.figure.clear()
-        ax = self.figure.add_subplot(111)
-        ax.set_facecolor('white')
-
-        ax.fill_between(range(len(self.memory_usage)), self.memory_usage, color='lightblue', alpha=0.5)
-        ax.plot(self.memory_usage, label='Использование памяти (%)', color='blue')
-
-        ax.set_ylim(0, 100)
-        ax.set_xlim(0, len(self.memory_usage) - 1)
-        ax.set_title('Использование памяти')
-        ax.set_xlabel('Время (с)')
-        ax.set_ylabel('Использование (%)')
-        ax.set_xticks(range(0, len(self.memory_usage), 10))
-        ax.set_xticklabels(["1 мин", "50 сек", "40 сек", "30 сек", "20 сек", "10 сек"])
-        ax.legend()
-        ax.grid(True)
-        self.canvas.draw()
\ No newline at end of file
+        x, parts = self.store.query_stacked([f'memory.{part}' for part in BREAKDOWN_PARTS], self.span,
+                                            self.chart.max_points())
+        stacked = np.cumsum(np.nan_to_num(np.array(parts)), axis=0) / GIB if len(x) else [() for _ in parts]
+        total = np.full(len(x), self.memory['total'] / GIB if self.memory else np.nan)
+        self.chart.update_series([(x, total)] + [(x, stacked[i]) for i in reversed(range(len(parts)))])
+        self.paging_chart.update_series([self.store.query(name, self.span, self.paging_chart.max_points())
+                                         for name, _ in PAGING_SERIES])
+        self.pressure_panel.update_graph()
+
+    def set_span(self, span):
+        """Меняет окно времени графика (в секундах)."""
+        self.span = span
+        self.chart.set_span(span)
+        self.paging_chart.set_span(span)
+        self.pressure_panel.set_span(span)
+        if self.active:
+            self.update_graph()
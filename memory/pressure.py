@@ -0,0 +1,79 @@
+import os
+import select
+
+
+PRESSURE_RESOURCES = ('cpu', 'memory', 'io')
+PRESSURE_KINDS = ('some', 'full')
+AVERAGES = ('avg10', 'avg60', 'avg300')
+# Окно триггера: непривилегированным процессам ядро разрешает только окна, кратные 2 с
+TRIGGER_WINDOW_US = 2_000_000
+
+
+def parse_pressure(data):
+    """Разбирает /proc/pressure/<ресурс>.
+
+    Возвращает {'some': {'avg10', 'avg60', 'avg300', 'total'}, 'full': {...}}:
+    средние -- доли времени в процентах, total -- суммарное время
+    задержки в микросекундах. Строки full для cpu нет у ядер до 5.13.
+    """
+    pressure = {}
+    for line in data.split(b'\n'):
+        fields = line.split()
+        if not fields or fields[0].decode() not in PRESSURE_KINDS:
+            continue
+        values = dict(field.split(b'=', 1) for field in fields[1:])
+        pressure[fields[0].decode()] = {name.decode(): float(value) if name != b'total' else int(value)
+                                        for name, value in values.items()}
+    return pressure
+
+
+def stall_percent(previous, current, elapsed):
+    """Доля времени задержки между двумя чтениями (%): по приросту total, а не по avg10."""
+    if previous is None or not elapsed:
+        return 0.0
+    return min(max(current - previous, 0) / (elapsed * 1e6) * 100, 100.0)
+
+
+class PressureTrigger:
+    """Триггер PSI: ядро само сообщает о превышении порога.
+
+    В файл /proc/pressure/<ресурс> пишется "<some|full> <порог, мкс>
+    <окно, мкс>", после чего poll() с POLLPRI просыпается, когда за окно
+    задержка превысила порог (не чаще раза за окно). Триггер живёт, пока
+    открыт файл. Без поддержки в ядре (до 5.2) или без прав на запись
+    конструктор бросает OSError.
+    """
+
+    def __init__(self, resource, kind, threshold_us, window_us=TRIGGER_WINDOW_US, proc_root='/proc'):
+        self.resource = resource
+        self.kind = kind
+        self.fd = os.open(os.path.join(proc_root, 'pressure', resource), os.O_RDWR | os.O_NONBLOCK)
+        try:
+            os.write(self.fd, f"{kind} {int(threshold_us)} {int(window_us)}\0".encode())
+        except OSError:
+            os.close(self.fd)
+            raise
+
+    def fileno(self):
+        return self.fd
+
+    def close(self):
+        if self.fd is not None:
+            os.close(self.fd)
+            self.fd = None
+
+
+def wait_triggers(triggers, timeout_ms):
+    """Ждёт срабатывания триггеров не дольше timeout_ms; возвращает сработавшие."""
+    poller = select.poll()
+    by_fd = {}
+    for trigger in triggers:
+        poller.register(trigger.fileno(), select.POLLPRI)
+        by_fd[trigger.fileno()] = trigger
+    fired = []
+    for fd, events in poller.poll(timeout_ms):
+        if events & select.POLLERR:
+            raise OSError(f"триггер PSI {by_fd[fd].resource} больше не работает")
+        if events & select.POLLPRI:
+            fired.append(by_fd[fd])
+    return fired
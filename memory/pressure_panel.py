@@ -0,0 +1,161 @@
+import threading
+import time
+
+from PySide6.QtCore import QObject, Signal
+from PySide6.QtWidgets import QCheckBox, QGridLayout, QHBoxLayout, QLabel, QSpinBox, QVBoxLayout, QWidget
+from charts.chart import create_chart
+from core.provider import ReplayProvider
+from memory.pressure import (AVERAGES, PRESSURE_KINDS, PRESSURE_RESOURCES, TRIGGER_WINDOW_US, PressureTrigger,
+                             wait_triggers)
+
+
+PRESSURE_SERIES = [
+    ('pressure.cpu.some', {'label': "CPU some", 'color': 'green'}),
+    ('pressure.memory.some', {'label': "Память some", 'color': 'blue'}),
+    ('pressure.memory.full', {'label': "Память full", 'color': 'blue', 'linestyle': '--'}),
+    ('pressure.io.some', {'label': "Ввод-вывод some", 'color': 'darkorange'}),
+    ('pressure.io.full', {'label': "Ввод-вывод full", 'color': 'darkorange', 'linestyle': '--'}),
+]
+RESOURCE_NAMES = {'cpu': "CPU", 'memory': "Память", 'io': "Ввод-вывод"}
+
+
+class PressureWatcher(QObject):
+    """Ждёт срабатывания триггеров PSI в фоновом потоке.
+
+    Поток спит в poll() и просыпается только по событию ядра или раз в
+    полсекунды, чтобы проверить флаг остановки. Сигналы доставляются в
+    поток GUI.
+    """
+
+    triggered = Signal(str, str)  # ресурс, some/full
+    failed = Signal(str)
+
+    def __init__(self, triggers):
+        super().__init__()
+        self.triggers = triggers
+        self.stopping = threading.Event()
+        self.thread = threading.Thread(target=self.run, name="PressureWatcher", daemon=True)
+
+    def start(self):
+        self.thread.start()
+
+    def run(self):
+        while not self.stopping.is_set():
+            try:
+                fired = wait_triggers(self.triggers, 500)
+            except OSError as e:
+                self.failed.emit(str(e))
+                return
+            for trigger in fired:
+                self.triggered.emit(trigger.resource, trigger.kind)
+
+    def stop(self):
+        self.stopping.set()
+        self.thread.join()
+        for trigger in self.triggers:
+            trigger.close()
+
+
+class PressurePanel(QWidget):
+    """Панель PSI: средние ядра, доля задержки за тик и уведомления по триггерам."""
+
+    def __init__(self, sampler, chart_backend='mpl'):
+        super().__init__()
+        self.store = sampler.store
+        self.span = 60
+        self.watcher = None
+        self.fired = 0
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+
+        self.title = QLabel("Задержки из-за нехватки ресурсов (PSI), % времени:")
+        layout.addWidget(self.title)
+        grid = QGridLayout()
+        columns = [f"{kind} {average}" for kind in PRESSURE_KINDS for average in AVERAGES + ('за тик',)]
+        for column, text in enumerate(columns, 1):
+            grid.addWidget(QLabel(text), 0, column)
+        self.cells = {}
+        for row, resource in enumerate(PRESSURE_RESOURCES, 1):
+            grid.addWidget(QLabel(RESOURCE_NAMES[resource]), row, 0)
+            for column, text in enumerate(columns, 1):
+                self.cells[resource, text] = QLabel("-")
+                grid.addWidget(self.cells[resource, text], row, column)
+        layout.addLayout(grid)
+
+        self.chart = create_chart(
+            chart_backend, 'Задержки (PSI)', 'Время (с)', 'Доля времени (%)',
+            [spec for _, spec in PRESSURE_SERIES])
+        layout.addWidget(self.chart)
+
+        triggers = QHBoxLayout()
+        self.triggers_enabled = QCheckBox(f"Уведомлять, когда задержка some за {TRIGGER_WINDOW_US // 10 ** 6} с превышает")
+        self.threshold = QSpinBox()
+        self.threshold.setRange(1, 100)
+        self.threshold.setValue(10)
+        self.threshold.setSuffix(" %")
+        self.trigger_status = QLabel()
+        triggers.addWidget(self.triggers_enabled)
+        triggers.addWidget(self.threshold)
+        triggers.addWidget(self.trigger_status, 1)
+        layout.addLayout(triggers)
+        if isinstance(sampler.provider, ReplayProvider):
+            # Триггеры ставятся в ядре текущей машины, а не в записи
+            self.triggers_enabled.setEnabled(False)
+            self.triggers_enabled.setToolTip("Недоступно при воспроизведении записи")
+        self.triggers_enabled.toggled.connect(self.restart_triggers)
+        self.threshold.valueChanged.connect(self.restart_triggers)
+
+    def set_pressure(self, pressure):
+        """Заполняет таблицу по срезу snapshot['pressure']."""
+        if not pressure:
+            self.title.setText("Задержки из-за нехватки ресурсов (PSI): нет /proc/pressure (ядро без CONFIG_PSI)")
+            return
+        for resource in PRESSURE_RESOURCES:
+            for kind in PRESSURE_KINDS:
+                values = pressure.get(resource, {}).get(kind)
+                for average in AVERAGES + ('за тик',):
+                    value = values and values['rate' if average == 'за тик' else average]
+                    self.cells[resource, f"{kind} {average}"].setText("-" if values is None else f"{value:.2f}")
+
+    def update_graph(self):
+        self.chart.update_series([self.store.query(name, self.span, self.chart.max_points())
+                                  for name, _ in PRESSURE_SERIES])
+
+    def set_span(self, span):
+        self.span = span
+        self.chart.set_span(span)
+
+    def restart_triggers(self):
+        """Пересоздаёт триггеры под текущий порог (или снимает их)."""
+        self.stop_triggers()
+        if not self.triggers_enabled.isChecked():
+            self.trigger_status.setText("")
+            return
+        threshold_us = TRIGGER_WINDOW_US * self.threshold.value() // 100
+        triggers = []
+        try:
+            for resource in PRESSURE_RESOURCES:
+                triggers.append(PressureTrigger(resource, 'some', threshold_us))
+        except OSError as e:
+            for trigger in triggers:
+                trigger.close()
+            self.trigger_status.setText(f"Триггеры PSI недоступны: {e}")
+            return
+        self.fired = 0
+        self.watcher = PressureWatcher(triggers)
+        self.watcher.triggered.connect(self.on_triggered)
+        self.watcher.failed.connect(self.trigger_status.setText)
+        self.watcher.start()
+        self.trigger_status.setStyleSheet("")
+        self.trigger_status.setText("Ожидание срабатывания")
+
+    def stop_triggers(self):
+        if self.watcher is not None:
+            self.watcher.stop()
+            self.watcher = None
+
+    def on_triggered(self, resource, kind):
+        self.fired += 1
+        self.trigger_status.setStyleSheet("color: red")
+        self.trigger_status.setText(f"{RESOURCE_NAMES[resource]} {kind}: порог превышен в "
+                                    f"{time.strftime('%H:%M:%S')} (срабатываний: {self.fired})")
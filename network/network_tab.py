@@ -1,36 +1,35 @@
-import psutil
 from PySide6 import QtCore, QtWidgets
 from PySide6.QtCore import QTimer, Qt
 from PySide6.QtWidgets import (
     QLabel, QVBoxLayout, QTableWidget, QTableWidgetItem, QMenu, QWidget, QDialog, QTabWidget
 )
 import time
-import socket
-from matplotlib.figure import Figure
-from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
+from charts.chart import create_chart
+from core.provider import LiveProvider
 
 class NetworkResourceTab(QWidget):
-    def __init__(self, parent=None, interface_name=None):
+    def __init__(self, parent=None, interface_name=None, sampler=None, chart_backend='mpl'):
         super().__init__(parent)
         self.layout = QVBoxLayout(self)
         self.interface_name = interface_name
-        self.netReceiveArray = [0] * 60  # История скоростей получения (60 точек для 6 колонок)
-        self.netSendArray = [0] * 60  # История скоростей отправки
-
-        # Таймер для обновления данных
-        self.timer = QTimer(self)
-        self.net_state1 = None
-        self.net_state2 = None
-        self.t1 = None
-        self.t2 = None
+        self.chart_backend = chart_backend
+        self.store = sampler.store if sampler is not None else None  # История скоростей в общем хранилище
+        self.provider = sampler.provider if sampler is not None else LiveProvider()
+        self.span = 60  # Окно времени графика, с
+        self.active = False  # Рисуем только когда вкладка видна
 
         self.setup_ui()
         self.initialize_network_data()
 
+        # Данные приходят от общего сборщика метрик
+        if sampler is not None:
+            sampler.sampled.connect(self.update_network_info)
+
     def set_interface_name(self, interface_name):
         """Метод для установки имени интерфейса."""
         self.interface_name = interface_name
         self.adapter_name_label.setText(f"Имя адаптера: {self.interface_name}") 
+        self.chart.set_title(f"Сетевой трафик — {self.interface_name}")
         self.initialize_network_data()
 
     def setup_ui(self):
@@ -51,9 +50,12 @@ class NetworkResourceTab(QWidget):
         self.layout.addWidget(self.speed_recv_label)
 
         # Настройка графика
-        self.figure = Figure()
-        self.canvas = FigureCanvas(self.figure)
-        self.layout.addWidget(self.canvas)
+        self.chart = create_chart(
+            self.chart_backend, "Сетевой трафик", "Время (сек)", "Скорость (КБ/с)",
+            [{'label': "Отправка (КБ/с)", 'color': "blue", 'linestyle': "--", 'fill': "blue", 'fill_alpha': 0.3},
+             {'label': "Получение (КБ/с)", 'color': "green", 'linestyle': "-", 'fill': "green", 'fill_alpha': 0.3}],
+            headroom=1.2)
+        self.layout.addWidget(self.chart)
 
     def initialize_network_data(self):
         """Инициализация сетевых данных для выбранного интерфейса."""
@@ -63,15 +65,9 @@ class NetworkResourceTab(QWidget):
         # Обновляем информацию об адаптере
         self.update_adapter_info()
 
-        # Инициализация для таймера
-        self.net_state1 = psutil.net_io_counters(pernic=True).get(self.interface_name, None)
-        self.t1 = time.time()
-        self.timer.timeout.connect(self.update_network_info)
-        self.timer.start(1500)
-
     def update_adapter_info(self):
         """Обновление информации об адаптере."""
-        stats = psutil.net_if_stats().get(self.interface_name, None)
+        stats = self.provider.net_interfaces().get(self.interface_name, None)
 
         # Тип адаптера
         if stats:
@@ -83,68 +79,45 @@ class NetworkResourceTab(QWidget):
                 self.adapter_type_label.setText("Тип адаптера: Неизвестно")
 
         # Адреса IPv4 и IPv6
-        addresses = psutil.net_if_addrs().get(self.interface_name, [])
-        ipv4 = next((addr.address for addr in addresses if addr.family == socket.AF_INET), "Неизвестно")
-        ipv6 = next((addr.address for addr in addresses if addr.family == socket.AF_INET6), "Неизвестно")
+        ipv4 = (stats or {}).get('ipv4') or "Неизвестно"
+        ipv6 = (stats or {}).get('ipv6') or "Неизвестно"
         self.ipv4_label.setText(f"IPv4: {ipv4}")
         self.ipv6_label.setText(f"IPv6: {ipv6}")
 
-    def update_network_info(self):
+    def update_network_info(self, snapshot):
         """Обновление информации о сетевых скоростях."""
         if not self.interface_name:
             return
 
-        self.net_state2 = psutil.net_io_counters(pernic=True).get(self.interface_name, None)
-        self.t2 = time.time()
-
-        if self.net_state1 and self.net_state2:
-            time_diff = self.t2 - self.t1
-            send_speed = (self.net_state2.bytes_sent - self.net_state1.bytes_sent) / time_diff / 1024  # КБ/с
-            recv_speed = (self.net_state2.bytes_recv - self.net_state1.bytes_recv) / time_diff / 1024  # КБ/с
-
-            # Обновление данных для графика
-            self.netSendArray.pop(0)
-            self.netSendArray.append(send_speed)
+        # Скорости уже записаны сборщиком в хранилище истории
+        if self.active:
+            self.update_view()
 
-            self.netReceiveArray.pop(0)
-            self.netReceiveArray.append(recv_speed)
+    def set_active(self, active):
+        """Включает или выключает отрисовку вкладки (история пишется всегда)."""
+        self.active = active
+        if active and self.store is not None and self.interface_name:
+            self.update_view()
 
-            # Обновление меток
-            self.speed_send_label.setText(f"Скорость отправки: {send_speed:.2f} КБ/с")
-            self.speed_recv_label.setText(f"Скорость получения: {recv_speed:.2f} КБ/с")
-
-            self.update_graph()
-
-        self.net_state1 = self.net_state2
-        self.t1 = self.t2
+    def update_view(self):
+        """Обновление меток и графика по последним значениям."""
+        send_speed = self.store.last(f"net.{self.interface_name}.send")
+        recv_speed = self.store.last(f"net.{self.interface_name}.recv")
+        self.speed_send_label.setText(f"Скорость отправки: {send_speed:.2f} КБ/с")
+        self.speed_recv_label.setText(f"Скорость получения: {recv_speed:.2f} КБ/с")
+        self.update_graph()
 
     def update_graph(self):
         """Обновление графика сетевых скоростей."""
-        self.figure.clear()
-        ax = self.figure.add_subplot(111)
-        ax.set_facecolor('white')
-
-        # Графики для отправки и получения данных
-        ax.plot(self.netSendArray, label="Отправка (КБ/с)", color="blue", linestyle="--")
-        ax.plot(self.netReceiveArray, label="Получение (КБ/с)", color="green", linestyle="-")
-
-        ax.fill_between(range(len(self.netSendArray)), self.netSendArray, color="blue", alpha=0.3)
-        ax.fill_between(range(len(self.netReceiveArray)), self.netReceiveArray, color="green", alpha=0.3)
-
-        # Ограничения и сетка
-        max_speed = max(max(self.netSendArray), max(self.netReceiveArray), 1)
-        ax.set_ylim(0, max_speed * 1.2)
-        ax.set_xlim(0, len(self.netSendArray) - 1)
-
-        # Настройка оси X: справа налево (от старых к новым)
-        ax.set_xticks(range(0, 60, 10))
-        ax.set_xticklabels(["1 мин", "50 сек", "40 сек", "30 сек", "20 сек", "10 сек"])
-
-        # Подписи
-        ax.set_title(f"Сетевой трафик — {self.interface_name}")
-        ax.set_xlabel("Время (сек)")
-        ax.set_ylabel("Скорость (КБ/с)")
-
-        ax.legend()
-        ax.grid(True)
-        self.canvas.draw()
\ No newline at end of file
+        max_points = self.chart.max_points()
+        self.chart.update_series([
+            self.store.query(f"net.{self.interface_name}.send", self.span, max_points),
+            self.store.query(f"net.{self.interface_name}.recv", self.span, max_points),
+        ])
+
+    def set_span(self, span):
+        """Меняет окно времени графика (в секундах)."""
+        self.span = span
+        self.chart.set_span(span)
+        if self.active and self.store is not None and self.interface_name:
+            self.update_graph()
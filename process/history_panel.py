@@ -0,0 +1,62 @@
+import numpy as np
+from PySide6.QtWidgets import QGridLayout, QLabel, QWidget
+from charts.native_chart import NativeChart, Sparkline
+from process.process_details import format_bytes
+from process.process_history import PROCESS_SERIES
+
+
+def last_finite(values, format_value):
+    """Последнее конечное значение ряда через format_value или "—", если таких нет."""
+    finite = np.flatnonzero(np.isfinite(values))
+    return format_value(values[finite[-1]]) if len(finite) else "—"
+
+
+class ProcessHistoryPanel(QWidget):
+    """Спарклайны CPU, RSS и ввода-вывода выбранного процесса."""
+
+    def __init__(self, history):
+        super().__init__()
+        self.history = history
+        span = history.capacity * history.interval
+
+        layout = QGridLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+        self.title = QLabel()
+        layout.addWidget(self.title, 0, 0, 1, 2)
+
+        self.cpu_label = QLabel()
+        self.cpu_chart = Sparkline('green', fill='lightgreen', span=span)
+        self.rss_label = QLabel()
+        self.rss_chart = Sparkline('purple', fill='thistle', span=span)
+        self.io_label = QLabel()
+        self.io_chart = NativeChart('', '', '', [
+            {'label': 'Чтение', 'color': 'blue'},
+            {'label': 'Запись', 'color': 'red', 'linestyle': '--'},
+        ], span=span, compact=True)
+        for row, (label, chart) in enumerate(((self.cpu_label, self.cpu_chart),
+                                              (self.rss_label, self.rss_chart),
+                                              (self.io_label, self.io_chart)), 1):
+            label.setMinimumWidth(260)
+            layout.addWidget(label, row, 0)
+            layout.addWidget(chart, row, 1)
+            chart.setFixedHeight(40)
+
+    def show_process(self, pid, name):
+        """Показывает историю процесса; без истории панель скрывается."""
+        series = self.history.series(pid) if pid is not None else None
+        if series is None:
+            self.hide()
+            return
+        x, values = series
+        minutes = round(self.cpu_chart.span / 60)
+        self.title.setText(f"История процесса {name} (PID: {pid}) за {minutes} мин")
+        cpu, rss, read, write = (values[key] for key in PROCESS_SERIES)
+        # Последнего отсчёта может не быть (процесс не попал в обход): показывается предыдущий
+        self.cpu_label.setText(f"CPU: {last_finite(cpu, lambda value: f'{value:.2f}%')}")
+        self.rss_label.setText(f"Резидентная память: {last_finite(rss, format_bytes)}")
+        self.io_label.setText(f"Диск: чтение {last_finite(read, lambda value: format_bytes(value) + '/с')}, "
+                              f"запись {last_finite(write, lambda value: format_bytes(value) + '/с')}")
+        self.cpu_chart.update_series([(x, cpu)])
+        self.rss_chart.update_series([(x, rss)])
+        self.io_chart.update_series([(x, read), (x, write)])
+        self.show()
@@ -0,0 +1,150 @@
+import os
+import pwd
+import time
+
+import psutil
+from process.procfs_scanner import PAGE_SIZE, parse_stat, read_file
+
+
+class ProcessCollector:
+    """Собирает список процессов для вкладки 'Процессы'.
+
+    Объекты psutil.Process хранятся между опросами в кэше с ключом
+    (pid, время запуска), поэтому переиспользованный PID не путается с
+    прежним процессом. Загрузка CPU считается по разнице cpu_times между
+    двумя опросами, а не первым (всегда нулевым) вызовом cpu_percent().
+    Счётчики ввода-вывода перечитываются только у процессов, чьё время
+    CPU выросло: простаивающий процесс ввод-вывод не выполнял (как в
+    ProcfsScanner.fill_io).
+    """
+
+    def __init__(self, proc_root=None):
+        # По умолчанию /proc читается там же, где его читает psutil
+        self.proc_root = proc_root or psutil.PROCFS_PATH
+        self.has_stat = os.path.exists(os.path.join(self.proc_root, 'self', 'stat'))
+        self.logical_cpus = psutil.cpu_count(logical=True) or 1
+        # pid -> (create_time, Process, starttime в тиках или None, cpu_time и io_counters прошлого опроса)
+        self.cache = {}
+        self.usernames = {}  # uid -> имя пользователя
+        self.last_time = None
+
+    def username(self, uid):
+        """Имя пользователя по uid с кэшированием: pwd дешевле, чем Process.username()."""
+        name = self.usernames.get(uid)
+        if name is None:
+            try:
+                name = pwd.getpwuid(uid).pw_name
+            except KeyError:
+                name = str(uid)
+            self.usernames[uid] = name
+        return name
+
+    @staticmethod
+    def io_counters(proc):
+        """Счётчики ввода-вывода или None, если они недоступны (чужой процесс, не Linux)."""
+        try:
+            return proc.io_counters()
+        except (psutil.AccessDenied, AttributeError, OSError):
+            return None
+
+    def read_stat(self, pid):
+        """(starttime в тиках, RSS в байтах) из /proc/[pid]/stat; None, если процесс завершился.
+
+        По starttime узнаётся переиспользованный PID: Process.create_time()
+        кэшируется в объекте и его не заметит, а is_running() создаёт новый
+        Process и читает stat лишний раз. RSS берётся из того же чтения
+        вместо memory_info() (statm), так что чтений на процесс не больше,
+        чем при обходе одним psutil.
+        """
+        data = read_file(f"{self.proc_root}/{pid}/stat")
+        if data is None:
+            return None
+        try:
+            _, _, _, start, rss_pages = parse_stat(data)
+        except (ValueError, IndexError):
+            return None
+        return start, rss_pages * PAGE_SIZE
+
+    def process(self, pid, start=None):
+        """Возвращает закэшированный Process для pid, создавая новый при необходимости."""
+        entry = self.cache.get(pid)
+        if entry is not None:
+            return entry
+        proc = psutil.Process(pid)
+        entry = (proc.create_time(), proc, start, None, None)
+        self.cache[pid] = entry
+        return entry
+
+    def collect(self):
+        """Возвращает список процессов; сортирует их модель таблицы."""
+        now = time.monotonic()
+        elapsed = now - self.last_time if self.last_time is not None else None
+        self.last_time = now
+        total_memory = psutil.virtual_memory().total
+
+        processes = []
+        alive = {}
+        for pid in psutil.pids():
+            # Без /proc (не Linux) время запуска и RSS дают только вызовы psutil
+            stat = self.read_stat(pid) if self.has_stat else None
+            if self.has_stat and stat is None:
+                continue
+            try:
+                create_time, proc, start, last_cpu, io = self.process(pid, stat and stat[0])
+                with proc.oneshot():
+                    # Процесс с тем же PID, но другим временем запуска — это новый процесс
+                    if (start != stat[0]) if stat else not proc.is_running():
+                        del self.cache[pid]
+                        # Новый процесс читается вне oneshot(), но PID переиспользуется редко
+                        create_time, proc, start, last_cpu, io = self.process(pid, stat and stat[0])
+                    name = proc.name()
+                    ppid = proc.ppid()
+                    cpu_times = proc.cpu_times()
+                    rss = stat[1] if stat else proc.memory_info().rss
+                    uid = proc.uids().real
+                    cpu_time = cpu_times.user + cpu_times.system
+                    if last_cpu is None or cpu_time != last_cpu:
+                        io = self.io_counters(proc)
+            except (psutil.NoSuchProcess, psutil.AccessDenied):
+                # Завершившийся процесс не попадёт в alive и уйдёт из кэша
+                continue
+
+            cpu_percent = 0.0
+            if last_cpu is not None and elapsed:
+                cpu_percent = max(cpu_time - last_cpu, 0.0) / elapsed * 100 / self.logical_cpus
+            alive[pid] = (create_time, proc, start, cpu_time, io)
+
+            processes.append({
+                'pid': pid,
+                'ppid': ppid,
+                'name': name or '',
+                'cpu_percent': cpu_percent,
+                'memory_percent': rss / total_memory * 100 if total_memory else 0.0,
+                'username': self.username(uid),
+                'started': create_time,
+                'rss': rss,
+                'read_bytes': io.read_bytes if io is not None else None,
+                'write_bytes': io.write_bytes if io is not None else None,
+            })
+
+        # В кэше остаются только живые процессы
+        self.cache = alive
+        return processes
+
+
+PROCESS_SCANNERS = ('auto', 'procfs', 'psutil')
+
+
+def create_process_collector(scanner='auto', proc_root='/proc'):
+    """Создаёт сборщик процессов.
+
+    'procfs' читает /proc напрямую (только Linux), 'psutil' -- переносимый
+    вариант через psutil, 'auto' выбирает procfs, если он доступен.
+    """
+    if scanner in ('auto', 'procfs'):
+        from process.procfs_scanner import ProcfsScanner
+        if ProcfsScanner.available(proc_root):
+            return ProcfsScanner(proc_root)
+        if scanner == 'procfs':
+            print(f"{proc_root} недоступен, используется psutil")
+    return ProcessCollector(proc_root)
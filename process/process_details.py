@@ -0,0 +1,113 @@
+import time
+
+import psutil
+
+
+# Дорогие атрибуты процесса: запрашиваются только для видимых строк таблицы
+DETAIL_COLUMNS = [
+    ('rss', "RSS"),
+    ('uss', "USS"),
+    ('pss', "PSS"),
+    ('threads', "Потоки"),
+    ('fds', "Дескрипторы"),
+    ('read_rate', "Чтение, /с"),
+    ('write_rate', "Запись, /с"),
+    ('nice', "Nice"),
+    ('cmdline', "Командная строка"),
+]
+DETAIL_KEYS = [key for key, _ in DETAIL_COLUMNS]
+BYTE_DETAILS = {'rss', 'uss', 'pss', 'read_rate', 'write_rate'}
+
+
+def format_bytes(value):
+    for unit in ("Б", "КБ", "МБ", "ГБ"):
+        if abs(value) < 1024:
+            return f"{value:.1f} {unit}"
+        value /= 1024
+    return f"{value:.1f} ТБ"
+
+
+class ProcessDetails:
+    """Кэш дорогих атрибутов процессов с временем жизни ttl секунд.
+
+    fetch() получает список PID (видимые строки) и набор нужных
+    столбцов; заново читаются только процессы, чьи значения устарели.
+    USS и PSS требуют разбора smaps_rollup и запрашиваются, только если
+    их столбцы включены. Скорость ввода-вывода считается по разности
+    счётчиков между двумя чтениями одного процесса.
+    """
+
+    def __init__(self, ttl=5.0):
+        self.ttl = ttl
+        self.cache = {}  # pid -> (время чтения, значения, запрошенные столбцы)
+        self.counters = {}  # pid -> (время, read_bytes, write_bytes)
+
+    def read(self, pid, columns):
+        proc = psutil.Process(pid)
+        values = {}
+        with proc.oneshot():
+            if columns & {'uss', 'pss'}:
+                try:
+                    info = proc.memory_full_info()
+                    values['uss'] = info.uss
+                    values['pss'] = getattr(info, 'pss', None)
+                    values['rss'] = info.rss
+                except psutil.AccessDenied:
+                    pass
+            if 'rss' in columns and 'rss' not in values:
+                values['rss'] = proc.memory_info().rss
+            if 'threads' in columns:
+                values['threads'] = proc.num_threads()
+            if 'fds' in columns:
+                try:
+                    values['fds'] = proc.num_fds()
+                except (psutil.AccessDenied, AttributeError):
+                    pass
+            if 'nice' in columns:
+                values['nice'] = proc.nice()
+            if 'cmdline' in columns:
+                try:
+                    values['cmdline'] = ' '.join(proc.cmdline())
+                except psutil.AccessDenied:
+                    pass
+            if columns & {'read_rate', 'write_rate'}:
+                try:
+                    io = proc.io_counters()
+                except (psutil.AccessDenied, AttributeError, OSError):
+                    io = None
+                if io is not None:
+                    now = time.monotonic()
+                    last = self.counters.get(pid)
+                    self.counters[pid] = (now, io.read_bytes, io.write_bytes)
+                    if last is not None and now > last[0]:
+                        values['read_rate'] = max(io.read_bytes - last[1], 0) / (now - last[0])
+                        values['write_rate'] = max(io.write_bytes - last[2], 0) / (now - last[0])
+        return values
+
+    def fetch(self, pids, columns):
+        """Возвращает {pid: {столбец: значение}} для устаревших или ещё не прочитанных PID."""
+        now = time.monotonic()
+        columns = set(columns)
+        result = {}
+        for pid in pids:
+            entry = self.cache.get(pid)
+            if entry is not None and now - entry[0] < self.ttl and columns <= entry[2]:
+                continue
+            try:
+                values = self.read(pid, columns)
+            except (psutil.NoSuchProcess, psutil.AccessDenied):
+                self.cache.pop(pid, None)
+                self.counters.pop(pid, None)
+                continue
+            # Запоминается и набор запрошенных столбцов: недоступные значения не перечитываются до истечения ttl
+            self.cache[pid] = (now, values, columns)
+            result[pid] = values
+        self.evict(now)
+        return result
+
+    def evict(self, now):
+        """Удаляет записи, которые давно не запрашивались."""
+        expired = [pid for pid, entry in self.cache.items() if now - entry[0] > 10 * self.ttl]
+        for pid in expired:
+            del self.cache[pid]
+            self.counters.pop(pid, None)
@@ -0,0 +1,124 @@
+import operator
+import re
+
+from PySide6.QtCore import QSortFilterProxyModel, Qt
+
+
+FILTER_FIELDS = {'cpu': 2, 'mem': 3, 'memory': 3, 'pid': 1}  # Номера столбцов в строке модели
+FILTER_OPERATORS = {'>=': operator.ge, '<=': operator.le, '>': operator.gt, '<': operator.lt,
+                    '==': operator.eq, '=': operator.eq}
+THRESHOLD = re.compile(r'^(cpu|mem|memory|pid)(>=|<=|==|>|<|=)(\d+(?:\.\d*)?)$')
+
+
+class ProcessFilter:
+    """Разобранное выражение фильтра процессов.
+
+    Части выражения через пробел объединяются по И:
+      слово      -- подстрока в имени (без учёта регистра);
+      /regex/    -- регулярное выражение по имени;
+      user:имя   -- пользователь;
+      pid:1,2,3  -- PID из списка;
+      cpu>50, mem>=10, pid<1000 -- пороги по CPU (%), памяти (%) и PID.
+
+    Условия по имени, пользователю и PID не меняются между обходами:
+    accepts() запоминает их результат для каждого PID вместе с именем и
+    пользователем (переиспользованный PID или setuid не получат чужой
+    результат), и на тике строка проверяется лишь по порогам. Кэш живёт,
+    пока жив объект фильтра, то есть до смены текста фильтра.
+    """
+
+    MAX_CACHED = 200000
+
+    def __init__(self, text):
+        self.text = text
+        self.static_matches = {}  # pid -> (имя, пользователь, результат matches_static)
+        self.substrings = []
+        self.patterns = []
+        self.users = set()
+        self.pids = set()
+        self.thresholds = []  # (столбец, оператор, значение)
+        for term in text.split():
+            self.parse_term(term)
+
+    def parse_term(self, term):
+        lowered = term.lower()
+        if len(term) > 1 and term.startswith('/') and term.endswith('/'):
+            try:
+                self.patterns.append(re.compile(term[1:-1], re.IGNORECASE))
+            except re.error as e:
+                raise ValueError(f"Неверное регулярное выражение {term}: {e}")
+        elif lowered.startswith('user:'):
+            if not term[5:]:
+                raise ValueError("После user: нужно имя пользователя")
+            self.users.add(term[5:])
+        elif lowered.startswith('pid:'):
+            try:
+                self.pids.update(int(pid) for pid in term[4:].split(',') if pid)
+            except ValueError:
+                raise ValueError(f"Неверный список PID: {term}")
+        elif THRESHOLD.match(lowered):
+            field, op, value = THRESHOLD.match(lowered).groups()
+            self.thresholds.append((FILTER_FIELDS[field], FILTER_OPERATORS[op], float(value)))
+        elif any(op in term for op in FILTER_OPERATORS):
+            raise ValueError(f"Неверное условие {term}: ожидается cpu, mem или pid, оператор и число")
+        else:
+            self.substrings.append(lowered)
+
+    def __bool__(self):
+        return bool(self.substrings or self.patterns or self.users or self.pids or self.thresholds)
+
+    def matches_static(self, values):
+        """Условия по имени, пользователю и PID; values -- строка модели."""
+        name = values[0].lower()
+        if self.pids and values[1] not in self.pids:
+            return False
+        if self.users and values[4] not in self.users:
+            return False
+        return (all(substring in name for substring in self.substrings)
+                and all(pattern.search(values[0]) for pattern in self.patterns))
+
+    def matches_thresholds(self, values):
+        return all(op(values[column], value) for column, op, value in self.thresholds)
+
+    def accepts(self, values):
+        """Проверяет строку модели целиком, используя кэш условий по PID."""
+        cached = self.static_matches.get(values[1])
+        if cached is not None and cached[0] == values[0] and cached[1] == values[4]:
+            static = cached[2]
+        else:
+            if len(self.static_matches) > self.MAX_CACHED:
+                # Завершившиеся процессы не копятся в кэше бесконечно
+                self.static_matches = {}
+            static = self.matches_static(values)
+            self.static_matches[values[1]] = (values[0], values[4], static)
+        return static and self.matches_thresholds(values)
+
+
+class ProcessFilterProxyModel(QSortFilterProxyModel):
+    """Прокси фильтрации по ProcessFilter.
+
+    С dynamicSortFilter прокси сам перепроверяет только вставленные
+    строки и строки из dataChanged. Исходная модель должна уметь
+    row_values(row, parent). При sort_in_source сортировка передаётся
+    исходной модели, а прокси сохраняет её порядок строк.
+    """
+
+    def __init__(self, parent=None, sort_in_source=False):
+        super().__init__(parent)
+        self.process_filter = None
+        self.sort_in_source = sort_in_source
+
+    def set_filter(self, process_filter):
+        self.process_filter = process_filter if process_filter else None
+        self.invalidateFilter()
+
+    def sort(self, column, order=Qt.AscendingOrder):
+        if self.sort_in_source:
+            self.sourceModel().sort(column, order)
+        else:
+            super().sort(column, order)
+
+    def filterAcceptsRow(self, source_row, source_parent):
+        if self.process_filter is None:
+            return True
+        return self.process_filter.accepts(self.sourceModel().row_values(source_row, source_parent))
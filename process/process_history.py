@@ -0,0 +1,169 @@
+import threading
+import time
+from collections import OrderedDict
+
+import numpy as np
+
+
+PROCESS_SERIES = ('cpu_percent', 'rss', 'read_rate', 'write_rate')
+
+
+class ProcessHistory:
+    """История CPU, RSS и ввода-вывода по процессам с ограничением памяти.
+
+    Все кольца лежат в одном массиве float32 формы (слоты, серии, отсчёты)
+    с общей позицией записи и общим кольцом времени, так что тик
+    записывается одной векторной операцией. Слоты процессов хранятся в
+    OrderedDict в порядке последней активности: процесс переносится в
+    конец, когда получал CPU или выполнял ввод-вывод. Когда слоты
+    кончаются, новому активному процессу отдаётся слот того, кто дольше
+    всех был неактивен (в том числе завершившегося), но не того, кто был
+    активен на прошлом тике: иначе при нехватке слотов активные процессы
+    вытесняли бы друг друга каждый тик. Закреплённый PID (выбранный в
+    таблице) не вытесняется.
+    """
+
+    GROW_SLOTS = 256
+
+    def __init__(self, window=600, interval=1.0, max_bytes=32 * 1024 * 1024):
+        self.interval = interval
+        self.capacity = max(int(window / interval), 2)
+        self.slot_bytes = len(PROCESS_SERIES) * self.capacity * np.dtype(np.float32).itemsize
+        self.max_slots = max(max_bytes // self.slot_bytes, 1)
+        self.times = np.full(self.capacity, np.nan)
+        self.head = 0
+        self.ticks = 0
+
+        self.data = np.empty((0, len(PROCESS_SERIES), self.capacity), dtype=np.float32)
+        self.last_read = np.empty(0)
+        self.last_write = np.empty(0)
+        self.last_time = np.empty(0)
+        self.created = np.empty(0, dtype=np.int64)  # Номер тика, с которого слот занят процессом
+        self.active = np.empty(0, dtype=np.int64)  # Номер тика последней активности
+        self.owner = []  # PID в слоте
+        self.started = []  # Время запуска процесса в слоте: отличает переиспользованный PID
+        self.free = []
+
+        self.slots = OrderedDict()  # pid -> номер слота
+        self.pinned = None
+        # Запись идёт в потоке обхода процессов, чтение -- в GUI-потоке
+        self.lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.slots)
+
+    def memory_usage(self):
+        return self.data.nbytes
+
+    def grow(self):
+        """Добавляет блок из GROW_SLOTS слотов (но не больше max_slots)."""
+        old = len(self.data)
+        size = min(old + self.GROW_SLOTS, self.max_slots)
+        data = np.full((size, len(PROCESS_SERIES), self.capacity), np.nan, dtype=np.float32)
+        data[:old] = self.data
+        self.data = data
+        for name in ('last_read', 'last_write', 'last_time'):
+            setattr(self, name, np.concatenate([getattr(self, name), np.full(size - old, np.nan)]))
+        self.created = np.concatenate([self.created, np.zeros(size - old, dtype=np.int64)])
+        self.active = np.concatenate([self.active, np.zeros(size - old, dtype=np.int64)])
+        self.owner.extend([None] * (size - old))
+        self.started.extend([None] * (size - old))
+        self.free.extend(range(size - 1, old - 1, -1))
+
+    def take_slot(self):
+        """Свободный слот; при нехватке -- слот самого давно неактивного процесса."""
+        if not self.free and len(self.data) < self.max_slots:
+            self.grow()
+        if self.free:
+            return self.free.pop()
+        for pid, slot in self.slots.items():
+            if pid == self.pinned:
+                continue
+            if self.active[slot] >= self.ticks - 1:
+                # Дальше по порядку только ещё более свежие процессы
+                return None
+            return self.slots.pop(pid)
+        return None
+
+    def reset_slot(self, slot, pid, started):
+        self.data[slot] = np.nan
+        self.last_read[slot] = self.last_write[slot] = self.last_time[slot] = np.nan
+        self.created[slot] = self.active[slot] = self.ticks
+        self.owner[slot] = pid
+        self.started[slot] = started
+
+    def append(self, timestamp, processes):
+        """Добавляет по отсчёту для каждого процесса из списка сборщика."""
+        with self.lock:
+            head = self.head
+            self.times[head] = timestamp
+            self.data[:, :, head] = np.nan
+            slots = self.slots
+
+            taken = []
+            values = []
+            for proc in processes:
+                pid = proc['pid']
+                cpu = proc['cpu_percent']
+                slot = slots.get(pid)
+                if slot is None:
+                    # Когда слоты кончились, простаивающий процесс не вытесняет других
+                    if not (self.free or len(self.data) < self.max_slots or cpu or pid == self.pinned):
+                        continue
+                    slot = self.take_slot()
+                    if slot is None:
+                        continue
+                    slots[pid] = slot
+                    self.reset_slot(slot, pid, proc['started'])
+                elif self.started[slot] != proc['started']:
+                    self.reset_slot(slot, pid, proc['started'])
+                if cpu:
+                    slots.move_to_end(pid)
+                    self.active[slot] = self.ticks
+                read, write = proc['read_bytes'], proc['write_bytes']
+                taken.append(slot)
+                values.append((cpu, proc['rss'], np.nan if read is None else read, np.nan if write is None else write))
+
+            if taken:
+                # Слот мог смениться владельцем посреди тика: остаётся последняя запись
+                taken, first = np.unique(np.array(taken)[::-1], return_index=True)
+                values = np.array(values, dtype=np.float64)[::-1][first]
+
+                elapsed = timestamp - self.last_time[taken]
+                read_rate = np.nan_to_num((values[:, 2] - self.last_read[taken]) / elapsed).clip(0)
+                write_rate = np.nan_to_num((values[:, 3] - self.last_write[taken]) / elapsed).clip(0)
+                self.last_read[taken] = values[:, 2]
+                self.last_write[taken] = values[:, 3]
+                self.last_time[taken] = timestamp
+                self.data[taken, 0, head] = values[:, 0]
+                self.data[taken, 1, head] = values[:, 1]
+                self.data[taken, 2, head] = read_rate
+                self.data[taken, 3, head] = write_rate
+
+                # Ввод-вывод тоже считается активностью
+                busy = taken[(read_rate > 0) | (write_rate > 0)]
+                self.active[busy] = self.ticks
+                for slot in busy.tolist():
+                    slots.move_to_end(self.owner[slot])
+
+            self.head = (head + 1) % self.capacity
+            self.ticks += 1
+
+    def pin(self, pid):
+        """Закрепляет PID, чтобы его история не вытеснялась (None -- снять)."""
+        self.pinned = pid
+
+    def series(self, pid, now=None):
+        """История процесса: x (секунды назад, <= 0) и словарь серий; None, если её нет."""
+        with self.lock:
+            slot = self.slots.get(pid)
+            if slot is None:
+                return None
+            count = min(self.ticks - int(self.created[slot]), self.capacity)
+            if count <= 0:
+                return None
+            order = (self.head - count + np.arange(count)) % self.capacity
+            times = self.times[order]
+            data = self.data[slot][:, order].astype(np.float64)
+        now = time.time() if now is None else now
+        return times - now, dict(zip(PROCESS_SERIES, data))
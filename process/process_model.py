@@ -0,0 +1,270 @@
+import numpy as np
+
+from PySide6.QtCore import QAbstractTableModel, QModelIndex, Qt
+from process.process_details import BYTE_DETAILS, DETAIL_COLUMNS, DETAIL_KEYS, format_bytes
+
+
+COLUMNS = ["Процесс", "PID", "Использование CPU (%)", "Использование памяти (%)", "Пользователь"]
+COLUMN_KEYS = ['name', 'pid', 'cpu_percent', 'memory_percent', 'username']
+PID_COLUMN = 1
+CPU_COLUMN = 2
+TEXT_COLUMNS = {0, 4}  # Имя и пользователь сортируются как строки
+
+SORT_ROLE = Qt.UserRole  # Необработанное значение ячейки для сортировки
+PID_ROLE = Qt.UserRole + 1
+
+
+def contiguous_runs(rows):
+    """Разбивает отсортированный список номеров строк на непрерывные отрезки (first, last)."""
+    runs = []
+    for row in rows:
+        if runs and row == runs[-1][1] + 1:
+            runs[-1][1] = row
+        else:
+            runs.append([row, row])
+    return runs
+
+
+def sort_keys(rows, column, details):
+    """Ключи сортировки строк по столбцу одним массивом NumPy."""
+    if column < len(COLUMNS):
+        if column in TEXT_COLUMNS:
+            return np.array([row[column] for row in rows], dtype=str)
+        return np.fromiter((row[column] for row in rows), dtype=np.float64, count=len(rows))
+    key = DETAIL_KEYS[column - len(COLUMNS)]
+    # Непрочитанные значения при сортировке оказываются внизу
+    values = [details.get(row[PID_COLUMN], {}).get(key) for row in rows]
+    if key == 'cmdline':
+        return np.array([value or "" for value in values], dtype=str)
+    return np.array([-1 if value is None else value for value in values], dtype=np.float64)
+
+
+def sort_order(rows, column, order, details):
+    """Перестановка строк для сортировки; при равных ключах строки идут по PID."""
+    keys = sort_keys(rows, column, details)
+    pids = np.fromiter((row[PID_COLUMN] for row in rows), dtype=np.int64, count=len(rows))
+    if keys.dtype.kind == 'U':
+        permutation = np.lexsort((pids, keys))
+        return permutation[::-1] if order == Qt.DescendingOrder else permutation
+    return np.lexsort((pids, -keys if order == Qt.DescendingOrder else keys))
+
+
+def top_rows(rows, count, column, order, details):
+    """Номера count первых строк в порядке сортировки, без полной сортировки.
+
+    Числовые столбцы разбиваются argpartition за линейное время. Строки с
+    ключом, равным граничному, добираются по возрастанию PID: так при
+    множестве одинаковых значений (простаивающие процессы с нулевым CPU)
+    состав таблицы не меняется от тика к тику.
+    """
+    if count >= len(rows):
+        return np.arange(len(rows))
+    keys = sort_keys(rows, column, details)
+    if keys.dtype.kind == 'U':
+        return sort_order(rows, column, order, details)[:count]
+    if order == Qt.DescendingOrder:
+        keys = -keys
+    boundary = keys[np.argpartition(keys, count - 1)[count - 1]]
+    above = np.flatnonzero(keys < boundary)
+    ties = np.flatnonzero(keys == boundary)
+    if len(ties) > count - len(above):
+        pids = np.fromiter((rows[i][PID_COLUMN] for i in ties.tolist()), dtype=np.int64, count=len(ties))
+        ties = ties[np.argsort(pids, kind='stable')[:count - len(above)]]
+    return np.concatenate([above, ties])
+
+
+class ProcessTableModel(QAbstractTableModel):
+    """Модель таблицы процессов с ключом по PID.
+
+    update() сравнивает новый список процессов с текущим и сообщает
+    представлению только о реальных изменениях: удалённые строки,
+    добавленные строки и dataChanged для изменившихся значений. Модель
+    не сбрасывается, поэтому выделение и прокрутка сохраняются.
+
+    За основными столбцами идут DETAIL_COLUMNS: их значения приходят
+    отдельно через set_details() и только для части процессов.
+
+    Модель сортирует себя сама (sort()): после применения разницы порядок
+    строк пересчитывается по столбцу ключей NumPy и объявляется через
+    layoutChanged, а постоянные индексы (выделение, текущая строка)
+    переносятся вслед за своими PID. При top_n в таблицу попадают
+    только top_n первых по текущей сортировке процессов из прошедших
+    фильтр; процесс keep_pid (выбранный) остаётся в ней всегда.
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.rows = []  # Строки в порядке COLUMN_KEYS
+        self.row_of = {}  # pid -> номер строки
+        self.details = {}  # pid -> {ключ DETAIL_KEYS: значение}
+        self.sort_column = CPU_COLUMN
+        self.sort_order = Qt.DescendingOrder
+        self.top_n = 0  # 0 -- все процессы
+        self.process_filter = None
+        self.keep_pid = None
+        self.processes = []  # Последний список сборщика: нужен для пересчёта топа
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.rows)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(COLUMNS) + len(DETAIL_COLUMNS)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            if section >= len(COLUMNS):
+                return DETAIL_COLUMNS[section - len(COLUMNS)][1]
+            return COLUMNS[section]
+        return None
+
+    def detail(self, row, key):
+        return self.details.get(row[PID_COLUMN], {}).get(key)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        row = self.rows[index.row()]
+        column = index.column()
+        if column >= len(COLUMNS):
+            key = DETAIL_KEYS[column - len(COLUMNS)]
+            value = self.detail(row, key)
+            if role == Qt.DisplayRole:
+                if value is None:
+                    return ""
+                return format_bytes(value) if key in BYTE_DETAILS else str(value)
+            if role == SORT_ROLE:
+                # Непрочитанные значения при сортировке оказываются внизу
+                return value if value is not None else ("" if key == 'cmdline' else -1)
+            if role == Qt.ToolTipRole and key == 'cmdline':
+                return value
+            if role == PID_ROLE:
+                return row[PID_COLUMN]
+            return None
+        if role == Qt.DisplayRole:
+            value = row[column]
+            if column in (2, 3):
+                return f"{value:.2f}%"
+            return str(value)
+        if role == SORT_ROLE:
+            return row[column]
+        if role == PID_ROLE:
+            return row[PID_COLUMN]
+        return None
+
+    def row_values(self, row, parent=QModelIndex()):
+        return self.rows[row]
+
+    def pid_at(self, row):
+        return self.rows[row][PID_COLUMN]
+
+    def name_of(self, pid):
+        """Имя процесса по PID или None, если его нет в таблице."""
+        row = self.row_of.get(pid)
+        return self.rows[row][0] if row is not None else None
+
+    def sort(self, column, order=Qt.AscendingOrder):
+        if column < 0:
+            return
+        self.sort_column = column
+        self.sort_order = order
+        if self.top_n:
+            # Топ по другому столбцу -- другой набор процессов
+            self.update(self.processes)
+        else:
+            self.reorder()
+
+    def set_top_n(self, count):
+        self.top_n = count
+        self.update(self.processes)
+
+    def set_filter(self, process_filter):
+        """Фильтр нужен модели только для отбора топа."""
+        self.process_filter = process_filter if process_filter else None
+        if self.top_n:
+            self.update(self.processes)
+
+    def reorder(self):
+        """Переставляет строки в порядке текущей сортировки."""
+        if len(self.rows) < 2:
+            return
+        permutation = sort_order(self.rows, self.sort_column, self.sort_order, self.details)
+        if (permutation == np.arange(len(permutation))).all():
+            return
+        self.layoutAboutToBeChanged.emit()
+        old_indexes = self.persistentIndexList()
+        old_pids = [self.rows[index.row()][PID_COLUMN] for index in old_indexes]
+        self.rows = [self.rows[i] for i in permutation.tolist()]
+        self.row_of = {row[PID_COLUMN]: i for i, row in enumerate(self.rows)}
+        new_indexes = [self.index(self.row_of[pid], index.column()) for pid, index in zip(old_pids, old_indexes)]
+        self.changePersistentIndexList(old_indexes, new_indexes)
+        self.layoutChanged.emit()
+
+    def select_top(self, fresh):
+        """Оставляет в fresh только top_n процессов (и keep_pid) из прошедших фильтр."""
+        candidates = list(fresh.values())
+        if self.process_filter is not None:
+            candidates = [values for values in candidates if self.process_filter.accepts(values)]
+        top = [candidates[i] for i in top_rows(candidates, self.top_n, self.sort_column,
+                                                self.sort_order, self.details).tolist()]
+        selected = {values[PID_COLUMN]: values for values in top}
+        if self.keep_pid in fresh:
+            selected[self.keep_pid] = fresh[self.keep_pid]
+        return selected
+
+    def set_details(self, details):
+        """Принимает {pid: {ключ: значение}} и обновляет дополнительные столбцы этих строк."""
+        rows = []
+        for pid, values in details.items():
+            row = self.row_of.get(pid)
+            if row is not None and self.details.get(pid) != values:
+                self.details[pid] = values
+                rows.append(row)
+        first_column = len(COLUMNS)
+        last_column = first_column + len(DETAIL_COLUMNS) - 1
+        for first, last in contiguous_runs(sorted(rows)):
+            self.dataChanged.emit(self.index(first, first_column), self.index(last, last_column),
+                                  [Qt.DisplayRole, SORT_ROLE])
+        if rows and self.sort_column >= len(COLUMNS):
+            self.reorder()
+
+    def update(self, processes):
+        """Применяет новый список процессов (словари с ключами COLUMN_KEYS)."""
+        self.processes = processes
+        fresh = {}
+        for proc in processes:
+            fresh[proc['pid']] = tuple(proc[key] for key in COLUMN_KEYS)
+        if self.top_n:
+            fresh = self.select_top(fresh)
+
+        # Удаление завершившихся процессов отрезками с конца, чтобы номера не сдвигались
+        gone = sorted(row for pid, row in self.row_of.items() if pid not in fresh)
+        for first, last in reversed(contiguous_runs(gone)):
+            self.beginRemoveRows(QModelIndex(), first, last)
+            del self.rows[first:last + 1]
+            self.endRemoveRows()
+        if gone:
+            self.row_of = {row[PID_COLUMN]: i for i, row in enumerate(self.rows)}
+            self.details = {pid: values for pid, values in self.details.items() if pid in self.row_of}
+
+        # Изменившиеся значения объявляются одним диапазоном: прокси таблицы
+        # не сортирует, а лишь перепроверяет фильтр, и одно dataChanged
+        # дешевле тысяч разрозненных после пересортировки строк.
+        changed = []
+        for i, row in enumerate(self.rows):
+            values = fresh.pop(row[PID_COLUMN])
+            if values != row:
+                self.rows[i] = values
+                changed.append(i)
+        if changed:
+            self.dataChanged.emit(self.index(changed[0], 0), self.index(changed[-1], len(COLUMNS) - 1),
+                                  [Qt.DisplayRole, SORT_ROLE])
+
+        # Новые процессы добавляются в конец одним блоком
+        if fresh:
+            first = len(self.rows)
+            self.beginInsertRows(QModelIndex(), first, first + len(fresh) - 1)
+            for i, (pid, values) in enumerate(fresh.items(), first):
+                self.rows.append(values)
+                self.row_of[pid] = i
+            self.endInsertRows()
+        self.reorder()
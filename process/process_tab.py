@@ -1,72 +1,238 @@
-from PySide6 import QtCore, QtWidgets
-from PySide6.QtCore import QTimer, Qt
-from PySide6.QtWidgets import (
-    QLabel, QVBoxLayout, QTableWidget, QTableWidgetItem, QMenu, QWidget, QDialog, QTabWidget
-)
+from PySide6 import QtWidgets
+from PySide6.QtCore import Qt, QTimer
+from PySide6.QtWidgets import QVBoxLayout, QHBoxLayout, QTableView, QTreeView, QMenu, QWidget, QLabel, QCheckBox, QLineEdit, QComboBox
 from PySide6.QtGui import QAction
+from core.provider import ReplayProvider
+from process.process_details import DETAIL_COLUMNS
+from process.process_filter import ProcessFilter, ProcessFilterProxyModel
+from process.process_model import COLUMNS, CPU_COLUMN, PID_ROLE, SORT_ROLE, ProcessTableModel
+from process.process_tree_model import ProcessTreeModel
+from process.history_panel import ProcessHistoryPanel
 import psutil
+import time
 
 class ProcessTab(QWidget):
-    def __init__(self):
+    def __init__(self, sampler):
         super().__init__()
         self.layout = QVBoxLayout(self)
-        self.table = QTableWidget()
-        self.layout.addWidget(self.table)
+        toolbar = QHBoxLayout()
+        self.filter_edit = QLineEdit()
+        self.filter_edit.setPlaceholderText("Фильтр: имя, /regex/, user:root, pid:1,2, cpu>50, mem>=5")
+        self.filter_edit.setClearButtonEnabled(True)
+        toolbar.addWidget(self.filter_edit, 1)
+        # В режиме топа в таблицу попадают только первые N строк по текущей сортировке
+        self.top_n = QComboBox()
+        for title, count in (("Все процессы", 0), ("Топ 50", 50), ("Топ 100", 100), ("Топ 500", 500)):
+            self.top_n.addItem(title, count)
+        toolbar.addWidget(self.top_n)
+        self.tree_mode = QCheckBox("Дерево процессов (CPU и память с учётом дочерних)")
+        self.tree_mode.toggled.connect(self.set_tree_mode)
+        toolbar.addWidget(self.tree_mode)
+        self.layout.addLayout(toolbar)
+
+        self.model = ProcessTableModel(self)
+        # Таблицу сортирует сама модель, прокси только фильтрует
+        self.proxy = self.create_proxy(self.model, sort_in_source=True)
+        self.table = QTableView()
+        self.table.setModel(self.proxy)
+        self.layout.addWidget(self.table, 1)
+
+        # Дерево обновляется только пока включено, но не сбрасывается при выключении.
+        # Детей каждого узла тоже сортирует модель
+        self.tree_model = ProcessTreeModel(self)
+        self.tree_proxy = self.create_proxy(self.tree_model, sort_in_source=True)
+        # В дереве остаются и предки подходящих процессов
+        self.tree_proxy.setRecursiveFilteringEnabled(True)
+        self.tree = QTreeView()
+        self.tree.setModel(self.tree_proxy)
+        self.tree.hide()
+        self.layout.addWidget(self.tree, 1)
+        self.history_panel = ProcessHistoryPanel(sampler.process_worker.history)
+        self.history_panel.hide()
+        self.layout.addWidget(self.history_panel)
+        self.status_label = QLabel()
+        self.layout.addWidget(self.status_label)
         self.setLayout(self.layout)
 
         self.selected_pid = None 
+        self.active = False
+        self.sampler = sampler
+        # PID из записи не относятся к процессам этой машины
+        self.replaying = isinstance(sampler.provider, ReplayProvider)
+        # Запись, сделанная с --headless, не содержит процессов: обходить нечего
+        self.scan_available = not (self.replaying and not sampler.provider.recorded('processes'))
+        if not self.scan_available:
+            self.status_label.setText("В записи нет списка процессов (она сделана с --headless): обход отключён")
+
+        # Фильтр применяется после паузы в наборе текста
+        self.filter_timer = QTimer(self)
+        self.filter_timer.setSingleShot(True)
+        self.filter_timer.setInterval(200)
+        self.filter_timer.timeout.connect(self.apply_filter)
+        self.filter_edit.textChanged.connect(self.filter_timer.start)
+        self.top_n.currentIndexChanged.connect(self.apply_top_n)
+
+        self.setup_view(self.table)
+        self.table.verticalHeader().hide()
+        self.setup_detail_columns()
+        self.setup_view(self.tree)
+        self.tree.setColumnWidth(0, 260)
+
+        # Список процессов собирается в фоне общим сборщиком метрик
+        sampler.processes_sampled.connect(self.update_processes)
+
+    def set_active(self, active):
+        """Пока вкладка скрыта, обход процессов не выполняется вовсе."""
+        self.active = active
+        self.sampler.set_process_scan_enabled(active and self.scan_available)
+
+    def setup_detail_columns(self):
+        """Дополнительные столбцы скрыты; включаются из контекстного меню заголовка.
+
+        Их значения запрашиваются только для строк, видимых в таблице, и
+        только после того, как прокрутка успокоилась. При воспроизведении
+        записи столбцы недоступны: их читают у процессов этой машины.
+        """
+        for i in range(len(DETAIL_COLUMNS)):
+            self.table.setColumnHidden(len(COLUMNS) + i, True)
+        header = self.table.horizontalHeader()
+        header.setContextMenuPolicy(Qt.CustomContextMenu)
+        header.customContextMenuRequested.connect(self.show_header_menu)
+
+        self.details_timer = QTimer(self)
+        self.details_timer.setSingleShot(True)
+        self.details_timer.setInterval(150)
+        self.details_timer.timeout.connect(self.request_visible_details)
+        self.table.verticalScrollBar().valueChanged.connect(self.details_timer.start)
+        self.proxy.layoutChanged.connect(self.details_timer.start)
+        self.sampler.process_worker.details_ready.connect(self.model.set_details)
+
+    def show_header_menu(self, pos):
+        menu = QMenu(self)
+        if self.replaying:
+            menu.addAction("Недоступно при воспроизведении записи").setEnabled(False)
+        for i, (key, title) in enumerate(DETAIL_COLUMNS):
+            column = len(COLUMNS) + i
+            action = menu.addAction(title)
+            action.setEnabled(not self.replaying)
+            action.setCheckable(True)
+            action.setChecked(not self.table.isColumnHidden(column))
+            action.toggled.connect(lambda checked, column=column: self.set_detail_column(column, checked))
+        menu.exec_(self.table.horizontalHeader().mapToGlobal(pos))
 
-        self.setup_table()
-        self.update_processes()
+    def set_detail_column(self, column, visible):
+        self.table.setColumnHidden(column, not visible)
+        self.details_timer.start()
 
-        self.timer = QTimer()
-        self.timer.timeout.connect(self.update_processes)
-        self.timer.start(1500)
+    def detail_columns(self):
+        return [key for i, (key, _) in enumerate(DETAIL_COLUMNS)
+                if not self.table.isColumnHidden(len(COLUMNS) + i)]
 
-        self.selected_pid = None  # Запоминаем PID выделенного процесса
+    def request_visible_details(self):
+        """Запрашивает дополнительные столбцы для строк, видимых в таблице."""
+        columns = self.detail_columns()
+        if not columns or self.replaying or not self.active or self.tree_mode.isChecked() or self.proxy.rowCount() == 0:
+            return
+        first = max(self.table.rowAt(0), 0)
+        last = self.table.rowAt(self.table.viewport().height() - 1)
+        if last < 0:
+            last = self.proxy.rowCount() - 1
+        pids = [self.proxy.index(row, 0).data(PID_ROLE) for row in range(first, last + 1)]
+        self.sampler.process_worker.request_details(pids, columns)
 
-    def setup_table(self):
-        self.table.setColumnCount(5)
-        self.table.setHorizontalHeaderLabels(["Процесс", "PID", "Использование CPU (%)", "Использование памяти (%)", "Пользователь"])
-        self.table.setContextMenuPolicy(Qt.CustomContextMenu)
-        self.table.customContextMenuRequested.connect(self.show_context_menu)
-        self.table.setColumnWidth(0, 180)
-        self.table.setColumnWidth(1, 80)
-        self.table.setColumnWidth(2, 150)
-        self.table.setColumnWidth(3, 150)
-        self.table.setColumnWidth(4, 150)
+    def apply_filter(self):
+        """Разбирает строку фильтра; ошибка подсвечивается, прежний фильтр остаётся."""
+        try:
+            process_filter = ProcessFilter(self.filter_edit.text())
+        except ValueError as e:
+            self.filter_edit.setStyleSheet("QLineEdit { background: #ffd6d6; }")
+            self.filter_edit.setToolTip(str(e))
+            return
+        self.filter_edit.setStyleSheet("")
+        self.filter_edit.setToolTip("")
+        self.model.set_filter(process_filter)
+        self.proxy.set_filter(process_filter)
+        self.tree_proxy.set_filter(process_filter)
+        self.details_timer.start()
 
-        self.table.setSelectionBehavior(QtWidgets.QAbstractItemView.SelectRows)
-        self.table.itemSelectionChanged.connect(self.handle_selection_change)  # Событие выбора строки
+    def apply_top_n(self):
+        self.model.set_top_n(self.top_n.currentData())
+        self.details_timer.start()
+
+    def create_proxy(self, model, sort_in_source=False):
+        proxy = ProcessFilterProxyModel(self, sort_in_source)
+        proxy.setSourceModel(model)
+        proxy.setSortRole(SORT_ROLE)
+        proxy.setDynamicSortFilter(True)
+        return proxy
+
+    def setup_view(self, view):
+        view.setContextMenuPolicy(Qt.CustomContextMenu)
+        view.customContextMenuRequested.connect(self.show_context_menu)
+        view.setColumnWidth(0, 180)
+        view.setColumnWidth(1, 80)
+        view.setColumnWidth(2, 150)
+        view.setColumnWidth(3, 150)
+        view.setColumnWidth(4, 150)
+
+        view.setSortingEnabled(True)
+        view.sortByColumn(CPU_COLUMN, Qt.DescendingOrder)
+
+        view.setSelectionBehavior(QtWidgets.QAbstractItemView.SelectRows)
+        view.setSelectionMode(QtWidgets.QAbstractItemView.SingleSelection)
+        view.selectionModel().selectionChanged.connect(self.handle_selection_change)  # Событие выбора строки
+
+    def current_view(self):
+        return self.tree if self.tree_mode.isChecked() else self.table
+
+    def current_model(self):
+        return self.tree_model if self.tree_mode.isChecked() else self.model
+
+    def set_tree_mode(self, enabled):
+        """Переключает таблицу и дерево; новый вид сразу запрашивает свежий список."""
+        self.table.setVisible(not enabled)
+        self.tree.setVisible(enabled)
+        # Топ отбирается только в плоской таблице
+        self.top_n.setEnabled(not enabled)
+        self.handle_selection_change()
+        if self.active:
+            self.sampler.process_worker.request()
 
     def handle_selection_change(self):
         """Обрабатывает изменение выделения строки."""
-        current_row = self.table.currentRow()
-        if current_row != -1:  # Проверяем, что строка выделена
-            pid_item = self.table.item(current_row, 1)  # PID находится во втором столбце
-            if pid_item:
-                self.selected_pid = int(pid_item.text())  # Сохраняем PID выбранного процесса
+        rows = self.current_view().selectionModel().selectedRows()
+        if rows:  # Проверяем, что строка выделена
+            self.selected_pid = rows[0].data(PID_ROLE)  # Сохраняем PID выбранного процесса
         else:
             self.selected_pid = None  # Если ничего не выделено, сбрасываем PID
+        self.sampler.process_worker.history.pin(self.selected_pid)
+        # Выбранный процесс не выпадает из топа
+        self.model.keep_pid = self.selected_pid
+        self.update_history_panel()
+
+    def update_history_panel(self):
+        """Показывает историю выбранного процесса под таблицей."""
+        name = self.current_model().name_of(self.selected_pid) if self.selected_pid is not None else None
+        self.history_panel.show_process(self.selected_pid, name)
 
     def show_context_menu(self, pos):
         """Отображает контекстное меню."""
         if self.selected_pid is not None:  # Проверяем, что выбран процесс
             menu = QMenu(self)
-            kill_action = QAction("Завершить процесс", self)
-            kill_action.triggered.connect(self.kill_selected_process)
+            if self.replaying:
+                kill_action = QAction("Завершить процесс (недоступно при воспроизведении записи)", self)
+                kill_action.setEnabled(False)
+            else:
+                kill_action = QAction("Завершить процесс", self)
+                kill_action.triggered.connect(self.kill_selected_process)
             menu.addAction(kill_action)
-            menu.exec_(self.table.viewport().mapToGlobal(pos))
+            menu.exec_(self.current_view().viewport().mapToGlobal(pos))
 
     def kill_selected_process(self):
         """Завершает выбранный процесс с подтверждением."""
-        if self.selected_pid is not None:
-            # Получим имя процесса для показа в окне
-            process_name = None
-            try:
-                process_name = psutil.Process(self.selected_pid).name()
-            except (psutil.NoSuchProcess, psutil.AccessDenied):
-                process_name = "Неизвестный процесс"
+        if self.selected_pid is not None and not self.replaying:
+            # Имя берётся из модели: лишний системный вызов в GUI-потоке не нужен
+            process_name = self.current_model().name_of(self.selected_pid) or "Неизвестный процесс"
             
             # Окно подтверждения
             confirmation = QtWidgets.QMessageBox()
@@ -81,8 +247,7 @@ class ProcessTab(QWidget):
             if confirmation.exec() == QtWidgets.QMessageBox.Yes:
                 try:
                     p = psutil.Process(self.selected_pid)
-                    p.terminate()
-                    self.update_processes()  # Обновляем таблицу после завершения процесса
+                    p.terminate()  # Таблица обновится на следующем тике сборщика
                 except Exception as e:
                     error_message = QtWidgets.QMessageBox()
                     error_message.setIcon(QtWidgets.QMessageBox.Critical)
@@ -92,40 +257,23 @@ class ProcessTab(QWidget):
                     error_message.setStandardButtons(QtWidgets.QMessageBox.Ok)
                     error_message.exec()
 
-    def update_processes(self):
-        """Обновляет список процессов в таблице."""
-        # Сохраняем текущий выбранный PID (если есть)
-        previously_selected_pid = self.selected_pid
-
-        self.table.setRowCount(0)
-        processes = []
-
-        for proc in psutil.process_iter(['pid', 'name', 'username', 'memory_percent', 'cpu_percent']):
-            try:
-                processes.append(proc)
-            except (psutil.NoSuchProcess, psutil.AccessDenied):
-                continue
-
-        processes.sort(key=lambda p: p.cpu_percent(), reverse=True)
-
-        for proc in processes:
-            try:
-                row_position = self.table.rowCount()
-                self.table.insertRow(row_position)
-
-                # Заполняем строку
-                self.table.setItem(row_position, 0, QTableWidgetItem(proc.info['name']))
-                self.table.setItem(row_position, 1, QTableWidgetItem(str(proc.info['pid'])))
-                logical_cpus = psutil.cpu_count(logical=True)
-                normalized_cpu = proc.info['cpu_percent'] / logical_cpus
-                self.table.setItem(row_position, 2, QTableWidgetItem(f"{normalized_cpu:.2f}%"))
-                self.table.setItem(row_position, 3, QTableWidgetItem(f"{proc.info['memory_percent']:.2f}%"))
-                self.table.setItem(row_position, 4, QTableWidgetItem(proc.info['username']))
-
-                # Восстанавливаем выделение, если PID совпадает
-                if proc.info['pid'] == previously_selected_pid:
-                    self.table.selectRow(row_position)  # Выделяем строку
-                    self.selected_pid = previously_selected_pid  # Сохраняем PID
-
-            except (psutil.NoSuchProcess, psutil.AccessDenied):
-                continue
\ No newline at end of file
+    def update_processes(self, processes, scan_ms=0.0, skipped=0):
+        """Обновляет список процессов в таблице.
+
+        Модель применяет только разницу со старым списком, поэтому
+        выделение и прокрутка сохраняются без ручного восстановления.
+        """
+        if not self.scan_available:
+            return
+        started = time.perf_counter()
+        self.current_model().update(processes)
+        apply_ms = (time.perf_counter() - started) * 1000
+        self.update_history_panel()
+        self.request_visible_details()
+        shown = ""
+        if (self.proxy.process_filter is not None or self.model.top_n) and not self.tree_mode.isChecked():
+            shown = f" (показано {self.proxy.rowCount()})"
+        self.status_label.setText(
+            f"Процессов: {len(processes)}{shown}  |  обход: {scan_ms:.0f} мс  |  "
+            f"обновление таблицы: {apply_ms:.0f} мс  |  пропущено тиков: {skipped}"
+        )
@@ -0,0 +1,347 @@
+from PySide6.QtCore import QAbstractItemModel, QModelIndex, Qt
+from process.process_model import COLUMNS, COLUMN_KEYS, CPU_COLUMN, PID_ROLE, SORT_ROLE
+
+MEMORY_COLUMN = 3
+
+
+class ProcessNode:
+    """Узел дерева процессов.
+
+    values -- собственные значения процесса в порядке COLUMN_KEYS,
+    total_cpu и total_memory -- суммы по всему поддереву вместе с самим
+    процессом. row -- номер узла среди детей родителя.
+    """
+
+    __slots__ = ('pid', 'ppid', 'values', 'parent', 'children', 'row', 'total_cpu', 'total_memory')
+
+    def __init__(self, pid=None, ppid=None, values=None):
+        self.pid = pid
+        self.ppid = ppid
+        self.values = values
+        self.parent = None
+        self.children = []
+        self.row = 0
+        self.total_cpu = values[CPU_COLUMN] if values else 0.0
+        self.total_memory = values[MEMORY_COLUMN] if values else 0.0
+
+    def ancestors(self):
+        node = self.parent
+        while node is not None:
+            yield node
+            node = node.parent
+
+
+class ProcessTreeModel(QAbstractItemModel):
+    """Дерево процессов (родитель -> дети) с суммами CPU и памяти по поддеревьям.
+
+    Дерево не перестраивается на каждом тике: update() удаляет
+    завершившиеся процессы, переносит процессы со сменившимся родителем,
+    вставляет новые и обновляет значения. Суммы поддеревьев поправляются
+    на разность вдоль цепочки предков, а не пересчитываются целиком.
+
+    Детей каждого узла сортирует сама модель, как ProcessTableModel:
+    прокси с динамической сортировкой пересортировывал соседей на каждый
+    dataChanged, а их за тик -- по сигналу на каждого предка каждого
+    изменившегося процесса. Изменённые узлы копятся за всё обновление; в
+    конце переносы к новым родителям и пересортировка родителей изменённых
+    узлов идут одним layoutChanged, а на каждого родителя уходит один
+    dataChanged.
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.root = ProcessNode()
+        self.nodes = {}  # pid -> ProcessNode
+        self.dirty = set()  # Узлы с необъявленными изменениями
+        self.sort_column = CPU_COLUMN
+        self.sort_order = Qt.DescendingOrder
+
+    # --- Интерфейс QAbstractItemModel ---
+
+    def node_of(self, index):
+        return index.internalPointer() if index.isValid() else self.root
+
+    def index_of(self, node, column=0):
+        if node is self.root:
+            return QModelIndex()
+        return self.createIndex(node.row, column, node)
+
+    def index(self, row, column, parent=QModelIndex()):
+        node = self.node_of(parent)
+        if 0 <= row < len(node.children) and 0 <= column < len(COLUMNS):
+            return self.createIndex(row, column, node.children[row])
+        return QModelIndex()
+
+    def parent(self, index):
+        if not index.isValid():
+            return QModelIndex()
+        return self.index_of(index.internalPointer().parent)
+
+    def rowCount(self, parent=QModelIndex()):
+        if parent.column() > 0:
+            return 0
+        return len(self.node_of(parent).children)
+
+    def columnCount(self, parent=QModelIndex()):
+        return len(COLUMNS)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return COLUMNS[section]
+        return None
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        node = index.internalPointer()
+        column = index.column()
+        # В столбцах CPU и памяти показываются суммы по поддереву
+        if column == CPU_COLUMN:
+            value = max(node.total_cpu, 0.0)
+        elif column == MEMORY_COLUMN:
+            value = max(node.total_memory, 0.0)
+        else:
+            value = node.values[column]
+        if role == Qt.DisplayRole:
+            if column in (CPU_COLUMN, MEMORY_COLUMN):
+                return f"{value:.2f}%"
+            return str(value)
+        if role == SORT_ROLE:
+            return value
+        if role == PID_ROLE:
+            return node.pid
+        if role == Qt.ToolTipRole and column in (CPU_COLUMN, MEMORY_COLUMN) and node.children:
+            return f"Сам процесс: {node.values[column]:.2f}%, с дочерними: {value:.2f}%"
+        return None
+
+    def row_values(self, row, parent=QModelIndex()):
+        return self.node_of(parent).children[row].values
+
+    def name_of(self, pid):
+        node = self.nodes.get(pid)
+        return node.values[0] if node is not None else None
+
+    # --- Инкрементальное обновление ---
+
+    def clear(self):
+        self.beginResetModel()
+        self.root = ProcessNode()
+        self.nodes = {}
+        self.dirty = set()
+        self.endResetModel()
+
+    def changed(self, node):
+        self.dirty.add(node)
+
+    def sort_key(self, node):
+        if self.sort_column == CPU_COLUMN:
+            return node.total_cpu
+        if self.sort_column == MEMORY_COLUMN:
+            return node.total_memory
+        return node.values[self.sort_column]
+
+    def sorted_children(self, node):
+        """Дети узла в порядке сортировки; при равных ключах -- по PID."""
+        children = sorted(node.children, key=lambda child: child.pid)
+        # Сортировка устойчива и при reverse=True: равные остаются по возрастанию PID
+        children.sort(key=self.sort_key, reverse=self.sort_order == Qt.DescendingOrder)
+        return children
+
+    def sort(self, column, order=Qt.AscendingOrder):
+        if column < 0:
+            return
+        self.sort_column = column
+        self.sort_order = order
+        self.reorder([self.root] + [node for node in self.nodes.values() if node.children])
+
+    def order_changes(self, parents):
+        """[(родитель, дети в новом порядке)] для родителей, чей порядок нарушен."""
+        changes = []
+        for parent in parents:
+            children = self.sorted_children(parent)
+            if any(child is not old for child, old in zip(children, parent.children)):
+                changes.append((parent, children))
+        return changes
+
+    def reorder(self, parents, moving=()):
+        """Переносит узлы moving к их родителям и сортирует детей parents.
+
+        Всё делается одним изменением раскладки: beginMoveRows на каждый
+        перенос заставлял прокси перестраивать отображение строк целиком.
+        Возвращает узлы, которые перенести не удалось.
+        """
+        changes = [] if moving else self.order_changes(parents)
+        if not moving and not changes:
+            return []
+        self.layoutAboutToBeChanged.emit()
+        # Перенос внутрь собственного поддерева откладывается, пока не переедет тот, кто сейчас над ним
+        while moving:
+            deferred = [node for node in moving if not self.relocate(node, self.target_parent(node))]
+            if len(deferred) == len(moving):
+                break
+            moving = deferred
+        if not changes:
+            changes = self.order_changes(set(parents) | {node.parent for node in self.pending_changes()})
+        for parent, children in changes:
+            parent.children = children
+            self.renumber(parent)
+        self.update_persistent_indexes()
+        self.layoutChanged.emit()
+        return moving
+
+    def update_persistent_indexes(self):
+        """Постоянные индексы указывают на узлы: достаточно пересчитать номера строк."""
+        old_indexes = self.persistentIndexList()
+        new_indexes = [self.createIndex(index.internalPointer().row, index.column(), index.internalPointer())
+                       if index.isValid() else index for index in old_indexes]
+        self.changePersistentIndexList(old_indexes, new_indexes)
+
+    def pending_changes(self):
+        """Изменённые узлы, которые ещё в дереве (удалённые за обновление пропускаются)."""
+        return [node for node in self.dirty if self.nodes.get(node.pid) is node]
+
+    def emit_changes(self, moving=()):
+        """Переносит, пересортировывает и объявляет накопленные за обновление изменения."""
+        self.reorder({node.parent for node in self.pending_changes()}, moving)
+        dirty = self.pending_changes()
+        self.dirty = set()
+        rows = {}  # родитель -> [первая строка, последняя строка]
+        for node in dirty:
+            span = rows.get(node.parent)
+            if span is None:
+                rows[node.parent] = [node.row, node.row]
+            else:
+                span[0] = min(span[0], node.row)
+                span[1] = max(span[1], node.row)
+        last_column = len(COLUMNS) - 1
+        for parent, (first, last) in rows.items():
+            parent_index = self.index_of(parent)
+            self.dataChanged.emit(self.index(first, 0, parent_index), self.index(last, last_column, parent_index),
+                                  [Qt.DisplayRole, SORT_ROLE])
+
+    def add_to_totals(self, node, cpu, memory):
+        """Прибавляет разность к суммам узла и всех его предков."""
+        while node is not self.root:
+            node.total_cpu += cpu
+            node.total_memory += memory
+            self.changed(node)
+            node = node.parent
+
+    @staticmethod
+    def renumber(node, start=0):
+        for row in range(start, len(node.children)):
+            node.children[row].row = row
+
+    def target_parent(self, node):
+        """Узел, под которым должен находиться процесс, или корень, если родителя нет в дереве."""
+        parent = self.nodes.get(node.ppid)
+        if parent is None or parent is node:
+            return self.root
+        return parent
+
+    def relocate(self, node, new_parent):
+        """Переносит узел вместе с поддеревом под другого родителя.
+
+        Сигналов не посылает: вызывается только внутри изменения раскладки.
+        """
+        old_parent = node.parent
+        if old_parent is new_parent:
+            return True
+        # Нельзя перенести узел внутрь его собственного поддерева
+        if any(ancestor is node for ancestor in new_parent.ancestors()) or new_parent is node:
+            return False
+        self.add_to_totals(old_parent, -node.total_cpu, -node.total_memory)
+        del old_parent.children[node.row]
+        self.renumber(old_parent, node.row)
+        node.parent = new_parent
+        node.row = len(new_parent.children)
+        new_parent.children.append(node)
+        self.changed(node)
+        self.add_to_totals(new_parent, node.total_cpu, node.total_memory)
+        return True
+
+    def remove(self, node):
+        """Удаляет узел вместе с поддеревом (в нём остаются только завершившиеся процессы)."""
+        parent = node.parent
+        row = node.row
+        self.beginRemoveRows(self.index_of(parent), row, row)
+        del parent.children[row]
+        self.renumber(parent, row)
+        stack = [node]
+        while stack:
+            current = stack.pop()
+            del self.nodes[current.pid]
+            stack.extend(current.children)
+        self.endRemoveRows()
+        self.add_to_totals(parent, -node.total_cpu, -node.total_memory)
+
+    def insert(self, node, parent):
+        row = len(parent.children)
+        self.beginInsertRows(self.index_of(parent), row, row)
+        node.parent = parent
+        node.row = row
+        parent.children.append(node)
+        self.nodes[node.pid] = node
+        self.endInsertRows()
+        self.changed(node)
+        self.add_to_totals(parent, node.total_cpu, node.total_memory)
+
+    def update(self, processes):
+        """Применяет новый список процессов (словари с ключами COLUMN_KEYS и 'ppid')."""
+        fresh = {}
+        for proc in processes:
+            fresh[proc['pid']] = (proc['ppid'], tuple(proc[key] for key in COLUMN_KEYS))
+
+        # 1. Живые дети завершившихся процессов уходят к своему новому родителю
+        gone = {pid for pid in self.nodes if pid not in fresh}
+        orphans = [child for pid in gone for child in self.nodes[pid].children if child.pid not in gone]
+        if orphans:
+            self.layoutAboutToBeChanged.emit()
+            for child in orphans:
+                child.ppid = fresh[child.pid][0]
+                parent = self.target_parent(child)
+                self.relocate(child, self.root if parent.pid in gone else parent)
+            self.update_persistent_indexes()
+            self.layoutChanged.emit()
+        # 2. Завершившиеся процессы удаляются поддеревьями, начиная с верхних
+        for pid in gone:
+            node = self.nodes.get(pid)
+            if node is not None and (node.parent is self.root or node.parent.pid not in gone):
+                self.remove(node)
+
+        # 3. Новые процессы вставляются после своих родителей
+        pending = [pid for pid in fresh if pid not in self.nodes]
+        while pending:
+            deferred = []
+            for pid in pending:
+                ppid, values = fresh[pid]
+                if ppid in fresh and ppid not in self.nodes and ppid != pid:
+                    deferred.append(pid)
+                    continue
+                node = ProcessNode(pid, ppid, values)
+                self.insert(node, self.target_parent(node))
+            if len(deferred) == len(pending):
+                # Цикл в ppid (гонка при чтении /proc): остаток идёт в корень
+                for pid in deferred:
+                    ppid, values = fresh[pid]
+                    self.insert(ProcessNode(pid, None, values), self.root)
+                break
+            pending = deferred
+
+        # 4. Новые значения; суммы предков поправляются на разность
+        moving = []
+        for pid, (ppid, values) in fresh.items():
+            node = self.nodes[pid]
+            node.ppid = ppid
+            if node.parent is not self.target_parent(node):
+                moving.append(node)
+            if node.values != values:
+                cpu = values[CPU_COLUMN] - node.values[CPU_COLUMN]
+                memory = values[MEMORY_COLUMN] - node.values[MEMORY_COLUMN]
+                node.values = values
+                if cpu or memory:
+                    self.add_to_totals(node, cpu, memory)
+                else:
+                    self.changed(node)
+        # 5. Смена родителя и пересортировка -- одним изменением раскладки
+        self.emit_changes(moving)
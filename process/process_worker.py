@@ -0,0 +1,84 @@
+import threading
+import time
+
+from PySide6.QtCore import QObject, QThread, Signal, Slot
+from core.provider import ReplayProvider
+from process.process_details import ProcessDetails
+from process.process_history import ProcessHistory
+
+
+class ProcessWorker(QObject):
+    """Обход процессов в собственном потоке.
+
+    request() можно вызывать из любого потока. Если предыдущий обход ещё
+    идёт, запрос не ставится в очередь, а пропускается: так тики не
+    копятся, когда обход дольше интервала. Число пропущенных тиков и
+    длительность обхода отправляются вместе со списком процессов.
+    Список процессов даёт провайдер. Каждый обход также пишется в
+    историю процессов history. Дорогие атрибуты видимых строк читаются
+    здесь же по request_details() -- у процессов этой машины, поэтому
+    при воспроизведении записи они не читаются.
+    """
+
+    processes_sampled = Signal(object, float, int)  # процессы, мс обхода, пропущено тиков
+    scan_requested = Signal()
+    details_requested = Signal(object, object)  # PID, столбцы
+    details_ready = Signal(object)  # {pid: {столбец: значение}}
+
+    def __init__(self, provider, interval=1.0):
+        super().__init__()
+        self.provider = provider
+        self.history = ProcessHistory(interval=interval)
+        self.details = ProcessDetails()
+        self.details_available = not isinstance(provider, ReplayProvider)
+        self.lock = threading.Lock()
+        self.busy = False
+        self.skipped = 0
+
+        self.thread = QThread()
+        self.thread.setObjectName("ProcessWorkerThread")
+        self.moveToThread(self.thread)
+        self.scan_requested.connect(self.scan)
+        self.details_requested.connect(self.fetch_details)
+
+    def start(self):
+        self.thread.start()
+
+    def stop(self):
+        self.thread.quit()
+        self.thread.wait()
+
+    def request(self):
+        """Запрашивает обход; возвращает False, если предыдущий ещё не закончен."""
+        with self.lock:
+            if self.busy:
+                self.skipped += 1
+                return False
+            self.busy = True
+        self.scan_requested.emit()
+        return True
+
+    @Slot()
+    def scan(self):
+        started = time.perf_counter()
+        try:
+            processes = self.provider.processes()
+            self.history.append(time.time(), processes)
+        finally:
+            elapsed = (time.perf_counter() - started) * 1000
+            with self.lock:
+                self.busy = False
+                skipped, self.skipped = self.skipped, 0
+        self.processes_sampled.emit(processes, elapsed, skipped)
+
+    def request_details(self, pids, columns):
+        """Запрашивает дорогие атрибуты для списка PID; ответ приходит сигналом details_ready."""
+        self.details_requested.emit(list(pids), list(columns))
+
+    @Slot(object, object)
+    def fetch_details(self, pids, columns):
+        if not self.details_available:
+            return
+        details = self.details.fetch(pids, columns)
+        if details:
+            self.details_ready.emit(details)
@@ -0,0 +1,245 @@
+import os
+import pwd
+import time
+
+import numpy as np
+from cpu.proc_stat import parse_proc_stat, read_proc_stat
+
+
+CLOCK_TICKS = os.sysconf('SC_CLK_TCK') if hasattr(os, 'sysconf') else 100
+PAGE_SIZE = os.sysconf('SC_PAGE_SIZE') if hasattr(os, 'sysconf') else 4096
+STAT_READ_SIZE = 1024  # Строки /proc/[pid]/stat заметно короче
+
+
+class ProcessTable:
+    """Результат одного обхода /proc в виде столбцов.
+
+    pid, ppid, ticks (utime + stime в тиках), start (starttime в тиках),
+    rss (страницы), uid (реальный, -1 если недоступен), read и write
+    (байты из /proc/[pid]/io, -1 если недоступно) -- массивы NumPy одинаковой длины, упорядоченные по pid;
+    names -- список имён в том же порядке.
+    """
+
+    def __init__(self, pid, ppid, names, ticks, start, rss, uid, read, write):
+        self.pid = pid
+        self.ppid = ppid
+        self.names = names
+        self.ticks = ticks
+        self.start = start
+        self.rss = rss
+        self.uid = uid
+        self.read = read
+        self.write = write
+
+    def __len__(self):
+        return len(self.pid)
+
+    @classmethod
+    def empty(cls):
+        columns = [np.empty(0, np.int64) for _ in range(8)]
+        return cls(columns[0], columns[1], [], *columns[2:])
+
+
+def parse_stat(data):
+    """Разбирает содержимое /proc/[pid]/stat: (имя, ppid, utime + stime, starttime, rss).
+
+    Имя (comm) стоит в скобках и само может содержать пробелы и скобки,
+    поэтому остальные поля отсчитываются от последней ')'.
+    """
+    close = data.rfind(b')')
+    name = data[data.find(b'(') + 1:close].decode('utf-8', 'replace')
+    fields = data[close + 2:].split()
+    # Поля после comm нумеруются с 3 (state): ppid=4, utime=14, stime=15, starttime=22, rss=24
+    return name, int(fields[1]), int(fields[11]) + int(fields[12]), int(fields[19]), int(fields[21])
+
+
+def read_file(path):
+    """Начало файла /proc одним read(); None, если процесса уже нет или доступа нет."""
+    try:
+        fd = os.open(path, os.O_RDONLY)
+    except OSError:
+        return None
+    try:
+        return os.read(fd, STAT_READ_SIZE)
+    except OSError:
+        return None
+    finally:
+        os.close(fd)
+
+
+def read_uid(path):
+    """Реальный uid из строки Uid: /proc/[pid]/status; -1, если прочитать не удалось.
+
+    Владелец каталога /proc/[pid] -- эффективный uid, а у процессов,
+    сбросивших dumpable (setuid-программы), -- root; ProcessCollector
+    показывает реальный uid (uids().real).
+    """
+    data = read_file(path + "/status")
+    start = data.find(b'\nUid:') if data else -1
+    if start < 0:
+        return -1
+    return int(data[start + 5:data.find(b'\n', start + 1)].split()[0])
+
+
+def read_io(path):
+    """Читает read_bytes и write_bytes из /proc/[pid]/io; (-1, -1), если доступа нет."""
+    data = read_file(path + "/io")
+    if data is None:
+        return -1, -1
+    read = write = -1
+    for line in data.split(b'\n'):
+        if line.startswith(b'read_bytes:'):
+            read = int(line[11:])
+        elif line.startswith(b'write_bytes:'):
+            write = int(line[12:])
+    return read, write
+
+
+class ProcfsScanner:
+    """Быстрый обход процессов через прямое чтение /proc (только Linux).
+
+    На процесс приходится одно чтение /proc/[pid]/stat (имя, время CPU,
+    время запуска, RSS). /proc/[pid]/status (реальный владелец) и
+    /proc/[pid]/io читаются только у новых процессов и у получавших CPU
+    с прошлого обхода: простаивающий процесс не выполнял ни ввод-вывод,
+    ни setuid().
+    Загрузка CPU считается по разнице тиков с прошлым обходом для
+    процессов с тем же pid и тем же временем запуска. Интерфейс collect()
+    совпадает с ProcessCollector, в том числе 'started' -- время запуска
+    в секундах эпохи, как Process.create_time().
+    """
+
+    def __init__(self, proc_root='/proc'):
+        self.proc_root = proc_root
+        self.logical_cpus = os.cpu_count() or 1
+        self.usernames = {}  # uid -> имя пользователя
+        self.previous = ProcessTable.empty()
+        self.last_time = None
+        self.boot_time = None  # btime из /proc/stat: не меняется до перезагрузки
+
+    @staticmethod
+    def available(proc_root='/proc'):
+        return os.path.exists(os.path.join(proc_root, 'self', 'stat'))
+
+    def username(self, uid):
+        name = self.usernames.get(uid)
+        if name is None:
+            try:
+                name = pwd.getpwuid(uid).pw_name
+            except KeyError:
+                name = str(uid)
+            self.usernames[uid] = name
+        return name
+
+    def total_memory(self):
+        """MemTotal из meminfo в байтах."""
+        with open(os.path.join(self.proc_root, 'meminfo'), 'rb') as f:
+            for line in f:
+                if line.startswith(b'MemTotal:'):
+                    return int(line.split()[1]) * 1024
+        return 0
+
+    def scan(self):
+        """Читает /proc и возвращает ProcessTable."""
+        root = self.proc_root
+        pids = sorted(int(entry) for entry in os.listdir(root) if entry.isdigit())
+        count = len(pids)
+        pid_column = np.empty(count, np.int64)
+        ppid = np.empty(count, np.int64)
+        ticks = np.empty(count, np.int64)
+        start = np.empty(count, np.int64)
+        rss = np.empty(count, np.int64)
+        names = []
+
+        n = 0
+        for pid in pids:
+            path = f"{root}/{pid}"
+            try:
+                fd = os.open(path + "/stat", os.O_RDONLY)
+                try:
+                    data = os.read(fd, STAT_READ_SIZE)
+                finally:
+                    os.close(fd)
+                name, parent, cpu_ticks, start_ticks, rss_pages = parse_stat(data)
+            except (OSError, ValueError, IndexError):
+                # Процесс завершился между listdir и чтением
+                continue
+            pid_column[n] = pid
+            ppid[n] = parent
+            ticks[n] = cpu_ticks
+            start[n] = start_ticks
+            rss[n] = rss_pages
+            names.append(name)
+            n += 1
+
+        table = ProcessTable(pid_column[:n], ppid[:n], names, ticks[:n], start[:n], rss[:n], np.empty(n, np.int64),
+                             np.empty(n, np.int64), np.empty(n, np.int64))
+        self.fill_changed(table)
+        return table
+
+    def match_previous(self, table):
+        """Для каждой строки table -- номер строки прошлого обхода и признак того же процесса."""
+        previous = self.previous
+        if len(previous) == 0 or len(table) == 0:
+            return np.zeros(len(table), np.int64), np.zeros(len(table), bool)
+        index = np.searchsorted(previous.pid, table.pid).clip(0, len(previous) - 1)
+        # Тот же pid с другим временем запуска -- новый процесс
+        same = (previous.pid[index] == table.pid) & (previous.start[index] == table.start)
+        return index, same
+
+    def fill_changed(self, table):
+        """Заполняет uid, read и write; у простаивавших процессов они берутся из прошлого обхода."""
+        index, idle = self.match_previous(table)
+        if len(self.previous):
+            idle &= table.ticks == self.previous.ticks[index]
+        for column in ('uid', 'read', 'write'):
+            getattr(table, column)[idle] = getattr(self.previous, column)[index[idle]]
+        pids = table.pid
+        for i in np.flatnonzero(~idle).tolist():
+            path = f"{self.proc_root}/{pids[i]}"
+            table.uid[i] = read_uid(path)
+            table.read[i], table.write[i] = read_io(path)
+
+    def cpu_percent(self, table, elapsed):
+        """Загрузка CPU по разнице с прошлым обходом; новые процессы получают 0."""
+        if not elapsed or len(self.previous) == 0:
+            return np.zeros(len(table))
+        index, same = self.match_previous(table)
+        delta = np.where(same, table.ticks - self.previous.ticks[index], 0).clip(0)
+        return delta / CLOCK_TICKS / elapsed * 100 / self.logical_cpus
+
+    def collect(self):
+        """Возвращает список процессов в порядке PID; сортирует их модель таблицы."""
+        now = time.monotonic()
+        elapsed = now - self.last_time if self.last_time is not None else None
+        self.last_time = now
+
+        table = self.scan()
+        cpu = self.cpu_percent(table, elapsed)
+        total = self.total_memory()
+        memory = table.rss * (PAGE_SIZE * 100 / total) if total else np.zeros(len(table))
+        self.previous = table
+
+        pids = table.pid.tolist()
+        ppids = table.ppid.tolist()
+        uids = table.uid.tolist()
+        if self.boot_time is None:
+            self.boot_time = parse_proc_stat(read_proc_stat(os.path.join(self.proc_root, 'stat'))).get('btime', 0)
+        starts = (self.boot_time + table.start / CLOCK_TICKS).tolist()
+        rss = (table.rss * PAGE_SIZE).tolist()
+        reads = table.read.tolist()
+        writes = table.write.tolist()
+        cpu = cpu.tolist()
+        memory = memory.tolist()
+        return [{
+            'pid': pids[i],
+            'ppid': ppids[i],
+            'name': table.names[i],
+            'cpu_percent': cpu[i],
+            'memory_percent': memory[i],
+            'username': self.username(uids[i]) if uids[i] >= 0 else '',  # Процесс завершился до чтения status
+            'started': starts[i],
+            'rss': rss[i],
+            'read_bytes': reads[i] if reads[i] >= 0 else None,
+            'write_bytes': writes[i] if writes[i] >= 0 else None,
+        } for i in range(len(pids))]
@@ -0,0 +1,107 @@
+from PySide6 import QtCore, QtWidgets
+from PySide6.QtWidgets import QVBoxLayout, QWidget, QTabWidget
+from cpu.cpu_tab import CPUResourceTab
+from memory.memory_tab import MemoryResourceTab
+from process.process_tab import ProcessTab
+from network.network_tab import NetworkResourceTab
+from disk.disk_tab import DiskResourceTab
+from core.sampler import Sampler
+from core.scheduler import TabScheduler
+from core.history import HistoryStore
+from charts.span_selector import SpanSelector
+
+
+class Ui_Dialog(object):
+    def __init__(self, chart_backend='mpl', history_window=3600, history_file=None, interval=1.0,
+                 process_scanner='auto', provider=None):
+        self.chart_backend = chart_backend
+        self.history_window = history_window
+        self.history_file = history_file
+        self.interval = interval
+        self.process_scanner = process_scanner
+        self.provider = provider
+
+    def setupUi(self, Dialog):
+        Dialog.setObjectName("Dialog")
+        Dialog.resize(700, 600)
+        Dialog.setSizeGripEnabled(True)
+        Dialog.setModal(False)
+
+        self.layout = QVBoxLayout(Dialog)
+        self.tabWidget = QTabWidget()
+        self.tabWidget.setObjectName("tabWidget")
+        self.tabWidget.setSizePolicy(QtWidgets.QSizePolicy.Expanding, QtWidgets.QSizePolicy.Expanding)
+
+        # Общий фоновый сборщик метрик для всех вкладок и хранилище их истории
+        self.store = HistoryStore(window=self.history_window, interval=self.interval)
+        if self.history_file is not None:
+            # История прошлых запусков поднимается из файла до первого тика
+            self.history_file.load_into(self.store)
+        self.sampler = Sampler(self.store, interval=int(self.interval * 1000), history_file=self.history_file,
+                               process_scanner=self.process_scanner, provider=self.provider)
+        # Отрисовываются только видимые вкладки
+        self.scheduler = TabScheduler(Dialog)
+        self.scheduler.watch(self.tabWidget)
+
+        # Основные вкладки
+        self.create_process_tab()
+        self.create_performance_tabs()
+        self.sampler.start()
+
+        # Добавляем главный QTabWidget в диалог
+        self.layout.addWidget(self.tabWidget)
+
+        self.retranslateUi(Dialog)
+        QtCore.QMetaObject.connectSlotsByName(Dialog)
+
+    def create_process_tab(self):
+        """Создание вкладки 'Процессы'."""
+        self.process_tab = ProcessTab(self.sampler)
+        self.scheduler.add_tab(self.process_tab)
+        self.tabWidget.addTab(self.process_tab, "Процессы")
+
+    def create_performance_tabs(self):
+        """Создание вкладок для производительности."""
+        self.performance_tab = QTabWidget()
+        self.scheduler.watch(self.performance_tab)
+        # Общий выбор окна времени для всех графиков
+        self.span_selector = SpanSelector()
+        self.add_resource_tab(CPUResourceTab(self.sampler, self.chart_backend), "Процессор")
+        self.add_resource_tab(MemoryResourceTab(self.sampler, self.chart_backend), "Память")
+        self.add_resource_tab(DiskResourceTab(self.sampler, self.chart_backend), "Диск")
+
+        # Добавляем вкладки сети внутри вкладки 'Производительность'
+        self.add_network_tabs()
+
+        performance_page = QWidget()
+        performance_layout = QVBoxLayout(performance_page)
+        performance_layout.addWidget(self.span_selector)
+        performance_layout.addWidget(self.performance_tab)
+        self.tabWidget.addTab(performance_page, "Производительность")
+
+    def add_network_tabs(self):
+        """Добавление вкладок для сетевых адаптеров."""
+        active_adapters = [
+            name for name, stats in self.sampler.provider.net_interfaces().items() if name != "lo" and stats['isup']
+        ]
+
+        if not active_adapters:
+            print("Net: No active network adapters found")
+            return
+
+        for adapter_name in active_adapters:
+            network_tab = NetworkResourceTab(parent=self.performance_tab, sampler=self.sampler,
+                                             chart_backend=self.chart_backend)
+            network_tab.set_interface_name(adapter_name)  # Устанавливаем имя через метод
+            self.add_resource_tab(network_tab, f"Сеть ({adapter_name})")
+
+    def add_resource_tab(self, tab, title):
+        """Добавление вкладки ресурса под управление планировщика отрисовки."""
+        self.scheduler.add_tab(tab)
+        self.span_selector.span_changed.connect(tab.set_span)
+        self.performance_tab.addTab(tab, title)
+
+    def retranslateUi(self, Dialog):
+        """Установка заголовка окна."""
+        _translate = QtCore.QCoreApplication.translate
+        Dialog.setWindowTitle(_translate("Dialog", "Системный анализатор производительности"))